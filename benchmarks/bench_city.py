@@ -0,0 +1,179 @@
+"""City flows at synthetic guild sizes, on a fake Config, bank and Discord.
+
+Every member has crime stats and a balance, and one in twenty is in jail.
+Flows that keep an index (target pool, leaderboard) are run both ``warm``,
+as they are on a running bot, and ``cold``, with the index dropped before
+every run as after a reload.
+
+Member data is written behind by the member cache, so Config writes of these
+flows happen on its next flush and aren't part of their call counts.
+
+Run from the repository root::
+
+    python -m pytest benchmarks/bench_city.py
+"""
+
+import contextlib
+import itertools
+import random
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+from city import City
+from city.crime.blackmarket import BLACKMARKET_ITEMS
+from city.crime.views import CrimeView, TargetSelectionView
+from city.inventory import display_inventory
+
+from .fakes import (
+    FakeBank,
+    FakeBot,
+    FakeChannel,
+    FakeContext,
+    FakeGuild,
+    FakeInteraction,
+    FakeMember,
+    MemoryDriver,
+    memory_config,
+)
+
+CRIME_TYPE = "pickpocket"
+
+# One in this many members is serving a sentence, or owns blackmarket items
+JAILED_EVERY = 20
+SHOPPER_EVERY = 10
+
+
+class CityWorld:
+    """A City cog and one guild of ``members`` members with stored data."""
+
+    def __init__(self, members: int) -> None:
+        self.stack = contextlib.ExitStack()
+        self.bank = self.stack.enter_context(FakeBank().install())
+        self.guild = FakeGuild(10 ** 17)
+        self.channel = FakeChannel(self.guild, 10 ** 17 + 1)
+        self.bot = FakeBot(self.guild)
+        with memory_config() as drivers:
+            self.cog = City(self.bot)
+        self.driver: MemoryDriver = drivers["City"]
+
+        rng = random.Random(members)
+        now = int(time.time())
+        self.members: List[FakeMember] = []
+        free: List[FakeMember] = []
+        shoppers: List[FakeMember] = []
+        for index in range(members):
+            member = FakeMember(self.guild, 10 ** 17 + 100 + index)
+            self.members.append(member)
+            data: Dict[str, Any] = {
+                "total_successful_crimes": rng.randint(0, 200),
+                "total_failed_crimes": rng.randint(0, 200),
+                "total_credits_earned": rng.randint(0, 500_000),
+                "total_stolen_from": rng.randint(0, 100_000),
+                "total_stolen_by": rng.randint(0, 100_000),
+                "total_fines_paid": rng.randint(0, 50_000),
+                "largest_heist": rng.randint(0, 20_000),
+                "highest_streak": rng.randint(0, 10),
+            }
+            if index % JAILED_EVERY == 0:
+                data["jail_until"] = now + 3600
+            else:
+                free.append(member)
+            if index % SHOPPER_EVERY == 0:
+                data["purchased_perks"] = ["jail_reducer", "notify_ping"]
+                data["active_items"] = {"jail_pass": {"uses": 1}}
+                shoppers.append(member)
+            self.driver.put("MEMBER", self.guild.id, member.id, value=data)
+            self.bank.balances[(self.guild.id, member.id)] = rng.randint(0, 50_000)
+
+        rng.shuffle(free)
+        # Criminals are used once, a second crime would only hit the cooldown
+        self.criminals: Iterator[FakeMember] = iter(free)
+        self.visitors: Iterator[FakeMember] = itertools.cycle(free)
+        self.shoppers: Iterator[FakeMember] = itertools.cycle(shoppers)
+        self.rich = [member for member in free if self.bank.balances[(self.guild.id, member.id)] >= 10_000]
+        self.rng = rng
+        self.crime_data: Dict[str, Any] = {}
+
+    async def start(self) -> None:
+        """Load the indexes the cog loads once the bot is ready."""
+        await self.cog._load_jail_state()
+        self.crime_data = (await self.cog.config.guild(self.guild).crime_options())[CRIME_TYPE]
+
+    async def close(self) -> None:
+        await self.cog.cog_unload()
+        self.stack.close()
+
+    def next_crime(self) -> Tuple[FakeMember, FakeMember]:
+        """A criminal who hasn't committed a crime yet, and a target worth robbing."""
+        criminal = next(self.criminals)
+        target = self.rng.choice(self.rich)
+        while target is criminal:
+            target = self.rng.choice(self.rich)
+        return criminal, target
+
+
+@pytest.fixture(scope="module")
+def city(loop: Any, members: int) -> Iterator[CityWorld]:
+    world = CityWorld(members)
+    loop.run_until_complete(world.start())
+    yield world
+    loop.run_until_complete(world.close())
+
+
+def test_crime_confirm(flow: Any, city: CityWorld) -> None:
+    """Confirm a pickpocket, from the button press to the settled outcome."""
+    async def setup() -> Tuple[Any, ...]:
+        # Reveals play out after the handler, they'd only pile up here
+        city.cog.reveals.stop()
+        criminal, target = city.next_crime()
+        interaction = FakeInteraction(criminal, city.channel)
+        view = CrimeView(city.cog, interaction, CRIME_TYPE, dict(city.crime_data), target)
+        view.message = await city.channel.send("Confirm your crime")
+        return view, interaction
+
+    async def confirm(view: CrimeView, interaction: FakeInteraction) -> None:
+        await view.confirm.callback(interaction)
+
+    flow(confirm, setup, (city.driver,), city.bank, rounds=200)
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+def test_get_random_target(flow: Any, city: CityWorld, cache: str) -> None:
+    """Draw a random pickpocket target."""
+    async def setup() -> Tuple[Any, ...]:
+        if cache == "cold":
+            city.cog.target_pool.invalidate(city.guild.id)
+        interaction = FakeInteraction(next(city.visitors), city.channel)
+        return (TargetSelectionView(city.cog, interaction, CRIME_TYPE, city.crime_data),)
+
+    async def get_random_target(view: TargetSelectionView) -> None:
+        await view.get_random_target()
+
+    flow(get_random_target, setup, (city.driver,), city.bank, rounds=200 if cache == "warm" else 20)
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+def test_crime_leaderboard(flow: Any, city: CityWorld, cache: str) -> None:
+    """Show the crime leaderboard."""
+    async def setup() -> Tuple[Any, ...]:
+        if cache == "cold":
+            city.cog.leaderboard.invalidate(city.guild.id)
+        return (FakeContext(next(city.visitors), city.channel),)
+
+    async def crime_leaderboard(ctx: FakeContext) -> None:
+        await city.cog.crime_leaderboard.callback(city.cog, ctx)
+
+    flow(crime_leaderboard, setup, (city.driver,), city.bank, rounds=200 if cache == "warm" else 5)
+
+
+def test_display_inventory(flow: Any, city: CityWorld) -> None:
+    """Show a member's inventory of blackmarket items."""
+    async def setup() -> Tuple[Any, ...]:
+        return (FakeContext(next(city.shoppers), city.channel),)
+
+    async def inventory(ctx: FakeContext) -> None:
+        await display_inventory(city.cog, ctx, BLACKMARKET_ITEMS)
+
+    flow(inventory, setup, (city.driver,), city.bank, rounds=200)
@@ -0,0 +1,136 @@
+"""LootDrop flows at synthetic guild sizes, on a fake Config, bank and Discord.
+
+Every member has claimed drops before and has a balance. Claims are run both
+``warm``, with the guild's leaderboard ranking built as on a running bot, and
+``cold``, with it dropped before every run as after a reload.
+
+Run from the repository root::
+
+    python -m pytest benchmarks/bench_lootdrop.py
+"""
+
+import asyncio
+import contextlib
+import datetime
+import itertools
+import random
+import time
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+
+from lootdrop.lootdrop import ActiveDrop, LootDrop, PartyDropView
+from lootdrop.scenarios import SCENARIOS
+
+from .fakes import (
+    FakeBank,
+    FakeBot,
+    FakeChannel,
+    FakeGuild,
+    FakeInteraction,
+    FakeMember,
+    MemoryDriver,
+    memory_config,
+)
+
+# Members who join every benchmarked party drop, and seconds it stays open
+PARTY_SIZE = 25
+PARTY_TIMEOUT = 30
+
+
+@contextlib.contextmanager
+def skip_waits() -> Iterator[None]:
+    """Make ``asyncio.sleep`` only yield to the event loop while the block runs."""
+    sleep = asyncio.sleep
+
+    async def yield_once(delay: float, result: Any = None) -> Any:
+        return await sleep(0, result)
+
+    asyncio.sleep = yield_once
+    try:
+        yield
+    finally:
+        asyncio.sleep = sleep
+
+
+class LootDropWorld:
+    """A LootDrop cog and one guild of ``members`` members with stored stats."""
+
+    def __init__(self, members: int) -> None:
+        self.stack = contextlib.ExitStack()
+        self.bank = self.stack.enter_context(FakeBank().install())
+        self.guild = FakeGuild(10 ** 17)
+        self.channel = FakeChannel(self.guild, 10 ** 17 + 1)
+        self.bot = FakeBot(self.guild)
+        with memory_config() as drivers:
+            self.cog = LootDrop(self.bot)
+        self.driver: MemoryDriver = drivers["LootDrop"]
+
+        rng = random.Random(members)
+        now = int(time.time())
+        self.members: List[FakeMember] = []
+        for index in range(members):
+            member = FakeMember(self.guild, 10 ** 17 + 100 + index)
+            self.members.append(member)
+            streak = rng.randint(0, 5)
+            self.driver.put("MEMBER", self.guild.id, member.id, value={
+                "good": rng.randint(0, 300),
+                "bad": rng.randint(0, 100),
+                "streak": streak,
+                "highest_streak": streak + rng.randint(0, 10),
+                "last_claim": now - rng.randint(0, 48 * 3600),
+            })
+            self.bank.balances[(self.guild.id, member.id)] = rng.randint(0, 50_000)
+
+        shuffled = self.members[:]
+        rng.shuffle(shuffled)
+        self.claimers: Iterator[FakeMember] = itertools.cycle(shuffled)
+        self.rng = rng
+
+    async def close(self) -> None:
+        self.cog.cog_unload()
+        self.stack.close()
+
+
+@pytest.fixture(scope="module")
+def lootdrop(loop: Any, members: int) -> Iterator[LootDropWorld]:
+    world = LootDropWorld(members)
+    yield world
+    loop.run_until_complete(world.close())
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+def test_process_loot_claim(flow: Any, lootdrop: LootDropWorld, cache: str) -> None:
+    """Claim a regular drop."""
+    async def setup() -> Tuple[Any, ...]:
+        if cache == "cold":
+            lootdrop.cog.rankings.clear()
+        message = await lootdrop.channel.send(lootdrop.rng.choice(SCENARIOS)["start"])
+        return (FakeInteraction(next(lootdrop.claimers), lootdrop.channel, message),)
+
+    async def process_loot_claim(interaction: FakeInteraction) -> None:
+        await lootdrop.cog.process_loot_claim(interaction)
+
+    flow(process_loot_claim, setup, (lootdrop.driver,), lootdrop.bank, rounds=200 if cache == "warm" else 5)
+
+
+def test_handle_party_timeout(flow: Any, lootdrop: LootDropWorld) -> None:
+    """Settle a party drop that ``PARTY_SIZE`` members joined."""
+    guild_id = lootdrop.guild.id
+
+    async def setup() -> Tuple[Any, ...]:
+        view = PartyDropView(lootdrop.cog, timeout=PARTY_TIMEOUT)
+        view.start_time = time.time() - PARTY_TIMEOUT
+        for member in lootdrop.rng.sample(lootdrop.members, PARTY_SIZE):
+            view.claimed_users[str(member.id)] = view.start_time + lootdrop.rng.uniform(0, PARTY_TIMEOUT)
+        message = await lootdrop.channel.send("🎊 Party drop!", view=view)
+        view.message = message
+        lootdrop.cog.active_drops[guild_id] = ActiveDrop(message, view, int(datetime.datetime.now().timestamp()))
+        return ()
+
+    async def handle_party_timeout() -> None:
+        # The drop is already over, settle it without waiting out its timeout
+        with skip_waits():
+            await lootdrop.cog._handle_party_timeout(guild_id, PARTY_TIMEOUT)
+
+    flow(handle_party_timeout, setup, (lootdrop.driver,), lootdrop.bank, rounds=20)
@@ -0,0 +1,90 @@
+"""Config calls per crime: per-check helpers vs. one MemberSnapshot.
+
+Replays the eligibility checks a crime goes through (crime button, then the
+confirm button) for many members and reports Config calls and time per crime.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_member_snapshot [members]
+"""
+
+import asyncio
+import sys
+import time
+
+from city.base import CONFIG_SCHEMA, CityBase
+from city.cache import MemberStateCache
+from city.jailindex import JailIndex
+from city.crime.data import DEFAULT_GUILD, DEFAULT_MEMBER
+
+from .fakes import FakeConfig, FakeGuild, FakeMember
+
+
+def make_city(config: FakeConfig) -> CityBase:
+    """Build a CityBase on top of a fake Config without a bot."""
+    config.register_guild(**{**CONFIG_SCHEMA["GUILD"], **DEFAULT_GUILD})
+    config.register_member(**{**CONFIG_SCHEMA["MEMBER"], **DEFAULT_MEMBER})
+    cog = CityBase.__new__(CityBase)
+    cog.config = config
+    cog.member_cache = MemberStateCache(config)
+    cog.jail_index = JailIndex()
+    cog.tasks = []
+    return cog
+
+
+async def helper_checks(cog: CityBase, member: FakeMember, crime_type: str) -> None:
+    """The checks as done with the per-field helpers."""
+    # Crime button
+    await cog.get_jail_time_remaining(member)
+    await cog.get_remaining_cooldown(member, crime_type)
+    await cog.config.guild(member.guild).global_settings()
+    # Confirm button
+    await cog.config.guild(member.guild).global_settings()
+    await cog.get_remaining_cooldown(member, crime_type)
+    if await cog.is_jailed(member):
+        await cog.get_jail_time_remaining(member)
+
+
+async def snapshot_checks(cog: CityBase, member: FakeMember, crime_type: str) -> None:
+    """The checks as done with one snapshot per interaction."""
+    # Crime button
+    snapshot = await cog.get_member_snapshot(member)
+    snapshot.jail_remaining()
+    snapshot.cooldown_remaining(crime_type)
+    # Confirm button
+    snapshot = await cog.get_member_snapshot(member)
+    snapshot.cooldown_remaining(crime_type)
+    snapshot.is_jailed()
+
+
+async def run(checks, members: int, warm: bool) -> tuple:
+    config = FakeConfig()
+    cog = make_city(config)
+    guild = FakeGuild()
+    targets = [FakeMember(guild, i) for i in range(members)]
+    # Members have committed crimes before, so their cooldowns are checked
+    for member in targets:
+        await config.member(member).last_actions.set({"pickpocket": int(time.time()) - 3600})
+    if warm:
+        for member in targets:
+            await cog.member_cache.get(member)
+    config.reset_calls()
+
+    start = time.perf_counter()
+    for member in targets:
+        await checks(cog, member, "pickpocket")
+    elapsed = time.perf_counter() - start
+    return config.total_calls / members, elapsed / members * 1e6
+
+
+async def main(members: int) -> None:
+    print(f"{members:,} crimes")
+    print(f"{'checks':<10} {'cache':<6} {'config calls/crime':>20} {'us/crime':>10}")
+    for name, checks in (("helpers", helper_checks), ("snapshot", snapshot_checks)):
+        for warm in (False, True):
+            calls, micros = await run(checks, members, warm)
+            print(f"{name:<10} {'warm' if warm else 'cold':<6} {calls:>20.2f} {micros:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,93 @@
+"""Concurrent thefts against one hot target: unlocked bank calls vs. transfer().
+
+Starts thousands of steals at once against a single rich target and checks
+that no credits are created or destroyed along the way.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_theft_transfer [steals]
+
+The pytest suite also picks up the test in this file.
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any
+
+from redbot.core import bank
+
+from city.banking import AccountLocks
+
+from .fakes import FakeBank, FakeGuild, FakeMember
+
+AMOUNT = 100
+
+
+async def unlocked_steal(locks: AccountLocks, target: FakeMember, thief: FakeMember) -> bool:
+    """The old sequence: check, withdraw, deposit as separate awaits."""
+    try:
+        if await bank.get_balance(target) < AMOUNT:
+            return False
+        await bank.withdraw_credits(target, AMOUNT)
+        await bank.deposit_credits(thief, AMOUNT)
+        return True
+    except ValueError:
+        # "Balance changed!"
+        return False
+
+
+async def locked_steal(locks: AccountLocks, target: FakeMember, thief: FakeMember) -> bool:
+    return await locks.transfer(target, thief, AMOUNT) == AMOUNT
+
+
+async def run(steal, steals: int) -> tuple:
+    fake = FakeBank()
+    guild = FakeGuild()
+    target = FakeMember(guild, 0)
+    # A handful of thieves so thieves' accounts are contended too
+    thieves = [FakeMember(guild, i) for i in range(1, 51)]
+    fake.balances[(guild.id, target.id)] = AMOUNT * steals // 2
+    locks = AccountLocks()
+
+    with fake.install():
+        before = fake.total
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(steal(locks, target, thieves[i % len(thieves)]) for i in range(steals))
+        )
+        elapsed = time.perf_counter() - start
+    succeeded = sum(results)
+    return succeeded, fake.total - before, steals / elapsed, len(locks)
+
+
+def test_global_bank_thefts_across_guilds(loop: Any) -> None:
+    """Two guilds robbing the same user of a global bank share one account."""
+    fake = FakeBank(global_bank=True)
+    guilds = [FakeGuild(1), FakeGuild(2)]
+    victims = [FakeMember(guild, 0) for guild in guilds]
+    thieves = [FakeMember(guild, i) for i, guild in enumerate(guilds, 1)]
+    fake.balances[(0, 0)] = AMOUNT * 3
+    locks = AccountLocks()
+
+    async def steal_in_both_guilds() -> list:
+        return await asyncio.gather(*(locks.transfer(v, t, AMOUNT) for v, t in zip(victims, thieves)))
+
+    with fake.install():
+        moved = loop.run_until_complete(steal_in_both_guilds())
+    assert moved == [AMOUNT, AMOUNT]
+    assert fake.balances[(0, 0)] == AMOUNT
+    assert fake.total == AMOUNT * 3
+    assert not len(locks)
+
+
+async def main(steals: int) -> None:
+    print(f"{steals:,} concurrent steals of {AMOUNT} from a target holding {AMOUNT * steals // 2:,}")
+    print(f"{'steal':<10} {'succeeded':>10} {'credits created':>16} {'steals/s':>10} {'locks left':>11}")
+    for name, steal in (("unlocked", unlocked_steal), ("transfer", locked_steal)):
+        succeeded, drift, rate, locks_left = await run(steal, steals)
+        print(f"{name:<10} {succeeded:>10,} {drift:>16,} {rate:>10,.0f} {locks_left:>11}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
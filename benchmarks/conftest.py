@@ -0,0 +1,162 @@
+"""Shared setup of the pytest-benchmark suites.
+
+The suites (``bench_city.py``, ``bench_lootdrop.py``) run real cog code on
+top of the in-memory fakes in :mod:`benchmarks.fakes`, at several synthetic
+guild sizes. Besides pytest-benchmark's timings, every flow reports:
+
+- Config driver calls per operation,
+- bank calls per operation, and
+- peak memory allocated during one operation, measured with tracemalloc in an
+  extra untimed run.
+
+These are printed in a table next to pytest-benchmark's own and saved in each
+benchmark's ``extra_info``, so they end up in ``--benchmark-json`` output and
+can be compared between runs.
+
+They need pytest and pytest-benchmark. Run from the repository root::
+
+    python -m pytest benchmarks
+    python -m pytest benchmarks --members 1000,10000 -k "not cold"
+"""
+
+import asyncio
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from .fakes import FakeBank, MemoryDriver
+
+# Synthetic guild sizes every flow is run at unless --members says otherwise
+MEMBER_COUNTS = (1_000, 10_000, 100_000)
+
+# Rows of the summary table, in the order the benchmarks ran
+RESULTS: List[Dict[str, Any]] = []
+
+
+def pytest_addoption(parser: Any) -> None:
+    parser.addoption(
+        "--members",
+        default=",".join(str(count) for count in MEMBER_COUNTS),
+        help="Comma separated guild sizes to benchmark at (default: %(default)s)",
+    )
+
+
+def pytest_collect_file(file_path: Any, parent: Any) -> Optional[pytest.Module]:
+    # The suites are named like the other benchmarks, which pytest's default
+    # test_*.py pattern doesn't pick up. Files named on the command line are
+    # collected by pytest itself.
+    if file_path.suffix == ".py" and file_path.name.startswith("bench_") and not parent.session.isinitpath(file_path):
+        return pytest.Module.from_parent(parent, path=file_path)
+    return None
+
+
+def pytest_generate_tests(metafunc: Any) -> None:
+    if "members" in metafunc.fixturenames:
+        counts = [int(count) for count in metafunc.config.getoption("members").split(",") if count]
+        # Module scope, so a guild of each size is built once per suite
+        metafunc.parametrize("members", counts, ids=[f"{count // 1000}k" for count in counts], scope="module")
+
+
+@pytest.fixture(scope="session")
+def loop() -> Any:
+    """The event loop every benchmark runs its coroutines on."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+class FlowRunner:
+    """Runs an async flow under pytest-benchmark and records what it costs.
+
+    Every round calls ``setup`` untimed, then times ``operation`` with the
+    setup's return values. Config and bank calls are counted only while the
+    operation runs.
+    """
+
+    def __init__(self, benchmark: Any, loop: asyncio.AbstractEventLoop, request: Any) -> None:
+        self.benchmark = benchmark
+        self.loop = loop
+        self.request = request
+
+    def __call__(
+        self,
+        operation: Callable[..., Awaitable[Any]],
+        setup: Callable[[], Awaitable[Tuple[Any, ...]]],
+        drivers: Tuple[MemoryDriver, ...],
+        bank: FakeBank,
+        rounds: int,
+    ) -> None:
+        loop = self.loop
+        counted = {"config": 0, "bank": 0, "runs": 0}
+
+        def calls() -> Tuple[int, int]:
+            return sum(driver.total_calls for driver in drivers), sum(bank.calls.values())
+
+        def prepare() -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+            return loop.run_until_complete(setup()), {}
+
+        def run(*args: Any) -> None:
+            config_before, bank_before = calls()
+            loop.run_until_complete(operation(*args))
+            config_after, bank_after = calls()
+            counted["config"] += config_after - config_before
+            counted["bank"] += bank_after - bank_before
+            counted["runs"] += 1
+
+        # One untimed run first, so warm caches are warm and lazy imports are done
+        run(*prepare()[0])
+        counted.update(config=0, bank=0, runs=0)
+
+        self.benchmark.pedantic(run, setup=prepare, rounds=rounds)
+
+        # tracemalloc slows allocations down, so memory gets a run of its own
+        args = prepare()[0]
+        tracemalloc.start()
+        try:
+            loop.run_until_complete(operation(*args))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        runs = max(counted["runs"], 1)
+        info = {
+            "config_calls_per_op": round(counted["config"] / runs, 2),
+            "bank_calls_per_op": round(counted["bank"] / runs, 2),
+            "peak_memory_kib": round(peak / 1024, 1),
+        }
+        self.benchmark.extra_info.update(info)
+        stats = self.benchmark.stats
+        RESULTS.append({
+            "name": self.request.node.name,
+            "ops": stats.stats.ops if stats is not None else None,
+            **info,
+        })
+
+
+@pytest.fixture
+def flow(benchmark: Any, loop: asyncio.AbstractEventLoop, request: Any) -> FlowRunner:
+    """Benchmark an async flow, see :class:`FlowRunner`."""
+    return FlowRunner(benchmark, loop, request)
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    if not RESULTS:
+        return
+    width = max(len(row["name"]) for row in RESULTS) + 2
+    terminalreporter.section("flow costs")
+    terminalreporter.write_line(
+        f"{'flow':<{width}}{'ops/s':>12}{'config calls/op':>17}{'bank calls/op':>15}{'peak KiB/op':>13}"
+    )
+    for row in RESULTS:
+        ops = f"{row['ops']:,.1f}" if row["ops"] is not None else "-"
+        terminalreporter.write_line(
+            f"{row['name']:<{width}}{ops:>12}{row['config_calls_per_op']:>17.2f}"
+            f"{row['bank_calls_per_op']:>15.2f}{row['peak_memory_kib']:>13,.1f}"
+        )
@@ -0,0 +1,449 @@
+"""In-memory stand-ins for Red's Config, bank and discord objects.
+
+Only the parts of the APIs the cogs use are implemented. Every driver-level
+operation on the fake Config is counted, so benchmarks can report how many
+Config round trips a flow costs.
+
+There are two ways to fake Config:
+
+- :class:`FakeConfig` replaces the Config object itself, for benchmarks that
+  call a few helpers on a hand-built cog.
+- :class:`MemoryDriver` replaces only the storage underneath a real Config.
+  Inside :func:`memory_config`, cogs can be constructed as they are by Red and
+  every Config feature they use (``all_members``, context managers, base
+  groups) behaves as it does in production.
+"""
+
+import asyncio
+import contextlib
+import copy
+import itertools
+import pickle
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import discord
+from redbot.core import bank
+from redbot.core import config as red_config
+from redbot.core._drivers import BaseDriver, IdentifierData
+
+
+class FakeValue:
+    """A single stored value, like ``config.guild(g).crime_options``."""
+
+    def __init__(self, config: "FakeConfig", path: Tuple[str, ...], default: Any) -> None:
+        self._config = config
+        self._path = path
+        self._default = default
+
+    async def __call__(self) -> Any:
+        self._config.calls["get"] += 1
+        return copy.deepcopy(self._config._get(self._path, self._default))
+
+    async def set(self, value: Any) -> None:
+        self._config.calls["set"] += 1
+        self._config._set(self._path, copy.deepcopy(value))
+
+
+class FakeGroup:
+    """A scope holding several values, like ``config.member(m)``."""
+
+    def __init__(self, config: "FakeConfig", path: Tuple[str, ...], defaults: Dict[str, Any]) -> None:
+        self._config = config
+        self._path = path
+        self._defaults = defaults
+
+    def __getattr__(self, name: str) -> FakeValue:
+        if name.startswith("_") or name not in self._defaults:
+            raise AttributeError(name)
+        return FakeValue(self._config, self._path + (name,), self._defaults[name])
+
+    async def all(self) -> Dict[str, Any]:
+        self._config.calls["get"] += 1
+        data = copy.deepcopy(self._defaults)
+        data.update(copy.deepcopy(self._config._get(self._path, {})))
+        return data
+
+    async def set(self, value: Dict[str, Any]) -> None:
+        self._config.calls["set"] += 1
+        self._config._set(self._path, copy.deepcopy(value))
+
+    async def clear(self) -> None:
+        self._config.calls["clear"] += 1
+        self._config._set(self._path, {})
+
+
+class FakeConfig:
+    """Counting replacement for :class:`redbot.core.Config`."""
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self._store: Dict[Tuple[str, ...], Any] = {}
+        self._guild_defaults: Dict[str, Any] = {}
+        self._member_defaults: Dict[str, Any] = {}
+
+    def register_guild(self, **defaults: Any) -> None:
+        self._guild_defaults.update(defaults)
+
+    def register_member(self, **defaults: Any) -> None:
+        self._member_defaults.update(defaults)
+
+    def _get(self, path: Tuple[str, ...], default: Any) -> Any:
+        if path in self._store:
+            return self._store[path]
+        # A single field lives inside its group's dict
+        return self._store.get(path[:-1], {}).get(path[-1], default)
+
+    def _set(self, path: Tuple[str, ...], value: Any) -> None:
+        if path[0] in ("GUILD", "MEMBER") and len(path) == (3 if path[0] == "GUILD" else 4):
+            self._store.setdefault(path[:-1], {})[path[-1]] = value
+        else:
+            self._store[path] = value
+
+    def guild(self, guild: "FakeGuild") -> FakeGroup:
+        return self.guild_from_id(guild.id)
+
+    def guild_from_id(self, guild_id: int) -> FakeGroup:
+        return FakeGroup(self, ("GUILD", str(guild_id)), self._guild_defaults)
+
+    def member(self, member: "FakeMember") -> FakeGroup:
+        return self.member_from_ids(member.guild.id, member.id)
+
+    def member_from_ids(self, guild_id: int, member_id: int) -> FakeGroup:
+        return FakeGroup(self, ("MEMBER", str(guild_id), str(member_id)), self._member_defaults)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+
+
+class MemoryDriver(BaseDriver):
+    """Config driver holding a cog's data in a dict.
+
+    Behaves like Red's JSON driver without the file: reads return a copy of
+    the stored data and missing keys raise ``KeyError``.
+
+    Attributes
+    ----------
+    data: Dict[str, Any]
+        Everything stored, as ``{category: {primary keys...: value}}``
+    calls: Counter
+        Driver calls made, by operation (``get``, ``set``, ``clear``)
+    """
+
+    def __init__(self, cog_name: str, identifier: str, **kwargs: Any) -> None:
+        super().__init__(cog_name, identifier, **kwargs)
+        self.data: Dict[str, Any] = {}
+        self.calls: Counter = Counter()
+
+    @classmethod
+    async def initialize(cls, **storage_details: Any) -> None:
+        return
+
+    @classmethod
+    async def teardown(cls) -> None:
+        return
+
+    @staticmethod
+    def get_config_details() -> Dict[str, Any]:
+        return {}
+
+    @staticmethod
+    def _keys(identifier_data: IdentifierData) -> Tuple[str, ...]:
+        # Drop the cog name and unique identifier, one driver serves one Config
+        return identifier_data.to_tuple()[2:]
+
+    async def get(self, identifier_data: IdentifierData) -> Any:
+        self.calls["get"] += 1
+        partial = self.data
+        for key in self._keys(identifier_data):
+            partial = partial[key]
+        return pickle.loads(pickle.dumps(partial, -1))
+
+    async def set(self, identifier_data: IdentifierData, value: Any = None) -> None:
+        self.calls["set"] += 1
+        keys = self._keys(identifier_data)
+        partial = self.data
+        for key in keys[:-1]:
+            partial = partial.setdefault(key, {})
+        partial[keys[-1]] = pickle.loads(pickle.dumps(value, -1))
+
+    async def clear(self, identifier_data: IdentifierData) -> None:
+        self.calls["clear"] += 1
+        keys = self._keys(identifier_data)
+        partial = self.data
+        try:
+            for key in keys[:-1]:
+                partial = partial[key]
+            del partial[keys[-1]]
+        except KeyError:
+            pass
+
+    @classmethod
+    async def aiter_cogs(cls) -> AsyncIterator[Tuple[str, str]]:
+        return
+        yield
+
+    def put(self, *keys: Any, value: Any) -> None:
+        """Store ``value`` without counting a call, to seed a benchmark."""
+        partial = self.data
+        for key in keys[:-1]:
+            partial = partial.setdefault(str(key), {})
+        partial[str(keys[-1])] = value
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+@contextlib.contextmanager
+def memory_config() -> Iterator[Dict[str, MemoryDriver]]:
+    """Give every Config created while the block runs a :class:`MemoryDriver`.
+
+    Yields the drivers by cog name, e.g. ``drivers["City"]``.
+    """
+    drivers: Dict[str, MemoryDriver] = {}
+
+    def get_driver(cog_name: str, identifier: str, **kwargs: Any) -> MemoryDriver:
+        # Red hands out one Config per cog, forget it so this one gets a new driver
+        red_config._config_cache.pop((cog_name, identifier), None)
+        driver = drivers[cog_name] = MemoryDriver(cog_name, identifier)
+        return driver
+
+    original = red_config.get_driver
+    red_config.get_driver = get_driver
+    try:
+        yield drivers
+    finally:
+        red_config.get_driver = original
+
+
+class FakeBank:
+    """In-memory replacement for :mod:`redbot.core.bank`.
+
+    Every balance read and write yields to the event loop, like a real
+    driver round trip would, so unlocked read-modify-write sequences can
+    interleave the same way they do against Config.
+    """
+
+    def __init__(self, max_balance: int = 2 ** 63 - 1, global_bank: bool = False) -> None:
+        self.calls: Counter = Counter()
+        self.balances: Dict[Tuple[int, int], int] = {}
+        self.max_balance = max_balance
+        self.global_bank = global_bank
+
+    def _key(self, member: "FakeMember") -> Tuple[int, int]:
+        # A global bank has one account per user, stored under guild 0
+        return (0 if self.global_bank else member.guild.id), member.id
+
+    async def is_global(self) -> bool:
+        return self.global_bank
+
+    async def get_balance(self, member: "FakeMember") -> int:
+        self.calls["get_balance"] += 1
+        await asyncio.sleep(0)
+        return self.balances.get(self._key(member), 0)
+
+    async def set_balance(self, member: "FakeMember", amount: int) -> int:
+        self.calls["set_balance"] += 1
+        if amount < 0:
+            raise ValueError("Not allowed to have negative balance.")
+        if amount > self.max_balance:
+            from redbot.core.errors import BalanceTooHigh
+
+            raise BalanceTooHigh(member, self.max_balance, "credits")
+        await asyncio.sleep(0)
+        self.balances[self._key(member)] = amount
+        return amount
+
+    async def withdraw_credits(self, member: "FakeMember", amount: int) -> int:
+        balance = await self.get_balance(member)
+        if amount > balance:
+            raise ValueError("Insufficient funds")
+        return await self.set_balance(member, balance - amount)
+
+    async def deposit_credits(self, member: "FakeMember", amount: int) -> int:
+        balance = await self.get_balance(member)
+        return await self.set_balance(member, balance + amount)
+
+    async def can_spend(self, member: "FakeMember", amount: int) -> bool:
+        return await self.get_balance(member) >= amount
+
+    async def get_currency_name(self, guild: Any = None) -> str:
+        return "credits"
+
+    @property
+    def total(self) -> int:
+        return sum(self.balances.values())
+
+    @contextlib.contextmanager
+    def install(self) -> Iterator["FakeBank"]:
+        """Swap this fake in for Red's bank functions while the block runs."""
+        names = (
+            "get_balance",
+            "set_balance",
+            "withdraw_credits",
+            "deposit_credits",
+            "can_spend",
+            "get_currency_name",
+            "is_global",
+        )
+        originals = {name: getattr(bank, name) for name in names}
+        try:
+            for name in names:
+                setattr(bank, name, getattr(self, name))
+            yield self
+        finally:
+            for name, original in originals.items():
+                setattr(bank, name, original)
+
+
+class FakeGuild:
+    """Minimal :class:`discord.Guild`."""
+
+    def __init__(self, guild_id: int = 1) -> None:
+        self.id = guild_id
+        self._members: Dict[int, "FakeMember"] = {}
+
+    @property
+    def members(self) -> List["FakeMember"]:
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    def get_member(self, member_id: int) -> Optional["FakeMember"]:
+        return self._members.get(member_id)
+
+
+class FakeMember:
+    """Minimal :class:`discord.Member`. Members join their guild when created."""
+
+    def __init__(self, guild: FakeGuild, member_id: int, name: Optional[str] = None) -> None:
+        self.guild = guild
+        self.id = member_id
+        self.name = name or f"member{member_id}"
+        self.display_name = self.name
+        self.bot = False
+        self.mention = f"<@{member_id}>"
+        self.guild_permissions = discord.Permissions.none()
+        self.roles: List[Any] = []
+        guild._members[member_id] = self
+
+
+class FakeMessage:
+    """Minimal :class:`discord.Message`. Edits change it in place."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, channel: "FakeChannel", content: Optional[str] = None, **kwargs: Any) -> None:
+        self.id = next(self._ids)
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.embed = kwargs.get("embed")
+        self.view = kwargs.get("view")
+        self.deleted = False
+
+    async def edit(self, **kwargs: Any) -> "FakeMessage":
+        self.channel.calls["edit"] += 1
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+        return self
+
+    async def delete(self) -> None:
+        self.channel.calls["delete"] += 1
+        self.deleted = True
+
+
+class FakeChannel:
+    """Minimal :class:`discord.TextChannel`. Counts the API calls made through it."""
+
+    def __init__(self, guild: FakeGuild, channel_id: int = 1) -> None:
+        self.guild = guild
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.calls: Counter = Counter()
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        self.calls["send"] += 1
+        return FakeMessage(self, content, **kwargs)
+
+
+class FakeResponse:
+    """Minimal :class:`discord.InteractionResponse`."""
+
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs: Any) -> None:
+        self._done = True
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self._done = True
+        await self._interaction.channel.send(content, **kwargs)
+
+
+class FakeFollowup:
+    """Minimal :class:`discord.Webhook` for interaction followups."""
+
+    def __init__(self, channel: FakeChannel) -> None:
+        self._channel = channel
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        return await self._channel.send(content, **kwargs)
+
+
+class FakeInteraction:
+    """Minimal :class:`discord.Interaction` for a button press."""
+
+    def __init__(self, user: FakeMember, channel: FakeChannel, message: Optional[FakeMessage] = None) -> None:
+        self.user = user
+        # Helpers taking an interaction or a context tell them apart with
+        # isinstance, which sees a context here
+        self.author = user
+        self.guild = user.guild
+        self.channel = channel
+        self.message = message
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(channel)
+
+
+class FakeContext:
+    """Minimal :class:`redbot.core.commands.Context`."""
+
+    def __init__(self, author: FakeMember, channel: FakeChannel) -> None:
+        self.author = author
+        self.guild = author.guild
+        self.channel = channel
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        return await self.channel.send(content, **kwargs)
+
+    async def embed_color(self) -> discord.Color:
+        return discord.Color.red()
+
+
+class FakeBot:
+    """Minimal :class:`redbot.core.bot.Red`, ready from the start."""
+
+    def __init__(self, *guilds: FakeGuild) -> None:
+        self.guilds = list(guilds)
+        self.cogs: Dict[str, Any] = {}
+
+    async def wait_until_ready(self) -> None:
+        return
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return next((guild for guild in self.guilds if guild.id == guild_id), None)
+
+    def get_cog(self, name: str) -> Any:
+        return self.cogs.get(name)
@@ -0,0 +1,288 @@
+"""Batched, lock-protected bank changes for resolving a crime.
+
+A crime used to hit Red's bank once per event bonus, penalty, theft leg and
+fine, with a fallback that re-read the balance and withdrew whatever was left
+whenever a withdrawal would overdraw. :class:`BankBatch` collects those
+changes as one signed delta per account instead and applies each account's
+total in a single step when the crime is resolved. Balances never go below
+zero, so penalties take what's there instead of failing.
+
+Red's own deposit and withdraw are a read followed by a write, so two crimes
+touching the same account at once could overwrite each other's change.
+:class:`AccountLocks` gives every account an asyncio lock. A commit holds the
+locks of all its accounts, taken in sorted order so two commits sharing
+accounts can't deadlock, which makes a theft's withdraw and deposit one
+atomic transfer. With a global bank a user has one account in every guild, so
+accounts are then keyed on the user alone.
+"""
+
+import asyncio
+import contextlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import discord
+from redbot.core import bank
+from redbot.core.errors import BalanceTooHigh
+
+from .metrics import METRICS
+from .perf import PERF
+
+AccountKey = Tuple[int, int]  # (guild_id, member_id), guild_id 0 for a global bank
+
+GLOBAL_GUILD_ID = 0
+
+CREDITS_MINTED = METRICS.counter(
+    "city_credits_minted_total", "Credits added to balances by City, not counting transfers", ("source",)
+)
+CREDITS_BURNED = METRICS.counter(
+    "city_credits_burned_total", "Credits taken from balances by City, not counting transfers", ("source",)
+)
+
+
+def _key(member: discord.Member) -> AccountKey:
+    return member.guild.id, member.id
+
+
+def _account(key: AccountKey, global_bank: bool) -> AccountKey:
+    """Get the bank account a per-guild member key belongs to."""
+    return (GLOBAL_GUILD_ID, key[1]) if global_bank else key
+
+
+class AccountLocks:
+    """One asyncio lock per bank account, created on demand."""
+
+    def __init__(self) -> None:
+        self._locks: Dict[AccountKey, asyncio.Lock] = {}
+        self._holders: Dict[AccountKey, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @contextlib.asynccontextmanager
+    async def hold(self, *members: discord.Member) -> AsyncIterator[None]:
+        """Hold the locks of several accounts at once.
+
+        Locks are always taken in sorted account order, so callers holding
+        overlapping sets of accounts can't deadlock each other.
+        """
+        global_bank = await bank.is_global()
+        keys = sorted({_account(_key(member), global_bank) for member in members})
+        for key in keys:
+            self._holders[key] = self._holders.get(key, 0) + 1
+        acquired: List[asyncio.Lock] = []
+        try:
+            for key in keys:
+                lock = self._locks.setdefault(key, asyncio.Lock())
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            for key in keys:
+                # Forget locks nobody is holding or waiting on
+                self._holders[key] -= 1
+                if not self._holders[key]:
+                    del self._holders[key]
+                    del self._locks[key]
+
+    async def transfer(self, source: discord.Member, destination: discord.Member, amount: int) -> int:
+        """Move credits between two accounts atomically.
+
+        Parameters
+        ----------
+        source: discord.Member
+            The account credits are taken from
+        destination: discord.Member
+            The account credits are given to
+        amount: int
+            How much to move. Capped at the source's balance.
+
+        Returns
+        -------
+        int
+            How much was actually moved
+        """
+        batch = BankBatch(self, source="transfer")
+        transfer = batch.transfer(source, destination, amount)
+        await batch.commit()
+        return transfer.moved
+
+
+class Transfer:
+    """A queued transfer. ``moved`` is filled in when the batch commits."""
+
+    __slots__ = ("source", "destination", "amount", "moved")
+
+    def __init__(self, source: AccountKey, destination: AccountKey, amount: int) -> None:
+        self.source = source
+        self.destination = destination
+        self.amount = amount
+        self.moved = 0
+
+
+class Withdrawal:
+    """A queued withdrawal. ``taken`` is filled in when the batch commits."""
+
+    __slots__ = ("account", "amount", "partial", "taken")
+
+    def __init__(self, account: AccountKey, amount: int, partial: bool = True) -> None:
+        self.account = account
+        self.amount = amount
+        self.partial = partial
+        self.taken = 0
+
+
+class BankBatch:
+    """Credit changes for one crime resolution, committed once per account.
+
+    Attributes
+    ----------
+    locks: Optional[AccountLocks]
+        Account locks held while committing. Without them the commit is still
+        a single write per account, but not safe against concurrent commits.
+    source: str
+        What the credits are for, as reported in the minted and burned
+        metrics
+    """
+
+    def __init__(self, locks: Optional[AccountLocks] = None, source: str = "crime") -> None:
+        self.locks = locks
+        self.source = source
+        self._members: Dict[AccountKey, discord.Member] = {}
+        self._deltas: Dict[AccountKey, int] = {}
+        self._withdrawals: List[Withdrawal] = []
+        self._transfers: List[Transfer] = []
+        self._balances: Dict[AccountKey, int] = {}
+
+    def pending(self, member: discord.Member) -> int:
+        """Get the uncommitted change for a member, not counting transfers."""
+        key = _key(member)
+        withdrawn = sum(w.amount for w in self._withdrawals if w.account == key)
+        return self._deltas.get(key, 0) - withdrawn
+
+    async def balance(self, member: discord.Member) -> int:
+        """Get what a member's balance will be after commit, not counting transfers.
+
+        The bank balance is read once per account and batch.
+        """
+        key = _account(_key(member), await bank.is_global())
+        if key not in self._balances:
+            with PERF.timed("bank"):
+                self._balances[key] = await bank.get_balance(member)
+        return max(0, self._balances[key] + self.pending(member))
+
+    def deposit(self, member: discord.Member, amount: int) -> None:
+        """Queue credits for a member. Negative amounts take credits, down to zero."""
+        key = _key(member)
+        self._members[key] = member
+        self._deltas[key] = self._deltas.get(key, 0) + amount
+
+    def withdraw(self, member: discord.Member, amount: int, partial: bool = True) -> Withdrawal:
+        """Queue a withdrawal, applied after the deposits.
+
+        It can't take a balance below zero: it takes what is there, or with
+        ``partial`` off, nothing unless the whole amount is. What was
+        actually taken is available as ``taken`` on the returned withdrawal
+        after commit.
+        """
+        key = _key(member)
+        self._members[key] = member
+        withdrawal = Withdrawal(key, amount, partial)
+        self._withdrawals.append(withdrawal)
+        return withdrawal
+
+    def transfer(self, source: discord.Member, destination: discord.Member, amount: int) -> Transfer:
+        """Queue a transfer, applied after the deposits and withdrawals.
+
+        The amount moved is capped at what the source has at commit time and
+        is available as ``moved`` on the returned transfer after commit.
+        """
+        for member in (source, destination):
+            self._members[_key(member)] = member
+        transfer = Transfer(_key(source), _key(destination), amount)
+        self._transfers.append(transfer)
+        return transfer
+
+    async def commit(self) -> Dict[int, int]:
+        """Apply every account's total change.
+
+        Balances are re-read under the account locks right before they are
+        set, so no concurrent change is lost. Totals are clamped to zero and
+        the bank's maximum balance.
+
+        Returns
+        -------
+        Dict[int, int]
+            New balance per member ID, for accounts that were changed
+        """
+        queued, self._deltas = self._deltas, {}
+        withdrawals, self._withdrawals = self._withdrawals, []
+        transfers, self._transfers = self._transfers, []
+        self._balances.clear()
+
+        # Changes are queued per guild member, merge them per bank account
+        global_bank = await bank.is_global()
+        members = {_account(key, global_bank): member for key, member in self._members.items()}
+        deltas: Dict[AccountKey, int] = {}
+        for key, delta in queued.items():
+            account = _account(key, global_bank)
+            deltas[account] = deltas.get(account, 0) + delta
+        for withdrawal in withdrawals:
+            withdrawal.account = _account(withdrawal.account, global_bank)
+        for transfer in transfers:
+            transfer.source = _account(transfer.source, global_bank)
+            transfer.destination = _account(transfer.destination, global_bank)
+
+        keys = {key for key, delta in deltas.items() if delta}
+        keys.update(withdrawal.account for withdrawal in withdrawals if withdrawal.amount > 0)
+        for transfer in transfers:
+            keys.update((transfer.source, transfer.destination))
+        if not keys:
+            return {}
+
+        async with contextlib.AsyncExitStack() as stack:
+            if self.locks is not None:
+                await stack.enter_async_context(self.locks.hold(*(members[key] for key in keys)))
+            before: Dict[AccountKey, int] = {}
+            for key in keys:
+                with PERF.timed("bank"):
+                    before[key] = await bank.get_balance(members[key])
+            balances = dict(before)
+            for key, delta in deltas.items():
+                if delta:
+                    balances[key] = max(0, balances[key] + delta)
+            for withdrawal in withdrawals:
+                available = balances[withdrawal.account]
+                if withdrawal.partial or available >= withdrawal.amount:
+                    withdrawal.taken = max(0, min(withdrawal.amount, available))
+                balances[withdrawal.account] -= withdrawal.taken
+            # Credits moved in (positive) or out of each account by transfers
+            transferred: Dict[AccountKey, int] = {}
+            for transfer in transfers:
+                transfer.moved = max(0, min(transfer.amount, balances[transfer.source]))
+                balances[transfer.source] -= transfer.moved
+                balances[transfer.destination] += transfer.moved
+                transferred[transfer.source] = transferred.get(transfer.source, 0) - transfer.moved
+                transferred[transfer.destination] = transferred.get(transfer.destination, 0) + transfer.moved
+
+            new_balances: Dict[int, int] = {}
+            for key, balance in balances.items():
+                if balance == before[key]:
+                    continue
+                member = members[key]
+                with PERF.timed("bank"):
+                    try:
+                        await bank.set_balance(member, balance)
+                    except BalanceTooHigh as e:
+                        balance = e.max_balance
+                        await bank.set_balance(member, balance)
+                new_balances[member.id] = balance
+                # Counted from what was stored, so credits cut off by the
+                # maximum balance are neither minted nor silently lost
+                change = balance - before[key] - transferred.get(key, 0)
+                if change > 0:
+                    CREDITS_MINTED.inc(change, (self.source,))
+                elif change < 0:
+                    CREDITS_BURNED.inc(-change, (self.source,))
+            return new_balances
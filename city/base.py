@@ -2,11 +2,36 @@
 
 from redbot.core import commands, bank, Config
 from redbot.core.bot import Red
+from redbot.core.utils.chat_formatting import box, pagify
 import discord
 from datetime import datetime, timezone
 import time
 from .crime.data import CRIME_TYPES, DEFAULT_GUILD, DEFAULT_MEMBER
-from typing import Dict, Any
+from .crime.scenarios import CATALOG
+from .cache import MemberStateCache
+from .snapshot import MemberSnapshot
+from .leaderboard import CrimeLeaderboardIndex
+from .notifications import ReleaseScheduler
+from .timeline import TimelineRunner
+from .outbound import Outbox
+from .memberindex import MemberNameIndex
+from .targetpool import TargetPool
+from .jailindex import JailIndex
+from .referenceindex import ReferenceIndex
+from .wipe import ConfigWipe, WipeProgress, WipeResult
+from .perf import PERF, PerfRecorder
+from .metrics import METRICS, MetricsServer
+from .banking import AccountLocks, BankBatch
+import asyncio
+import io
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+
+log = logging.getLogger("red.city.base")
+
+# Max Config writes in flight while erasing a user's data
+ERASE_CONCURRENCY = 10
 
 CONFIG_SCHEMA = {
     "GUILD": {
@@ -48,6 +73,7 @@ class CityBase:
             identifier=95932766180343808,
             force_registration=True
         )
+        self.perf = PERF
         
         # Register defaults - combine CONFIG_SCHEMA and crime defaults
         guild_defaults = {**CONFIG_SCHEMA["GUILD"], **DEFAULT_GUILD}
@@ -56,11 +82,66 @@ class CityBase:
         self.config.register_guild(**guild_defaults)
         self.config.register_member(**member_defaults)
         
+        # Pending jail release notifications, "guild_id:member_id" -> [release_at, channel_id]
+        self.config.register_global(release_queue={})
+        
+        # Where an interrupted global wipe stopped, see wipe.py
+        self.config.register_global(wipe_checkpoint=None)
+        self.wiper = ConfigWipe(self.config, self.config.wipe_checkpoint)
+        
         # Config schema version
         self.CONFIG_SCHEMA = 3
         
         # Track active tasks
         self.tasks = []
+        
+        # Member data is read and written through this write-behind cache
+        self.member_cache = MemberStateCache(self.config)
+        
+        # Top members per leaderboard category, fed by member data changes
+        self.leaderboard = CrimeLeaderboardIndex()
+        self.member_cache.add_listener(self.leaderboard.update)
+        
+        # One timer for every pending jail release notification
+        self.release_scheduler = ReleaseScheduler(self.config, self._send_release_notifications)
+        
+        # Lowercased member names for target lookups, kept current by the listeners below
+        self.member_names = MemberNameIndex()
+        
+        # Active jail sentences ordered by release time
+        self.jail_index = JailIndex()
+        self.member_cache.add_listener(self.jail_index.update)
+        
+        # Which guilds hold a user's data and who has them as last_target
+        self.references = ReferenceIndex()
+        self.member_cache.add_listener(self.references.update)
+        
+        # Per-account locks so concurrent crimes can't race on a balance
+        self.bank_locks = AccountLocks()
+        
+        # Members that can currently be drawn as random crime targets
+        self.target_pool = TargetPool()
+        self.member_cache.add_listener(self.target_pool.update)
+        
+        # Every channel send and edit of the crime system is queued per channel here
+        self.outbox = Outbox()
+        
+        # Plays the delayed reveal of every crime and jailbreak outcome
+        self.reveals = TimelineRunner(self.outbox)
+        
+        # Counters and gauges, served on a local port only if an owner turns it on
+        self.metrics = METRICS
+        self.metrics.gauge(
+            "city_jailed_members", "Members currently serving a sentence", function=self.jail_index.active_count
+        )
+        self.metrics.gauge(
+            "city_pending_release_notifications", "Jail release notifications waiting to be sent",
+            function=self.release_scheduler.__len__
+        )
+        self.metrics.gauge("city_outbox_depth", "Messages waiting to be sent or edited", function=lambda: self.outbox.depth)
+        self.config.register_global(metrics_port=None, metrics_host="127.0.0.1")
+        # LootDrop registers its metrics on this registry too, see LootDrop._register_metrics
+        self.metrics_server = MetricsServer(lambda: (self.metrics,))
 
     @commands.group(name="city", invoke_without_command=True)
     async def city(self, ctx: commands.Context):
@@ -68,21 +149,243 @@ class CityBase:
         if ctx.invoked_subcommand is None:
             await ctx.send_help(ctx.command)
         
+    def _perf_recorders(self) -> Dict[str, PerfRecorder]:
+        """The latency recorders of this cog and, if it's loaded, LootDrop."""
+        recorders = {"City": self.perf}
+        lootdrop_perf = getattr(self.bot.get_cog("LootDrop"), "perf", None)
+        if lootdrop_perf is not None:
+            recorders["LootDrop"] = lootdrop_perf
+        return recorders
+        
+    @city.group(name="perf", invoke_without_command=True)
+    @commands.is_owner()
+    async def city_perf(self, ctx: commands.Context):
+        """[Owner Only] Show where time goes in crimes, bail, jailbreaks and loot claims.
+        
+        Lists each handler's wall time, the Config, bank and Discord calls it
+        makes per run, and the latency of those calls. Times are in
+        milliseconds.
+        """
+        sections = []
+        for name, recorder in self._perf_recorders().items():
+            report = recorder.report() or "Nothing recorded yet."
+            since = datetime.fromtimestamp(recorder.since, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+            sections.append(f"{name}, since {since}\n\n{report}")
+        for page in pagify("\n\n".join(sections), page_length=1900):
+            await self.outbox.send(ctx.channel, box(page))
+            
+    @city_perf.command(name="json")
+    async def city_perf_json(self, ctx: commands.Context):
+        """Export every latency histogram as JSON."""
+        data = {name.lower(): recorder.export() for name, recorder in self._perf_recorders().items()}
+        file = discord.File(io.BytesIO(json.dumps(data, indent=2).encode()), filename="city-perf.json")
+        await self.outbox.send(ctx.channel, file=file)
+        
+    @city_perf.command(name="reset")
+    async def city_perf_reset(self, ctx: commands.Context):
+        """Clear every latency histogram."""
+        for recorder in self._perf_recorders().values():
+            recorder.reset()
+        await self.outbox.send(ctx.channel, "✅ Performance histograms cleared.")
+        
+    @city.group(name="metrics", invoke_without_command=True)
+    @commands.is_owner()
+    async def city_metrics(self, ctx: commands.Context):
+        """[Owner Only] Show City and LootDrop counters and gauges.
+        
+        Prints what the metrics endpoint would serve. Use `[p]city metrics serve`
+        to expose them over HTTP for Prometheus.
+        """
+        if self.metrics_server.running:
+            await self.outbox.send(
+                ctx.channel,
+                f"Serving on `http://{self.metrics_server.host}:{self.metrics_server.port}/metrics`"
+            )
+        for page in pagify(self.metrics_server.render(), page_length=1900):
+            await self.outbox.send(ctx.channel, box(page))
+            
+    @city_metrics.command(name="serve")
+    async def city_metrics_serve(self, ctx: commands.Context, port: int, host: str = "127.0.0.1"):
+        """Serve metrics on `http://<host>:<port>/metrics`.
+        
+        Binds to localhost unless another host is given. The setting is kept
+        and the server starts again with the cog.
+        """
+        if not 1 <= port <= 65535:
+            await self.outbox.send(ctx.channel, "❌ Port must be between 1 and 65535.")
+            return
+        try:
+            await self.metrics_server.start(port, host)
+        except (OSError, RuntimeError) as e:
+            await self.outbox.send(ctx.channel, f"❌ Couldn't start the metrics server: {e}")
+            return
+        await self.config.metrics_port.set(port)
+        await self.config.metrics_host.set(host)
+        await self.outbox.send(ctx.channel, f"✅ Serving metrics on `http://{host}:{port}/metrics`.")
+        
+    @city_metrics.command(name="stop")
+    async def city_metrics_stop(self, ctx: commands.Context):
+        """Stop serving metrics."""
+        await self.metrics_server.stop()
+        await self.config.metrics_port.set(None)
+        await self.outbox.send(ctx.channel, "✅ Metrics server stopped.")
+        
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.member_names.add(member)
+        self.target_pool.member_changed(member)
+        if self.leaderboard.is_built(member.guild.id):
+            # A returning member ranks again with the stats they left with
+            self.leaderboard.update((member.guild.id, member.id), await self.member_cache.get(member))
+        
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.member_names.remove(member.guild.id, member.id)
+        self.target_pool.member_left(member.guild.id, member.id)
+        self.leaderboard.member_left(member.guild.id, member.id)
+        
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.display_name != after.display_name:
+            self.member_names.add(after)
+        if before.roles != after.roles:
+            self.target_pool.member_changed(after)
+            
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        if before.name == after.name and before.display_name == after.display_name:
+            return
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member is not None:
+                self.member_names.add(member)
+                
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.member_names.forget(guild.id)
+        self.target_pool.invalidate(guild.id)
+        
     async def red_delete_data_for_user(self, *, requester, user_id: int):
         """Delete user data when requested."""
-        # Delete member data
-        await self.config.member_from_ids(None, user_id).clear()
-        
-        # Remove user from other members' last_target
-        all_members = await self.config.all_members()
-        for guild_id, guild_data in all_members.items():
-            for member_id, member_data in guild_data.items():
-                if member_data.get("last_target") == user_id:
-                    await self.config.member_from_ids(guild_id, member_id).last_target.set(None)
+        await self.erase_user_data(user_id)
+        
+    async def erase_user_data(
+        self,
+        user_id: int,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> Tuple[int, int]:
+        """Delete a user's member data and every ``last_target`` pointing at them.
+        
+        The reference index says which guilds and members are involved, so
+        nothing is scanned. The user's record and each reference are written
+        one member at a time, a few writes in flight at once.
+        
+        Parameters
+        ----------
+        user_id: int
+            The user whose data should be deleted
+        progress: Optional[Callable[[int, int], Awaitable[None]]]
+            Awaited with (guilds done, guilds total) after each guild
+            
+        Returns
+        -------
+        Tuple[int, int]
+            The number of member records removed and the number of references
+            that were cleared
+        """
+        # Make sure pending changes don't resurrect the data after deletion
+        await self.member_cache.flush()
+        await self.references.ensure_loaded(self.config, self.member_cache)
+        
+        own_guilds = self.references.guilds_of(user_id)
+        referrers = self.references.referrers(user_id)
+        guild_ids = sorted(own_guilds | referrers.keys())
+        semaphore = asyncio.Semaphore(ERASE_CONCURRENCY)
+        
+        async def clear_reference(guild_id: int, member_id: int) -> None:
+            async with semaphore:
+                await self.config.member_from_ids(guild_id, member_id).last_target.set(None)
+            # Keep the referrer's other cached changes, only the reference goes
+            self.member_cache.update_cached(guild_id, member_id, last_target=None)
+        
+        records = references = 0
+        for done, guild_id in enumerate(guild_ids, start=1):
+            referring = referrers.get(guild_id, set()) - {user_id}
+            if guild_id in own_guilds:
+                await self.config.member_from_ids(guild_id, user_id).clear()
+                records += 1
+            self.member_cache.drop(guild_id, user_id)
+            await asyncio.gather(*(clear_reference(guild_id, member_id) for member_id in referring))
+            references += len(referring)
+                
+            self.references.forget_member(guild_id, user_id)
+            if guild_id in own_guilds:
+                self.jail_index.set(guild_id, user_id, 0)
+                await self.release_scheduler.cancel(guild_id, user_id)
+                self.leaderboard.invalidate(guild_id)
+                self.target_pool.invalidate(guild_id)
+            if progress is not None:
+                await progress(done, len(guild_ids))
+                
+        self.references.forget_target(user_id)
+        return records, references
+        
+    async def wipe_all_data(self, progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> WipeResult:
+        """Wipe every member's data and every guild's settings.
+        
+        Resumes an interrupted wipe if there is one. In-memory state is
+        dropped before and after, so nothing cached is written back into the
+        wiped data.
+        
+        Parameters
+        ----------
+        progress: Optional[Callable[[int, int], Awaitable[None]]]
+            Awaited with (guilds done, guilds total) after each chunk
+        """
+        self._forget_all_state()
+        result = await self.wiper.run(self.bot.guilds, (Config.MEMBER, Config.GUILD), progress)
+        self._forget_all_state()
+        await self.release_scheduler.clear()
+        return result
+        
+    def _forget_all_state(self) -> None:
+        """Drop every cache and index built from member data or guild settings."""
+        self.member_cache.clear()
+        self.leaderboard.invalidate()
+        self.target_pool.invalidate()
+        self.jail_index.clear()
+        self.references.clear()
+        CATALOG.invalidate()
                     
+    async def get_guild_settings(self, guild: discord.Guild, field: Optional[str] = None) -> Any:
+        """Read a guild's settings, or just one field of them.
+        
+        Reads are timed as ``config.read``, like the member cache's.
+        """
+        group = self.config.guild(guild)
+        with PERF.timed("config.read"):
+            if field is None:
+                return await group.all()
+            return await group.get_attr(field)()
+        
+    async def get_member_snapshot(self, member: discord.Member) -> MemberSnapshot:
+        """Load everything the crime checks need for a member in one go.
+        
+        Costs one cached member read and a single guild settings read.
+        """
+        member_data = await self.member_cache.get(member)
+        guild_data = await self.get_guild_settings(member.guild)
+        snapshot = MemberSnapshot(member, member_data, guild_data)
+        
+        # Clear jail if time is up
+        if snapshot.jail_until and not snapshot.is_jailed():
+            await self.member_cache.set(member, "jail_until", 0)
+            
+        return snapshot
+        
     async def get_jail_time_remaining(self, member: discord.Member) -> int:
         """Get remaining jail time in seconds."""
-        jail_until = await self.config.member(member).jail_until()
+        jail_until = (await self.member_cache.get(member))["jail_until"]
         if not jail_until:
             return 0
             
@@ -91,14 +394,14 @@ class CityBase:
         
         # Clear jail if time is up
         if remaining == 0 and jail_until != 0:
-            await self.config.member(member).jail_until.set(0)
+            await self.member_cache.set(member, "jail_until", 0)
             
         return remaining
         
     async def get_remaining_cooldown(self, member: discord.Member, action_type: str) -> int:
         """Get remaining cooldown time for an action."""
         current_time = int(time.time())
-        last_actions = await self.config.member(member).last_actions()
+        last_actions = (await self.member_cache.get(member))["last_actions"]
         
         # Get last attempt time and cooldown
         last_attempt = last_actions.get(action_type, 0)
@@ -106,7 +409,7 @@ class CityBase:
             return 0
             
         # Get crime data for cooldown duration
-        crime_options = await self.config.guild(member.guild).crime_options()
+        crime_options = await self.get_guild_settings(member.guild, "crime_options")
         if action_type not in crime_options:
             return 0
             
@@ -118,41 +421,37 @@ class CityBase:
     async def set_action_cooldown(self, member: discord.Member, action_type: str):
         """Set cooldown for an action."""
         current_time = int(time.time())
-        async with self.config.member(member).last_actions() as last_actions:
-            last_actions[action_type] = current_time
+        async with self.member_cache.edit(member) as member_data:
+            member_data["last_actions"][action_type] = current_time
             
     async def is_jailed(self, member: discord.Member) -> bool:
         """Check if a member is currently jailed."""
+        if self.jail_index.is_loaded:
+            return self.jail_index.is_jailed(member.guild.id, member.id)
         remaining = await self.get_jail_time_remaining(member)
         return remaining > 0
 
+    async def jailed_members(self, guild: discord.Guild) -> List[Tuple[int, int]]:
+        """Get a guild's active sentences as (jail_until, member_id), soonest release first."""
+        await self.jail_index.ensure_loaded(self.config, self.member_cache)
+        self.jail_index.expire_due()
+        return self.jail_index.jailed_members(guild.id)
+
     async def apply_fine(self, member: discord.Member, crime_type: str, crime_data: dict) -> tuple[bool, int]:
         """Apply a fine to a user. Returns (paid_successfully, amount)."""
         fine_amount = int(crime_data["max_reward"] * crime_data["fine_multiplier"])
         
-        try:
-            # Try to take full fine
-            await bank.withdraw_credits(member, fine_amount)
-            
-            # Update stats
-            async with self.config.member(member).all() as member_data:
-                member_data["total_fines_paid"] += fine_amount
-            
-            return True, fine_amount
-        except ValueError:
-            # If they can't pay full fine, take what they have
-            try:
-                balance = await bank.get_balance(member)
-                if balance > 0:
-                    await bank.withdraw_credits(member, balance)
-                    
-                    # Update stats with partial payment
-                    async with self.config.member(member).all() as member_data:
-                        member_data["total_fines_paid"] += balance
-                        
-                return False, fine_amount
-            except Exception as e:
-                return False, fine_amount
+        # If they can't pay the full fine, take what they have
+        credits = BankBatch(self.bank_locks, source="fine")
+        fine = credits.withdraw(member, fine_amount)
+        await credits.commit()
+        paid = fine.taken
+        
+        if paid:
+            async with self.member_cache.edit(member) as member_data:
+                member_data["total_fines_paid"] += paid
+                
+        return paid == fine_amount, fine_amount
                 
     async def handle_target_crime(
         self,
@@ -162,31 +461,33 @@ class CityBase:
         success: bool
     ) -> tuple[int, str]:
         """Handle a targeted crime attempt. Returns (amount, message)."""
-        settings = await self.config.guild(member.guild).global_settings()
+        settings = await self.get_guild_settings(member.guild, "global_settings")
         
         if success:
-            # Calculate amount to steal
-            amount = await calculate_stolen_amount(target, crime_data, settings)
-            
             try:
-                # Check target's balance first
-                target_balance = await bank.get_balance(target)
+                # Calculate amount to steal from the batch's one balance read
+                credits = BankBatch(self.bank_locks, source="transfer")
+                target_balance = await credits.balance(target)
+                amount = await calculate_stolen_amount(target, crime_data, settings, target_balance)
                 if target_balance < amount:
                     return 0, _("Target doesn't have enough {currency}!").format(currency=await bank.get_currency_name(target.guild))
                     
-                # Perform the transfer atomically
-                await bank.withdraw_credits(target, amount)
-                await bank.deposit_credits(member, amount)
+                # Perform the transfer atomically, capped at what the target has under the lock
+                theft = credits.transfer(target, member, amount)
+                await credits.commit()
+                amount = theft.moved
+                if not amount:
+                    return 0, _("Failed to steal credits: Balance changed!")
                 
                 # Update stats only after successful transfer
-                async with self.config.member(member).all() as member_data:
+                async with self.member_cache.edit(member) as member_data:
                     member_data["total_stolen_from"] += amount
                     member_data["total_credits_earned"] += amount
                     member_data["last_target"] = target.id
                     if amount > member_data["largest_heist"]:
                         member_data["largest_heist"] = amount
                         
-                async with self.config.member(target).all() as target_data:
+                async with self.member_cache.edit(target) as target_data:
                     target_data["total_stolen_by"] += amount
                 
                 return amount, _("🎉 Вы успешно украли {amount:,} {currency} у {target}!").format(
@@ -201,7 +502,7 @@ class CityBase:
             fine_paid, fine_amount = await self.apply_fine(member, crime_data["crime_type"], crime_data)
             
             # Update stats
-            async with self.config.member(member).all() as member_data:
+            async with self.member_cache.edit(member) as member_data:
                 member_data["total_failed_crimes"] += 1
             
             if fine_paid:
@@ -217,10 +518,41 @@ class CityBase:
                     minutes=crime_data["jail_time"] // 60
                 )
                 
+    async def cog_load(self):
+        """Start background work when cog is loaded."""
+        self.member_cache.start()
+        self.tasks.append(asyncio.create_task(self._load_jail_state()))
+        
+        port = await self.config.metrics_port()
+        if port is not None:
+            try:
+                await self.metrics_server.start(port, await self.config.metrics_host())
+            except (OSError, RuntimeError):
+                log.exception("Failed to start the metrics server on port %s", port)
+        
+    async def _load_jail_state(self):
+        """Load member indexes and pending release notifications once members can be looked up."""
+        await self.bot.wait_until_ready()
+        if await self.wiper.pending() is not None:
+            # The bot went down mid-wipe, finish it before reading member data
+            await self.wipe_all_data()
+        await self.jail_index.ensure_loaded(self.config, self.member_cache)
+        await self.references.ensure_loaded(self.config, self.member_cache)
+        await self.release_scheduler.load()
+        self.release_scheduler.start()
+        
     async def cog_unload(self):
         """Clean up when cog is unloaded."""
         for task in self.tasks:
             task.cancel()
+        self.release_scheduler.stop()
+        self.reveals.stop()
+        self.outbox.close()
+        await self.metrics_server.stop()
+        self.metrics.unset("city_jailed_members", "city_pending_release_notifications", "city_outbox_depth")
+        # Persist everything that hasn't been flushed yet
+        await self.member_cache.close()
+        
     class ConfirmWipeView(discord.ui.View):
         def __init__(self, ctx: commands.Context, user: discord.Member):
             super().__init__(timeout=30.0)  # 30 second timeout
@@ -394,25 +726,17 @@ class CityBase:
             return
 
         try:
-            # Step 1: Clear all member data across all guilds
-            all_guilds = self.bot.guilds
-            for guild in all_guilds:
-                await self.config.member_from_ids(guild.id, user.id).clear()
-            
-            # Step 2: Remove user from other members' data
-            all_members = await self.config.all_members()
-            for guild_id, guild_data in all_members.items():
-                for member_id, member_data in guild_data.items():
-                    if member_id == user.id:
-                        continue  # Skip the user's own data as it's already cleared
-                        
-                    modified = False
-                    # Check last_target
-                    if member_data.get("last_target") == user.id:
-                        await self.config.member_from_ids(guild_id, member_id).last_target.set(None)
-                        modified = True
+            status = await self.outbox.send(ctx.channel, f"⏳ Wiping city data for {user.display_name}...")
+            records, references = await self.erase_user_data(
+                user.id, WipeProgress(self.outbox, status, f"Wiping city data for {user.display_name}, guilds")
+            )
             
-            await ctx.send(f"✅ Successfully wiped all city data for {user.display_name} across all guilds.")
+            await self.outbox.edit(
+                status,
+                content=f"✅ Successfully wiped all city data for {user.display_name} across all guilds.\n"
+                f"• Removed {records:,} member records\n"
+                f"• Cleared {references:,} references in other users' data"
+            )
             
         except Exception as e:
             await ctx.send(f"❌ An error occurred while wiping data: {str(e)}")
@@ -460,27 +784,21 @@ class CityBase:
             return
 
         try:
-            # Step 1: Clear all member data across all guilds
-            all_members = await self.config.all_members()
-            count = 0
-            for guild_id, guild_data in all_members.items():
-                for member_id in guild_data.keys():
-                    await self.config.member_from_ids(guild_id, member_id).clear()
-                    count += 1
+            status = await self.outbox.send(ctx.channel, "⏳ Wiping all city data...")
+            result = await self.wipe_all_data(WipeProgress(self.outbox, status, "Wiping all city data, guilds"))
             
-            # Step 2: Clear all guild settings to defaults
-            guild_count = 0
-            all_guilds = self.bot.guilds
-            for guild in all_guilds:
-                await self.config.guild(guild).clear()
-                guild_count += 1
-                
-            await ctx.send(f"✅ Successfully wiped ALL city data:\n"
-                         f"• Cleared data for {count:,} users\n"
-                         f"• Reset settings in {guild_count:,} guilds")
+            await self.outbox.edit(
+                status,
+                content=f"✅ Successfully wiped ALL city data:\n"
+                f"• Cleared member data and settings in {result.guilds:,} guilds\n"
+                f"• Swept data left by guilds the bot is no longer in"
+            )
             
         except Exception as e:
-            await ctx.send(f"❌ An error occurred while wiping data: {str(e)}")
+            await ctx.send(
+                f"❌ An error occurred while wiping data: {str(e)}\n"
+                "Run the command again to resume where the wipe stopped."
+            )
 
     @city.command(name="inventory")
     @commands.guild_only()
@@ -0,0 +1,231 @@
+"""Write-behind cache for City member data.
+
+Every crime, bail or jailbreak touches the same handful of member fields many
+times. Going to Config for each of those reads and read-modify-writes costs a
+driver round trip per access, so member data is kept in memory here instead:
+
+- Reads are served from memory after the first load of a member.
+- Changes are made through :meth:`MemberStateCache.edit`, which holds a
+  per-member lock and marks the member dirty.
+- Dirty members are written back in one ``set`` per member by a background
+  flush, so several changes made during one interaction cost a single write.
+- Everything still dirty is flushed when the cog unloads.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import discord
+from redbot.core import Config
+
+from .perf import PERF
+
+log = logging.getLogger("red.city.cache")
+
+MemberKey = Tuple[int, int]  # (guild_id, member_id)
+Listener = Callable[[MemberKey, Dict[str, Any]], None]
+
+
+class MemberStateCache:
+    """In-memory member data with dirty tracking and coalesced flushes.
+
+    Attributes
+    ----------
+    config: Config
+        The cog's Config, used to load members and persist dirty ones
+    flush_interval: float
+        Seconds between background flushes
+    max_idle: float
+        Seconds a clean entry may go unused before it is evicted
+    """
+
+    def __init__(self, config: Config, flush_interval: float = 10.0, max_idle: float = 900.0) -> None:
+        self.config = config
+        self.flush_interval = flush_interval
+        self.max_idle = max_idle
+        self._data: Dict[MemberKey, Dict[str, Any]] = {}
+        self._dirty: Set[MemberKey] = set()
+        self._locks: Dict[MemberKey, asyncio.Lock] = {}
+        self._last_used: Dict[MemberKey, float] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._listeners: List[Listener] = []
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call ``listener(key, data)`` after every change to a member.
+
+        Listeners run synchronously and must not modify the data.
+        """
+        self._listeners.append(listener)
+
+    def _changed(self, key: MemberKey, data: Dict[str, Any]) -> None:
+        """Mark a member dirty and tell listeners about the change."""
+        self._dirty.add(key)
+        for listener in self._listeners:
+            try:
+                listener(key, data)
+            except Exception:
+                log.exception("City member cache listener %r failed", listener)
+
+    @staticmethod
+    def key(member: discord.Member) -> MemberKey:
+        """Get the cache key for a member."""
+        return member.guild.id, member.id
+
+    def lock(self, member: discord.Member) -> asyncio.Lock:
+        """Get the lock guarding a member's data."""
+        key = self.key(member)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _load(self, key: MemberKey) -> Dict[str, Any]:
+        """Get a member's data, loading it from Config on a miss."""
+        self._last_used[key] = time.monotonic()
+        data = self._data.get(key)
+        if data is None:
+            with PERF.timed("config.read"):
+                loaded = await self.config.member_from_ids(*key).all()
+            # Another coroutine may have loaded the member while we awaited
+            data = self._data.setdefault(key, loaded)
+        return data
+
+    async def get(self, member: discord.Member) -> Dict[str, Any]:
+        """Get a member's data.
+
+        The returned dict is the cached copy and must be treated as read-only.
+        Use :meth:`edit` or :meth:`set` to change it.
+        """
+        return await self._load(self.key(member))
+
+    @contextlib.asynccontextmanager
+    async def edit(self, member: discord.Member) -> AsyncIterator[Dict[str, Any]]:
+        """Lock a member and yield their data for modification.
+
+        Works like ``async with config.member(member).all() as data`` but the
+        change is only persisted on the next flush. Do not nest ``edit`` calls
+        for the same member, the lock is not re-entrant.
+        """
+        key = self.key(member)
+        async with self.lock(member):
+            data = await self._load(key)
+            try:
+                yield data
+            finally:
+                # The dict is live, so whatever was changed is already visible
+                self._changed(key, data)
+
+    async def set(self, member: discord.Member, field: str, value: Any) -> None:
+        """Set a single field of a member's data.
+
+        A plain assignment can't interleave with other coroutines, so this
+        doesn't take the member's lock and is safe to call inside :meth:`edit`.
+        """
+        key = self.key(member)
+        data = await self._load(key)
+        data[field] = value
+        self._changed(key, data)
+
+    def update_cached(self, guild_id: int, member_id: int, **fields: Any) -> bool:
+        """Change fields of a member if they are cached, keeping other edits.
+
+        Used after fields were changed directly in Config, so the cached copy
+        doesn't write the old values back. Like :meth:`set` this doesn't take
+        the member's lock.
+
+        Returns
+        -------
+        bool
+            Whether the member was cached
+        """
+        key = (guild_id, member_id)
+        data = self._data.get(key)
+        if data is None:
+            return False
+        data.update(fields)
+        self._changed(key, data)
+        return True
+
+    def cached_members(self, guild_id: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Iterate over (member_id, data) of the cached members of a guild."""
+        for (cached_guild_id, member_id), data in list(self._data.items()):
+            if cached_guild_id == guild_id:
+                yield member_id, data
+
+    def drop(self, guild_id: int, member_id: int) -> None:
+        """Forget a member without writing them back.
+
+        Used after the member's stored data was changed directly in Config.
+        """
+        key = (guild_id, member_id)
+        self._data.pop(key, None)
+        self._dirty.discard(key)
+        self._last_used.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every cached member without writing anything back."""
+        self._data.clear()
+        self._dirty.clear()
+        self._last_used.clear()
+
+    async def flush(self) -> int:
+        """Write every dirty member back to Config.
+
+        Returns
+        -------
+        int
+            The number of members written
+        """
+        written = 0
+        while self._dirty:
+            key = self._dirty.pop()
+            data = self._data.get(key)
+            if data is None:
+                continue
+            try:
+                with PERF.timed("config.write"):
+                    await self.config.member_from_ids(*key).set(data)
+            except Exception:
+                # Keep it dirty so the next flush retries
+                self._dirty.add(key)
+                log.exception("Failed to flush City data for member %s in guild %s", key[1], key[0])
+                break
+            written += 1
+        return written
+
+    def _evict_idle(self) -> None:
+        """Drop clean entries that have not been used for a while."""
+        cutoff = time.monotonic() - self.max_idle
+        for key in [k for k, used in self._last_used.items() if used < cutoff]:
+            if key in self._dirty:
+                continue
+            lock = self._locks.get(key)
+            if lock is not None and lock.locked():
+                continue
+            self._data.pop(key, None)
+            self._locks.pop(key, None)
+            del self._last_used[key]
+
+    async def _flush_loop(self) -> None:
+        """Periodically flush dirty members."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            self._evict_idle()
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the background flush and write back everything still dirty."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
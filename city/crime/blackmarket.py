@@ -114,7 +114,7 @@ class BlackmarketView(discord.ui.View):
             return
         
         # Handle purchase
-        async with self.cog.config.member(self.ctx.author).all() as member_data:
+        async with self.cog.member_cache.edit(self.ctx.author) as member_data:
             if item["type"] == "perk":
                 if item_id in member_data.get("purchased_perks", []):
                     await interaction.response.send_message(
@@ -0,0 +1,323 @@
+"""Compiled crime scenarios and events.
+
+Scenario and event definitions are plain dicts, which made every crime copy
+lists, pick events with repeated ``random.choice`` + ``list.remove`` passes and
+re-read a guild's custom scenarios from Config. The catalog compiles them once
+instead:
+
+- Each pool gets an alias table (Vose's method), so a weighted draw costs two
+  random numbers and no allocation. Entries may carry an optional ``weight``,
+  and default to 1. A weight of 0 keeps an entry from being drawn, negative
+  weights are rejected.
+- Event effects are flattened into numeric fields on a ``__slots__`` record,
+  and :func:`resolve` folds any number of them into one :class:`Resolution`.
+  Crimes, jailbreaks and simulations all go through it.
+- Text is parsed into a :class:`Template` once rather than on every format.
+- Custom scenarios are compiled per guild on first use and dropped again when
+  they are added or removed.
+"""
+
+import random
+from string import Formatter
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+import discord
+from redbot.core import Config
+
+
+# Chance that each event after the first happens, in order
+EXTRA_EVENT_CHANCES = (0.75, 0.50, 0.10)
+
+# Events can't push the success chance below this
+MIN_SUCCESS_CHANCE = 0.05
+
+_formatter = Formatter()
+
+
+class Template:
+    """A format string parsed once.
+
+    Rendering joins the parsed pieces directly. Anything that needs a format
+    spec or conversion falls back to :meth:`str.format`.
+    """
+
+    __slots__ = ("text", "fields", "_parts", "_simple")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        parsed = list(_formatter.parse(text))
+        self._parts: Tuple[Tuple[str, Optional[str]], ...] = tuple(
+            (literal, field) for literal, field, _spec, _conversion in parsed
+        )
+        self._simple = all(not spec and not conversion for _literal, _field, spec, conversion in parsed)
+        self.fields: FrozenSet[str] = frozenset(field for _literal, field in self._parts if field)
+
+    def render(self, **kwargs: Any) -> str:
+        """Fill the template like ``text.format(**kwargs)``."""
+        if not self._simple:
+            return self.text.format(**kwargs)
+        pieces = []
+        for literal, field in self._parts:
+            pieces.append(literal)
+            if field is not None:
+                pieces.append(str(kwargs[field]))
+        return "".join(pieces)
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class AliasTable:
+    """O(1) weighted sampling over a fixed set of indices (Vose's alias method)."""
+
+    __slots__ = ("_prob", "_alias", "_size")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Weights can't be negative")
+        size = len(weights)
+        self._size = size
+        self._prob = [1.0] * size
+        self._alias = list(range(size))
+        total = float(sum(weights))
+        if not size or total <= 0:
+            return
+
+        scaled = [weight * size / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Draw one index."""
+        i = int(rng.random() * self._size)
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+
+class CompiledEvent:
+    """An event with its effects flattened into numbers.
+
+    Attributes
+    ----------
+    chance: float
+        Success chance change, positive for ``chance_bonus`` and negative for
+        ``chance_penalty``
+    reward_mult: float
+        Reward multiplier, 1.0 when the event has none
+    jail_mult: float
+        Jail time multiplier, 1.0 when the event has none
+    credits: int
+        Direct credit change, from ``credits_*`` (crimes) or ``currency_*``
+        (jailbreaks)
+    template: Template
+        The parsed event text
+    data: Dict[str, Any]
+        The original event definition
+    """
+
+    __slots__ = ("chance", "reward_mult", "jail_mult", "credits", "template", "data")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        self.template = Template(data["text"])
+        self.chance = float(data.get("chance_bonus", 0) or -data.get("chance_penalty", 0))
+        self.reward_mult = float(data.get("reward_multiplier", 1.0))
+        self.jail_mult = float(data.get("jail_multiplier", 1.0))
+        self.credits = int(
+            data.get("credits_bonus", 0) or data.get("currency_bonus", 0)
+            or -(data.get("credits_penalty", 0) or data.get("currency_penalty", 0))
+        )
+
+
+class Resolution(NamedTuple):
+    """The combined effect of a set of events."""
+
+    success_chance: float
+    reward_mult: float
+    jail_mult: float
+    credit_delta: int
+
+
+def resolve(
+    base_chance: float, events: Sequence[CompiledEvent], balance: Optional[int] = None
+) -> Resolution:
+    """Fold events into a final success chance, multipliers and credit change.
+
+    Events apply in order. Chance bonuses cap at 100% and penalties stop at
+    :data:`MIN_SUCCESS_CHANCE`, so order matters once a limit is hit.
+
+    Parameters
+    ----------
+    base_chance: float
+        Success chance before any event
+    events: Sequence[CompiledEvent]
+        The events that happened
+    balance: Optional[int]
+        The member's balance. When given, credit penalties never take more
+        than what's left of it.
+
+    Returns
+    -------
+    Resolution
+        ``(success_chance, reward_mult, jail_mult, credit_delta)``
+    """
+    chance = base_chance
+    reward_mult = 1.0
+    jail_mult = 1.0
+    credit_delta = 0
+    for event in events:
+        if event.chance > 0:
+            chance = min(1.0, chance + event.chance)
+        elif event.chance < 0:
+            chance = max(MIN_SUCCESS_CHANCE, chance + event.chance)
+        reward_mult *= event.reward_mult
+        jail_mult *= event.jail_mult
+        credits = event.credits
+        if credits < 0 and balance is not None:
+            credits = max(credits, -(balance + credit_delta))
+        credit_delta += credits
+    return Resolution(chance, reward_mult, jail_mult, credit_delta)
+
+
+class EventPool:
+    """Events that can happen during one crime type or jailbreak scenario."""
+
+    __slots__ = ("events", "_table", "_drawable")
+
+    def __init__(self, events: Sequence[Dict[str, Any]]) -> None:
+        self.events: Tuple[CompiledEvent, ...] = tuple(CompiledEvent(event) for event in events)
+        weights = [event.get("weight", 1) for event in events]
+        self._table = AliasTable(weights)
+        # Events with weight 0 are never drawn
+        self._drawable = sum(1 for weight in weights if weight > 0)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def sample(self, count: int, rng: random.Random = random) -> List[CompiledEvent]:
+        """Draw ``count`` distinct events (fewer if the pool has fewer drawable events)."""
+        count = min(count, self._drawable)
+        picked: List[CompiledEvent] = []
+        while len(picked) < count:
+            # Pools are far larger than the handful of events drawn, so
+            # redrawing duplicates is cheaper than rebuilding a table
+            event = self.events[self._table.sample(rng)]
+            if event not in picked:
+                picked.append(event)
+        return picked
+
+    def sample_crime(self, rng: random.Random = random) -> List[CompiledEvent]:
+        """Draw the events of one crime: one for sure, then each extra by chance."""
+        count = 1 if self.events else 0
+        for chance in EXTRA_EVENT_CHANCES:
+            if rng.random() < chance:
+                count += 1
+        return self.sample(count, rng)
+
+
+class ScenarioPool:
+    """A weighted set of scenarios with pre-parsed texts."""
+
+    __slots__ = ("scenarios", "templates", "_table")
+
+    def __init__(self, scenarios: Sequence[Dict[str, Any]]) -> None:
+        self.scenarios: Tuple[Dict[str, Any], ...] = tuple(scenarios)
+        self.templates: Tuple[Dict[str, Template], ...] = tuple(
+            {key: Template(value) for key, value in scenario.items() if key.endswith("_text")}
+            for scenario in self.scenarios
+        )
+        self._table = AliasTable([scenario.get("weight", 1) for scenario in self.scenarios])
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def sample_index(self, rng: random.Random = random) -> int:
+        return self._table.sample(rng)
+
+    def sample(self, rng: random.Random = random) -> Dict[str, Any]:
+        return self.scenarios[self._table.sample(rng)]
+
+
+class CrimeCatalog:
+    """Every compiled scenario and event.
+
+    Parameters
+    ----------
+    crime_events: Dict[str, List[Dict[str, Any]]]
+        Events per crime type
+    random_scenarios: List[Dict[str, Any]]
+        Built-in random crime scenarios
+    jailbreak_scenarios: List[Dict[str, Any]]
+        Jailbreak scenarios, each with its own ``events``
+    """
+
+    def __init__(
+        self,
+        crime_events: Dict[str, List[Dict[str, Any]]],
+        random_scenarios: List[Dict[str, Any]],
+        jailbreak_scenarios: List[Dict[str, Any]],
+    ) -> None:
+        self.crime_events: Dict[str, EventPool] = {
+            crime_type: EventPool(events) for crime_type, events in crime_events.items()
+        }
+        self.random_scenarios = random_scenarios
+        self.jailbreaks = ScenarioPool(jailbreak_scenarios)
+        self.jailbreak_events: Tuple[EventPool, ...] = tuple(
+            EventPool(scenario["events"]) for scenario in jailbreak_scenarios
+        )
+        self._default_scenarios = ScenarioPool(random_scenarios)
+        self._guild_scenarios: Dict[int, ScenarioPool] = {}
+        self._templates: Dict[str, Template] = {}
+        for pool in (*self.crime_events.values(), *self.jailbreak_events):
+            for event in pool.events:
+                self._templates[event.template.text] = event.template
+        for pool in (self._default_scenarios, self.jailbreaks):
+            for templates in pool.templates:
+                for template in templates.values():
+                    self._templates[template.text] = template
+
+    def template(self, text: str) -> Template:
+        """Get the parsed template for a text, parsing and keeping it if it's new."""
+        template = self._templates.get(text)
+        if template is None:
+            template = self._templates[text] = Template(text)
+        return template
+
+    def sample_events(self, crime_type: str, rng: random.Random = random) -> List[CompiledEvent]:
+        """Draw the events for one crime of ``crime_type``."""
+        pool = self.crime_events.get(crime_type)
+        return pool.sample_crime(rng) if pool else []
+
+    async def scenarios(self, config: Config, guild: discord.Guild) -> ScenarioPool:
+        """Get the random crime scenarios of a guild, built-in plus custom."""
+        pool = self._guild_scenarios.get(guild.id)
+        if pool is None:
+            custom = await config.guild(guild).custom_scenarios()
+            pool = ScenarioPool(self.random_scenarios + custom) if custom else self._default_scenarios
+            self._guild_scenarios[guild.id] = pool
+        return pool
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Recompile one guild's custom scenarios, or every guild's, on next use."""
+        if guild_id is None:
+            self._guild_scenarios.clear()
+        else:
+            self._guild_scenarios.pop(guild_id, None)
+
+    def sample_jailbreak(
+        self, rng: random.Random = random
+    ) -> Tuple[Dict[str, Any], EventPool]:
+        """Draw a jailbreak scenario along with its compiled events."""
+        i = self.jailbreaks.sample_index(rng)
+        return self.jailbreaks.scenarios[i], self.jailbreak_events[i]
@@ -7,10 +7,15 @@ import discord
 import random
 import time
 import asyncio
-from .scenarios import get_random_scenario, get_random_jailbreak_scenario
+from .scenarios import CATALOG
+from .catalog import resolve
 from .views import CrimeListView, BailView, CrimeView, TargetSelectionView, CrimeButton, MainMenuView, AddScenarioModal
 from .data import CRIME_TYPES, DEFAULT_GUILD, DEFAULT_MEMBER
 from datetime import datetime
+from ..banking import BankBatch
+from ..leaderboard import LEADERBOARD_CATEGORIES
+from ..timeline import RevealTimeline
+from ..perf import PERF
 from ..utils import (
     format_cooldown_time, 
     get_crime_emoji, 
@@ -20,12 +25,16 @@ from ..utils import (
 
 _ = Translator("Crime", __file__)
 
+# Reveal pacing of a jailbreak, in seconds: attempt to first event, then
+# between events and before the result
+JAILBREAK_ATTEMPT_DELAY = 3.0
+JAILBREAK_EVENT_DELAY = 3.5
+
 class CrimeCommands:
     """Crime commands mixin."""
 
     def __init__(self, bot):
         self.bot = bot
-        self.notification_tasks = {}  # Store notification tasks by member ID
 
     @commands.group(name="crime", invoke_without_command=True)
     async def crime(self, ctx: commands.Context):
@@ -35,7 +44,7 @@ class CrimeCommands:
         """
         try:
             # Get member data
-            member_data = await self.config.member(ctx.author).all()
+            member_data = await self.member_cache.get(ctx.author)
             
             # Get jail status
             jail_remaining = await self.get_jail_time_remaining(ctx.author)
@@ -72,13 +81,13 @@ class CrimeCommands:
             
             # Create and send view
             view = MainMenuView(self, ctx)
-            view.message = await ctx.send(embed=embed, view=view)
+            view.message = await self.outbox.send(ctx.channel, embed=embed, view=view)
             
             # Initialize menu options
             await view.initialize_menu()
             
         except Exception as e:
-            await ctx.send(f"An error occurred while opening the crime menu: {str(e)}")
+            await self.outbox.send(ctx.channel, f"An error occurred while opening the crime menu: {str(e)}")
 
     @crime.command(name="commit")
     async def crime_commit(self, ctx: commands.Context):
@@ -100,12 +109,13 @@ class CrimeCommands:
           Если вас поймают, вы попадете в тюрьму!
         """
         try:
-            # Get guild settings
-            settings = await self.config.guild(ctx.guild).global_settings()
-            crime_options = await self.config.guild(ctx.guild).crime_options()
+            # Load jail state, cooldowns and guild settings once
+            snapshot = await self.get_member_snapshot(ctx.author)
+            settings = snapshot.settings
+            crime_options = snapshot.crime_options
             
             # Check jail status
-            jail_remaining = await self.get_jail_time_remaining(ctx.author)
+            jail_remaining = snapshot.jail_remaining()
             jail_status = ""
             if jail_remaining > 0:
                 if jail_remaining > 3600:  # More than 1 hour
@@ -140,7 +150,7 @@ class CrimeCommands:
                 crime_type, data = crimes[i]
                 
                 # Get cooldown status
-                remaining = await self.get_remaining_cooldown(ctx.author, crime_type)
+                remaining = snapshot.cooldown_remaining(crime_type)
                 status = format_cooldown_time(remaining)
                 
                 # Format description
@@ -152,7 +162,7 @@ class CrimeCommands:
                     next_crime_type, next_data = crimes[i + 1]
                     
                     # Get cooldown status for next crime
-                    next_remaining = await self.get_remaining_cooldown(ctx.author, next_crime_type)
+                    next_remaining = snapshot.cooldown_remaining(next_crime_type)
                     next_status = format_cooldown_time(next_remaining)
                     
                     # Format next description
@@ -183,14 +193,14 @@ class CrimeCommands:
             
             # Create view with crime buttons
             view = CrimeListView(self, ctx, crime_options)
-            message = await ctx.send(embed=embed, view=view)
+            message = await self.outbox.send(ctx.channel, embed=embed, view=view)
             view.message = message
             
             # Update button states based on jail and cooldowns
             await view.update_button_states()
             
         except Exception as e:
-            await ctx.send(_("При настройке параметров преступления произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
+            await self.outbox.send(ctx.channel, _("При настройке параметров преступления произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
 
     @crime.command(name="status")
     async def crime_status(self, ctx: commands.Context, user: discord.Member = None):
@@ -203,9 +213,10 @@ class CrimeCommands:
         try:
             # Get member data
             target = user or ctx.author
-            member_data = await self.config.member(target).all()
-            settings = await self.config.guild(ctx.guild).global_settings()
-            crime_options = await self.config.guild(ctx.guild).crime_options()
+            member_data = await self.member_cache.get(target)
+            snapshot = await self.get_member_snapshot(target)
+            settings = snapshot.settings
+            crime_options = snapshot.crime_options
 
             # Create status embed
             embed = discord.Embed(
@@ -218,10 +229,10 @@ class CrimeCommands:
             embed.set_thumbnail(url=target.display_avatar.url)
             
             # Check jail status
-            remaining_jail = await self.get_jail_time_remaining(target)
+            remaining_jail = snapshot.jail_remaining()
             if remaining_jail > 0:
                 # Check if user has reduced sentence perk
-                has_reducer = "jail_reducer" in member_data.get("purchased_perks", [])
+                has_reducer = snapshot.has_perk("jail_reducer")
                 
                 if has_reducer:
                     # Calculate original time (current time is after 20% reduction)
@@ -256,7 +267,7 @@ class CrimeCommands:
                 if not data.get("enabled", True):
                     continue
                     
-                remaining = await self.get_remaining_cooldown(target, crime_type)
+                remaining = snapshot.cooldown_remaining(crime_type)
                 crime_name = crime_type.replace('_', ' ').title()
                 cooldowns.append(
                     f"{get_crime_emoji(crime_type)} **{crime_name}:** {format_cooldown_time(remaining)}"
@@ -313,10 +324,10 @@ class CrimeCommands:
                 except discord.NotFound:
                     pass
             
-            await ctx.send(embed=embed)
+            await self.outbox.send(ctx.channel, embed=embed)
         
         except Exception as e:
-            await ctx.send(_("При получении статуса произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
+            await self.outbox.send(ctx.channel, _("При получении статуса произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
             
     @crime.command(name="stats")
     async def crime_stats(self, ctx: commands.Context, user: discord.Member = None):
@@ -329,7 +340,7 @@ class CrimeCommands:
         try:
             # Get member data
             target = user or ctx.author
-            member_data = await self.config.member(target).all()
+            member_data = await self.member_cache.get(target)
             currency_name = await bank.get_currency_name(ctx.guild)
 
             # Create stats embed
@@ -374,10 +385,10 @@ class CrimeCommands:
                 inline=True
             )
             
-            await ctx.send(embed=embed)
+            await self.outbox.send(ctx.channel, embed=embed)
         
         except Exception as e:
-            await ctx.send(_("При получении статуса произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
+            await self.outbox.send(ctx.channel, _("При получении статуса произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
 
     @crime.command(name="bail")
     async def crime_bail(self, ctx: commands.Context):
@@ -390,13 +401,13 @@ class CrimeCommands:
             # Check if user is in jail
             jail_time = await self.get_jail_time_remaining(ctx.author)
             if jail_time <= 0:
-                await ctx.send(_("You're not in jail!"))
+                await self.outbox.send(ctx.channel, _("You're not in jail!"))
                 return
                 
             # Get settings
-            settings = await self.config.guild(ctx.guild).global_settings()
+            settings = await self.get_guild_settings(ctx.guild, "global_settings")
             if not settings.get("allow_bail", True):
-                await ctx.send(_("Bail is not allowed in this server!"))
+                await self.outbox.send(ctx.channel, _("Bail is not allowed in this server!"))
                 return
                 
             # Calculate bail cost based on remaining time
@@ -404,7 +415,7 @@ class CrimeCommands:
             
             # Check if user can afford bail
             if not await bank.can_spend(ctx.author, bail_cost):
-                await ctx.send(
+                await self.outbox.send(ctx.channel,
                     _("💵❌У вас недостаточно {currency} чтобы заплатить сумму залога {amount}!").format(
                         currency=await bank.get_currency_name(ctx.guild),
                         amount=bail_cost
@@ -417,7 +428,7 @@ class CrimeCommands:
             currency_name = await bank.get_currency_name(ctx.guild)
             
             # Get member data for perk check
-            member_data = await self.config.member(ctx.author).all()
+            member_data = await self.member_cache.get(ctx.author)
             
             # Create embed for bail prompt
             embed = discord.Embed(
@@ -436,17 +447,18 @@ class CrimeCommands:
             
             # Send bail prompt
             view = BailView(self, ctx, bail_cost, jail_time)
-            message = await ctx.send(embed=embed, view=view)
+            message = await self.outbox.send(ctx.channel, embed=embed, view=view)
             view.message = message
             
             # Reset attempted jailbreak flag when bailing out
-            async with self.config.member(ctx.author).all() as member_data:
+            async with self.member_cache.edit(ctx.author) as member_data:
                 member_data["attempted_jailbreak"] = False
                 
         except Exception as e:
-            await ctx.send(_("При обработке вашего запроса на залог произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
+            await self.outbox.send(ctx.channel, _("При обработке вашего запроса на залог произошла ошибка. Пожалуйста, попробуйте еще раз. Error: {}").format(str(e)))
 
     @crime.command(name="jailbreak")
+    @PERF.measured("crime.jailbreak")
     async def crime_jailbreak(self, ctx: commands.Context):
         """Попытка сбежать из тюрьмы
         
@@ -456,70 +468,69 @@ class CrimeCommands:
             # Check if user is in jail
             jail_time = await self.get_jail_time_remaining(ctx.author)
             if jail_time <= 0:
-                await ctx.send(_("You're not in jail!"))
+                await self.outbox.send(ctx.channel, _("You're not in jail!"))
                 return
                 
             # Get member data
-            member_data = await self.config.member(ctx.author).all()
+            member_data = await self.member_cache.get(ctx.author)
             
             # Check if already attempted jailbreak this sentence
             if member_data.get("attempted_jailbreak", False):
-                await ctx.send(_("You've already attempted to break out this sentence!"))
+                await self.outbox.send(ctx.channel, _("You've already attempted to break out this sentence!"))
                 return
 
             # Mark jailbreak as attempted
-            async with self.config.member(ctx.author).all() as member_data:
+            async with self.member_cache.edit(ctx.author) as member_data:
                 member_data["attempted_jailbreak"] = True
 
             # Get random scenario
-            scenario = get_random_jailbreak_scenario()
+            scenario, event_pool = CATALOG.sample_jailbreak()
             success_chance = scenario["base_chance"]
 
-            # Send attempt message
-            attempt_msg = await ctx.send(_(scenario['attempt_text']).format(
+            # The escape is settled right away and revealed on a timeline
+            timeline = RevealTimeline(ctx.channel)
+            timeline.reveal(0, _(scenario['attempt_text']).format(
                 user=ctx.author.mention
             ))
 
-            # Add suspense delay
-            await asyncio.sleep(3)
-
             # Get 1-3 random events
-            num_events = random.randint(1, 3)
-            selected_events = random.sample(scenario['events'], num_events)
+            selected_events = event_pool.sample(random.randint(1, 3))
             
-            # Apply events in sequence
-            for event in selected_events:
-                event_text = event['text']
+            # Event credit changes, applied once after the last event
+            credits = BankBatch(self.bank_locks, source="jailbreak")
+            balance = await credits.balance(ctx.author)
+            resolution = resolve(success_chance, selected_events, balance)
+            success_chance = resolution.success_chance
+            currency_name = await bank.get_currency_name(ctx.guild)
+            
+            # Show events in sequence, the first after some suspense
+            delay = JAILBREAK_ATTEMPT_DELAY
+            applied = 0
+            for shown, event in enumerate(selected_events, 1):
                 # Format event text with currency name
-                currency_name = await bank.get_currency_name(ctx.guild)
-                event_text = event_text.format(currency=currency_name)
+                event_text = event.template.render(currency=currency_name)
                 
-                # Apply chance modifiers and log them
-                if "chance_bonus" in event:
-                    success_chance = min(1.0, success_chance + event["chance_bonus"])  # Cap at 100%
-                    event_text = f"{event_text}"
-                elif "chance_penalty" in event:
-                    success_chance = max(0.05, success_chance - event["chance_penalty"])  # Minimum 5% chance
-                    event_text = f"{event_text}"
+                # Show what the event actually took, never more than they have
+                change = resolve(0.0, selected_events[:shown], balance).credit_delta - applied
+                applied += change
+                if event.credits > 0:
+                    event_text += f"(+{change} {currency_name})"
+                elif event.credits < 0:
+                    event_text += f"(-{-change} {currency_name})"
                 
-                # Apply currency modifiers
-                if "currency_bonus" in event:
-                    await bank.deposit_credits(ctx.author, event["currency_bonus"])
-                    event_text += f"(+{event['currency_bonus']} {currency_name})"
-                elif "currency_penalty" in event:
-                    await bank.withdraw_credits(ctx.author, event["currency_penalty"])
-                    event_text += f"(-{event['currency_penalty']} {currency_name})"
+                timeline.reveal(delay, event_text)
+                delay = JAILBREAK_EVENT_DELAY
                 
-                await ctx.send(event_text)
-                await asyncio.sleep(3.5)
+            credits.deposit(ctx.author, resolution.credit_delta)
+            await credits.commit()
 
             roll = random.random()
 
             # Attempt escape
             if roll < success_chance:
                 # Success! Clear jail time
-                await self.config.member(ctx.author).jail_until.set(0)
-                await self.config.member(ctx.author).attempted_jailbreak.set(False)  # Reset jailbreak attempt when successful
+                await self.member_cache.set(ctx.author, "jail_until", 0)
+                await self.member_cache.set(ctx.author, "attempted_jailbreak", False)  # Reset jailbreak attempt when successful
                 
                 # Cancel any pending release notification
                 await self._cancel_notification(ctx.author)
@@ -527,9 +538,9 @@ class CrimeCommands:
                 # Double check jail time is cleared
                 remaining = await self.get_jail_time_remaining(ctx.author)
                 if remaining > 0:
-                    await ctx.send(_("Jail time not properly cleared! Remaining: {}").format(format_cooldown_time(remaining)))
+                    await self.outbox.send(ctx.channel, _("Jail time not properly cleared! Remaining: {}").format(format_cooldown_time(remaining)))
                     # Force clear it
-                    await self.config.member(ctx.author).jail_until.set(0)
+                    await self.member_cache.set(ctx.author, "jail_until", 0)
                 
                 # Create success embed
                 embed = discord.Embed(
@@ -542,17 +553,19 @@ class CrimeCommands:
                     value=f"{success_chance:.1%}",
                     inline=True
                 )
-                await ctx.send(embed=embed)
+                timeline.reveal(delay, embed=embed)
             else:
                 # Failed - add 30% more jail time
                 remaining_time = await self.get_jail_time_remaining(ctx.author)
                 added_time = int(remaining_time * 0.3)  # Add 30% more time
                 
                 # Get current jail end time and add the additional time
-                current_jail_until = await self.config.member(ctx.author).jail_until()
+                current_jail_until = (await self.member_cache.get(ctx.author))["jail_until"]
                 new_jail_until = current_jail_until + added_time
-                await self.config.member(ctx.author).jail_until.set(new_jail_until)
-                
+                await self.member_cache.set(ctx.author, "jail_until", new_jail_until)
+                # Move the release notification along with the sentence
+                await self.release_scheduler.extend(ctx.guild.id, ctx.author.id, added_time)
+
                 # Create fail embed
                 embed = discord.Embed(
                     title="⛓️ Неудачный побег из тюрьмы!",
@@ -576,10 +589,12 @@ class CrimeCommands:
                     value=f"{success_chance:.1%}",
                     inline=True
                 )
-                await ctx.send(embed=embed)
+                timeline.reveal(delay, embed=embed)
+            
+            self.reveals.play(timeline)
                 
         except Exception as e:
-            await ctx.send(_("An error occurred while processing your jailbreak attempt. Please try again. Error: {}").format(str(e)))
+            await self.outbox.send(ctx.channel, _("An error occurred while processing your jailbreak attempt. Please try again. Error: {}").format(str(e)))
 
     @crime.command(name="leaderboard", aliases=["lb"])
     @commands.guild_only()
@@ -589,43 +604,39 @@ class CrimeCommands:
         # Get guild's currency name
         currency_name = await bank.get_currency_name(ctx.guild)
         
+        # How each category is shown. Which stats a category ranks by, and
+        # the order they're shown in, comes from LEADERBOARD_CATEGORIES.
         stats = {
             "earnings": {
                 "title": f"💰 __Наибольшее количество заработанных {currency_name}__",
-                "field": "total_credits_earned",
                 "format": "credits"
             },
             "crimes": {
                 "title": "🦹 __Успешные/неудачные преступления__",
-                "fields": ["total_successful_crimes", "total_failed_crimes"],
                 "format": "counts"
             },
             "stolen": {
                 "title": f"💎 __Украдено/Потерянно {currency_name}__",
-                "fields": ["total_stolen_from", "total_stolen_by"],
-                "format": "credits"
+                "format": "pair"
             },
             "largest_heist": {
                 "title": f"🏆 __Самое крупное ограбление__",
-                "field": "largest_heist",
                 "format": "credits"
             },
             "fines": {
                 "title": f"💸 __Большинство штрафов/залогов оплачено__",
-                "fields": ["total_fines_paid", "total_bail_paid"],
                 "format": "credits"
             },
             "streaks": {
                 "title": "🔥 __Самая высокая полоса преступлений__",
-                "field": "highest_streak",
                 "format": "number"
             }
         }
         
-        # Get all member data
-        all_members = await self.config.all_members(ctx.guild)
-        if not all_members:
-            return await ctx.send("No crime statistics found for this server!")
+        # Load the leaderboard index for this guild if needed
+        await self.leaderboard.ensure_built(self.config, ctx.guild, self.member_cache)
+        if not any(self.leaderboard.top(ctx.guild.id, category) for category in LEADERBOARD_CATEGORIES):
+            return await self.outbox.send(ctx.channel, "No crime statistics found for this server!")
 
         embed = discord.Embed(
             title="🏆 Таблица лидеров преступности - Зал позора",
@@ -638,93 +649,52 @@ class CrimeCommands:
         
         # Process each stat category
         field_count = 0  # Track number of non-empty fields
-        for stat_info in stats.values():
-            if "fields" in stat_info:  # Combined stats
-                # Sort members by the sum of both fields
-                sorted_members = sorted(
-                    all_members.items(),
-                    key=lambda x: sum(x[1].get(field, 0) for field in stat_info["fields"]),
-                    reverse=True
-                )[:3]
+        for category, fields in LEADERBOARD_CATEGORIES.items():
+            stat_info = stats[category]
+            # Top 3 members still in the server, already ranked by the index
+            sorted_members = [
+                (member_id, data)
+                for member_id, data in self.leaderboard.top(ctx.guild.id, category)
+                if ctx.guild.get_member(member_id) is not None
+            ][:3]
+            if not sorted_members:
+                continue
                 
-                if not sorted_members:
+            field_lines = []
+            for i, (member_id, data) in enumerate(sorted_members):
+                member = ctx.guild.get_member(member_id)
+                if member is None:
                     continue
                     
-                field_lines = []
-                for i, (member_id, data) in enumerate(sorted_members):
-                    member = ctx.guild.get_member(member_id)
-                    if member is None:
-                        continue
-                        
-                    if stat_info["format"] == "credits":
-                        if stat_info["title"].startswith("💸"):  # Fines category
-                            total_paid = data.get(stat_info['fields'][0], 0) + data.get(stat_info['fields'][1], 0)
-                            field_lines.append(f"{medals[i]} **{member.display_name}** • {humanize_number(total_paid)} {currency_name}")
-                        elif stat_info["title"].startswith("💎"):  # Stolen/Lost category
-                            value1 = humanize_number(data.get(stat_info['fields'][0], 0))
-                            value2 = humanize_number(data.get(stat_info['fields'][1], 0))
-                            field_lines.append(f"{medals[i]} **{member.display_name}** • {value1} / {value2}")
-                        else:
-                            value1 = f"{humanize_number(data.get(stat_info['fields'][0], 0))} {currency_name}"
-                            value2 = f"{humanize_number(data.get(stat_info['fields'][1], 0))} {currency_name}"
-                            field_lines.append(f"{medals[i]} **{member.display_name}** • {value1} / {value2}")
-                    else:  # counts
-                        wins = data.get(stat_info['fields'][0], 0)
-                        fails = data.get(stat_info['fields'][1], 0)
-                        field_lines.append(f"{medals[i]} **{member.display_name}** • {wins}w / {fails}f")
-                
-                if field_lines:
-                    embed.add_field(
-                        name=stat_info["title"],
-                        value="\n".join(field_lines),
-                        inline=True
-                    )
-                    field_count += 1
-                    
-                    # Add empty field only if we have an odd number of fields and it's not the last field
-                    if field_count % 2 == 1 and field_count < len(stats):
-                        embed.add_field(name="\u200b", value="\u200b", inline=True)
-            else:  # Single stat
-                sorted_members = sorted(
-                    all_members.items(),
-                    key=lambda x: x[1].get(stat_info["field"], 0),
-                    reverse=True
-                )[:3]
-                
-                if not sorted_members:
-                    continue
+                values = [data.get(field, 0) for field in fields]
+                if stat_info["format"] == "counts":  # Successes / failures
+                    value_str = f"{values[0]}w / {values[1]}f"
+                elif stat_info["format"] == "pair":  # Stolen / lost
+                    value_str = " / ".join(humanize_number(value) for value in values)
+                elif stat_info["format"] == "credits":  # Combined stats are shown as their total
+                    value_str = f"{humanize_number(sum(values))} {currency_name}"
+                else:
+                    value_str = str(sum(values))
                     
-                field_lines = []
-                for i, (member_id, data) in enumerate(sorted_members):
-                    member = ctx.guild.get_member(member_id)
-                    if member is None:
-                        continue
-                        
-                    value = data.get(stat_info["field"], 0)
-                    if stat_info["format"] == "credits":
-                        value_str = f"{humanize_number(value)} {currency_name}"
-                    else:
-                        value_str = str(value)
-                        
-                    field_lines.append(f"{medals[i]} **{member.display_name}** • {value_str}")
+                field_lines.append(f"{medals[i]} **{member.display_name}** • {value_str}")
+            
+            if field_lines:
+                embed.add_field(
+                    name=stat_info["title"],
+                    value="\n".join(field_lines),
+                    inline=True
+                )
+                field_count += 1
                 
-                if field_lines:
-                    embed.add_field(
-                        name=stat_info["title"],
-                        value="\n".join(field_lines),
-                        inline=True
-                    )
-                    field_count += 1
-                    
-                    # Add empty field only if we have an odd number of fields and it's not the last field
-                    if field_count % 2 == 1 and field_count < len(stats):
-                        embed.add_field(name="\u200b", value="\u200b", inline=True)
+                # Add empty field only if we have an odd number of fields and it's not the last field
+                if field_count % 2 == 1 and field_count < len(stats):
+                    embed.add_field(name="\u200b", value="\u200b", inline=True)
         
         # Add footer with timestamp
         embed.set_footer(text=f"Updated")
         embed.timestamp = datetime.now()
         
-        await ctx.send(embed=embed)
+        await self.outbox.send(ctx.channel, embed=embed)
 
     @commands.group(name="crimeset")
     @commands.admin_or_permissions(administrator=True)
@@ -747,17 +717,17 @@ class CrimeCommands:
         ):
         """Set the success rate for a crime type (0.0 to 1.0)"""
         if rate < 0 or rate > 1:
-            await ctx.send(_("Показатель успешности должен составлять 0.0 и 1.0"))
+            await self.outbox.send(ctx.channel, _("Показатель успешности должен составлять 0.0 и 1.0"))
             return
             
         async with self.config.guild(ctx.guild).crime_options() as crime_options:
             if crime_type not in crime_options:
-                await ctx.send(_("Invalid crime type!"))
+                await self.outbox.send(ctx.channel, _("Invalid crime type!"))
                 return
                 
             crime_options[crime_type]["success_rate"] = rate
             
-        await ctx.send(_("Success rate for {crime_type} set to {rate}").format(
+        await self.outbox.send(ctx.channel, _("Success rate for {crime_type} set to {rate}").format(
             crime_type=crime_type,
             rate=rate
         ))
@@ -768,18 +738,18 @@ class CrimeCommands:
         ):
         """Установите диапазон вознаграждения для типа преступления"""
         if min_reward < 0 or max_reward < min_reward:
-            await ctx.send(_("Invalid reward range!"))
+            await self.outbox.send(ctx.channel, _("Invalid reward range!"))
             return
             
         async with self.config.guild(ctx.guild).crime_options() as crime_options:
             if crime_type not in crime_options:
-                await ctx.send(_("Invalid crime type!"))
+                await self.outbox.send(ctx.channel, _("Invalid crime type!"))
                 return
                 
             crime_options[crime_type]["min_reward"] = min_reward
             crime_options[crime_type]["max_reward"] = max_reward
             
-        await ctx.send(_("Reward range for {crime_type} set to {min_reward}-{max_reward}").format(
+        await self.outbox.send(ctx.channel, _("Reward range for {crime_type} set to {min_reward}-{max_reward}").format(
             crime_type=crime_type,
             min_reward=min_reward,
             max_reward=max_reward
@@ -791,17 +761,17 @@ class CrimeCommands:
         ):
         """Set the cooldown for a crime type (in seconds)"""
         if cooldown < 0:
-            await ctx.send(_("Cooldown must be positive!"))
+            await self.outbox.send(ctx.channel, _("Cooldown must be positive!"))
             return
             
         async with self.config.guild(ctx.guild).crime_options() as crime_options:
             if crime_type not in crime_options:
-                await ctx.send(_("Invalid crime type!"))
+                await self.outbox.send(ctx.channel, _("Invalid crime type!"))
                 return
                 
             crime_options[crime_type]["cooldown"] = cooldown
             
-        await ctx.send(_("Cooldown for {crime_type} set to {time_remaining}").format(
+        await self.outbox.send(ctx.channel, _("Cooldown for {crime_type} set to {time_remaining}").format(
             crime_type=crime_type,
             time_remaining=format_cooldown_time(cooldown)
         ))
@@ -812,17 +782,17 @@ class CrimeCommands:
         ):
         """Установка времени тюремного заключения для типа преступления (в секундах)"""
         if jail_time < 0:
-            await ctx.send(_("Jail time must be positive!"))
+            await self.outbox.send(ctx.channel, _("Jail time must be positive!"))
             return
             
         async with self.config.guild(ctx.guild).crime_options() as crime_options:
             if crime_type not in crime_options:
-                await ctx.send(_("Invalid crime type!"))
+                await self.outbox.send(ctx.channel, _("Invalid crime type!"))
                 return
                 
             crime_options[crime_type]["jail_time"] = jail_time
             
-        await ctx.send(_("Тюремное заключение за {crime_type}  установленный на {time_remaining}").format(
+        await self.outbox.send(ctx.channel, _("Тюремное заключение за {crime_type}  установленный на {time_remaining}").format(
             crime_type=crime_type,
             time_remaining=format_cooldown_time(jail_time)
         ))
@@ -833,17 +803,17 @@ class CrimeCommands:
         ):
         """Установка множителя штрафа для типа преступления"""
         if multiplier < 0:
-            await ctx.send(_("Fine multiplier must be positive!"))
+            await self.outbox.send(ctx.channel, _("Fine multiplier must be positive!"))
             return
             
         async with self.config.guild(ctx.guild).crime_options() as crime_options:
             if crime_type not in crime_options:
-                await ctx.send(_("Invalid crime type!"))
+                await self.outbox.send(ctx.channel, _("Invalid crime type!"))
                 return
                 
             crime_options[crime_type]["fine_multiplier"] = multiplier
             
-        await ctx.send(_("Тонкий множитель для {crime_type} установленный на {multiplier}").format(
+        await self.outbox.send(ctx.channel, _("Тонкий множитель для {crime_type} установленный на {multiplier}").format(
             crime_type=crime_type,
             multiplier=multiplier
         ))
@@ -860,7 +830,7 @@ class CrimeCommands:
         # Update crime options with defaults
         await self.config.guild(ctx.guild).crime_options.set(CRIME_TYPES.copy())
         
-        await ctx.send("✅ Настройки преступления были загружены из настроек по умолчанию!")
+        await self.outbox.send(ctx.channel, "✅ Настройки преступления были загружены из настроек по умолчанию!")
 
     @crime_set.group(name="global")
     async def crime_set_global(self, ctx: commands.Context):
@@ -879,13 +849,13 @@ class CrimeCommands:
         ):
         """Set the bail cost multiplier"""
         if multiplier < 0:
-            await ctx.send(_("Bail cost multiplier must be positive!"))
+            await self.outbox.send(ctx.channel, _("Bail cost multiplier must be positive!"))
             return
             
         async with self.config.guild(ctx.guild).global_settings() as settings:
             settings["bail_cost_multiplier"] = multiplier
             
-        await ctx.send(_("Bail cost multiplier set to {multiplier}").format(
+        await self.outbox.send(ctx.channel, _("Bail cost multiplier set to {multiplier}").format(
             multiplier=multiplier
         ))
 
@@ -896,9 +866,9 @@ class CrimeCommands:
             settings["allow_bail"] = enabled
             
         if enabled:
-            await ctx.send(_("Bail system enabled!"))
+            await self.outbox.send(ctx.channel, _("Bail system enabled!"))
         else:
-            await ctx.send(_("Bail system disabled!"))
+            await self.outbox.send(ctx.channel, _("Bail system disabled!"))
 
     @crime_set_global.command(name="view")
     async def view_settings(self, ctx: commands.Context):
@@ -934,11 +904,11 @@ class CrimeCommands:
                 _("  • Fine Multiplier: {multiplier}").format(multiplier=data["fine_multiplier"])
             ])
             
-        await ctx.send("\n".join(settings_lines))
+        await self.outbox.send(ctx.channel, "\n".join(settings_lines))
 
     async def send_to_jail(self, member: discord.Member, jail_time: int, channel: discord.TextChannel = None):
         """Send a member to jail."""
-        async with self.config.member(member).all() as member_data:
+        async with self.member_cache.edit(member) as member_data:
             # Check for reduced sentence perk
             if "jail_reducer" in member_data.get("purchased_perks", []):
                 jail_time = int(jail_time * 0.8)  # 20% shorter sentence
@@ -951,48 +921,60 @@ class CrimeCommands:
                 member_data["jail_channel"] = channel.id
             
             # If notifications are enabled, schedule a notification
-            if member_data.get("notify_on_release", False):
-                # Cancel any existing notification task
-                if member.id in self.notification_tasks:
-                    self.notification_tasks[member.id].cancel()
-                # Schedule new notification
-                task = asyncio.create_task(self._schedule_release_notification(member, jail_time))
-                self.notification_tasks[member.id] = task
+            notify = member_data.get("notify_on_release", False)
+            release_at = member_data["jail_until"]
+            channel_id = member_data.get("jail_channel")
+            
+        if notify:
+            # Replaces any notification left from an earlier sentence
+            await self.release_scheduler.schedule(member.guild.id, member.id, release_at, channel_id)
 
     async def _cancel_notification(self, member: discord.Member):
         """Cancel any pending release notification for a member."""
-        if member.id in self.notification_tasks:
-            self.notification_tasks[member.id].cancel()
-            del self.notification_tasks[member.id]
+        await self.release_scheduler.cancel(member.guild.id, member.id)
+
+    async def _send_release_notifications(self, entries):
+        """Notify every member in a batch of due releases."""
+        await asyncio.gather(
+            *(self._send_release_notification(entry) for entry in entries),
+            return_exceptions=True
+        )
 
-    async def _schedule_release_notification(self, member: discord.Member, jail_time: int):
-        """Schedule a notification for when a member's jail sentence is over."""
-        await asyncio.sleep(jail_time)
+    async def _send_release_notification(self, entry):
+        """Tell a member their jail sentence is over."""
+        guild = self.bot.get_guild(entry.guild_id)
+        member = guild.get_member(entry.member_id) if guild else None
+        if member is None:
+            return
         
         # Double check they're actually out (in case sentence was extended)
         remaining = await self.get_jail_time_remaining(member)
-        if remaining <= 0:
-            try:
-                # Only send if they still have notifications enabled
-                member_data = await self.config.member(member).all()
-                if member_data.get("notify_on_release", False):
-                    # Try to send to the channel/thread they were jailed in
-                    if "jail_channel" in member_data:
-                        channel_id = member_data["jail_channel"]
-                        # First try to get it as a thread
-                        channel = member.guild.get_thread(channel_id)
-                        # If not a thread, try as a regular channel
-                        if channel is None:
-                            channel = member.guild.get_channel(channel_id)
-                            
-                        if channel:
-                            await channel.send(f"🔔 {member.mention} Ваш тюремный срок закончился! Теперь вы снова можете совершать преступления.")
-                            return
-                    
-                    # Fallback to DM if channel not found or not stored
-                    await member.send(f"🔔 Ваш тюремный срок закончился! Теперь вы снова можете совершать преступления.")
-            except (discord.Forbidden, discord.HTTPException):
-                pass  # Ignore if we can't send the message
+        if remaining > 0:
+            await self.release_scheduler.schedule(
+                entry.guild_id, entry.member_id, int(time.time()) + remaining, entry.channel_id
+            )
+            return
+            
+        try:
+            # Only send if they still have notifications enabled
+            member_data = await self.member_cache.get(member)
+            if member_data.get("notify_on_release", False):
+                # Try to send to the channel/thread they were jailed in
+                if entry.channel_id:
+                    # First try to get it as a thread
+                    channel = guild.get_thread(entry.channel_id)
+                    # If not a thread, try as a regular channel
+                    if channel is None:
+                        channel = guild.get_channel(entry.channel_id)
+                        
+                    if channel:
+                        await self.outbox.send(channel, f"🔔 {member.mention} Ваш тюремный срок закончился! Теперь вы снова можете совершать преступления.")
+                        return
+                
+                # Fallback to DM if channel not found or not stored
+                await self.outbox.send(member, f"🔔 Ваш тюремный срок закончился! Теперь вы снова можете совершать преступления.")
+        except (discord.Forbidden, discord.HTTPException):
+            pass  # Ignore if we can't send the message
 
     @crime.command(name="jail")
     @commands.admin_or_permissions(administrator=True)
@@ -1008,14 +990,14 @@ class CrimeCommands:
         """
         try:
             if minutes <= 0:
-                await ctx.send("❌ Тюремный срок должен быть положительным!")
+                await self.outbox.send(ctx.channel, "❌ Тюремный срок должен быть положительным!")
                 return
 
             # Convert minutes to seconds
             jail_time = minutes * 60
             
             # Check if user has reduced sentence perk
-            member_data = await self.config.member(user).all()
+            member_data = await self.member_cache.get(user)
             has_reducer = "jail_reducer" in member_data.get("purchased_perks", [])
             if has_reducer:
                 jail_time = int(jail_time * 0.8)  # 20% reduction
@@ -1044,10 +1026,10 @@ class CrimeCommands:
                 inline=True
             )
 
-            await ctx.send(embed=embed)
+            await self.outbox.send(ctx.channel, embed=embed)
 
         except Exception as e:
-            await ctx.send(f"An error occurred while jailing the user: {str(e)}")
+            await self.outbox.send(ctx.channel, f"An error occurred while jailing the user: {str(e)}")
 
     @crime.command(name="blackmarket")
     async def crime_blackmarket(self, ctx: commands.Context):
@@ -1088,36 +1070,36 @@ class CrimeCommands:
          Пользовательские сценарии сохраняются для каждого сервера и сохраняются при перезапуске бота.
         """
         # Start scenario creation process
-        await ctx.send("Let's create a new random scenario! I'll ask you for each piece of information.")
+        await self.outbox.send(ctx.channel, "Let's create a new random scenario! I'll ask you for each piece of information.")
         
         try:
             # Get scenario name
-            await ctx.send("Как бы вы хотели назвать этот сценарий? (Например, взлом_жопы)")
+            await self.outbox.send(ctx.channel, "Как бы вы хотели назвать этот сценарий? (Например, взлом_жопы)")
             msg = await self.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=30)
             name = msg.content.lower()
             
             # Get risk level
-            await ctx.send("Каким должен быть уровень риска? (low, medium, или high)")
+            await self.outbox.send(ctx.channel, "Каким должен быть уровень риска? (low, medium, или high)")
             while True:
                 msg = await self.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=30)
                 risk = msg.content.lower()
                 if risk not in ["low", "medium", "high"]:
-                    await ctx.send("Пожалуйста, введите либо 'low', 'medium', или 'high'.")
+                    await self.outbox.send(ctx.channel, "Пожалуйста, введите либо 'low', 'medium', или 'high'.")
                 else:
                     break
             
             # Get attempt text
-            await ctx.send("Введите текст попытки (используйте {user} для упоминания пользователя):")
+            await self.outbox.send(ctx.channel, "Введите текст попытки (используйте {user} для упоминания пользователя):")
             msg = await self.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=60)
             attempt_text = msg.content
             
             # Get success text
-            await ctx.send("Введите текст успеха (используйте {user} для упоминания пользователя, {amount} для суммы вознаграждения и {currency} для названия валюты):")
+            await self.outbox.send(ctx.channel, "Введите текст успеха (используйте {user} для упоминания пользователя, {amount} для суммы вознаграждения и {currency} для названия валюты):")
             msg = await self.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=60)
             success_text = msg.content
             
             # Get fail text
-            await ctx.send("Введите текст отказа (используйте {user} для упоминания пользователя, {fine} для суммы штрафа и {currency} для названия валюты):")
+            await self.outbox.send(ctx.channel, "Введите текст отказа (используйте {user} для упоминания пользователя, {fine} для суммы штрафа и {currency} для названия валюты):")
             msg = await self.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=60)
             fail_text = msg.content
             
@@ -1158,6 +1140,7 @@ class CrimeCommands:
             # Add to guild's custom scenarios
             async with self.config.guild(ctx.guild).custom_scenarios() as scenarios:
                 scenarios.append(new_scenario)
+            CATALOG.invalidate(ctx.guild.id)
             
             # Send confirmation
             embed = discord.Embed(
@@ -1169,10 +1152,10 @@ class CrimeCommands:
             embed.add_field(name="Success Rate", value=f"{int(success_rate * 100)}%", inline=True)
             embed.add_field(name="Reward Range", value=f"{min_reward:,} - {max_reward:,}", inline=True)
             
-            await ctx.send(embed=embed)
+            await self.outbox.send(ctx.channel, embed=embed)
             
         except asyncio.TimeoutError:
-            await ctx.send("❌ Создание сценария завершилось по таймеру. Пожалуйста, попробуйте еще раз.")
+            await self.outbox.send(ctx.channel, "❌ Создание сценария завершилось по таймеру. Пожалуйста, попробуйте еще раз.")
 
     @crime_set_scenarios.command(name="list")
     @commands.guild_only()
@@ -1182,7 +1165,7 @@ class CrimeCommands:
         custom_scenarios = await self.config.guild(ctx.guild).custom_scenarios()
         
         if not custom_scenarios:
-            await ctx.send("This server has no custom scenarios.")
+            await self.outbox.send(ctx.channel, "This server has no custom scenarios.")
             return
         
         # Create embed to display scenarios
@@ -1211,7 +1194,7 @@ class CrimeCommands:
                 inline=False
             )
         
-        await ctx.send(embed=embed)
+        await self.outbox.send(ctx.channel, embed=embed)
 
     @crime_set_scenarios.command(name="remove")
     @commands.guild_only()
@@ -1222,12 +1205,17 @@ class CrimeCommands:
         Example:
         - [p]crimeset scenarios remove cookie_heist
         """
+        removed = None
         async with self.config.guild(ctx.guild).custom_scenarios() as scenarios:
             # Find scenario with matching name
             for i, scenario in enumerate(scenarios):
                 if scenario["name"].lower() == scenario_name.lower():
                     removed = scenarios.pop(i)
-                    await ctx.send(f"✅ Удален пользовательский сценарий: {removed['name']}")
-                    return
-            
-            await ctx.send("❌ Не найдено ни одного пользовательского сценария с таким именем.")
+                    break
+        
+        # Only once the shorter list is saved, so no crime recompiles the old one
+        if removed is None:
+            await self.outbox.send(ctx.channel, "❌ Не найдено ни одного пользовательского сценария с таким именем.")
+            return
+        CATALOG.invalidate(ctx.guild.id)
+        await self.outbox.send(ctx.channel, f"✅ Удален пользовательский сценарий: {removed['name']}")
@@ -6,7 +6,6 @@ CURRENTLY NOT IN USE AND WIP
 """
 from typing import Optional, Dict, Any, Tuple, List
 import time
-import asyncio
 import random
 import discord
 from redbot.core import Config, bank
@@ -14,7 +13,10 @@ from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_number
 from redbot.core.utils.predicates import MessagePredicate
 from redbot.core.i18n import Translator
-from .scenarios import get_random_jailbreak_scenario
+from .scenarios import CATALOG
+from .catalog import CompiledEvent, EventPool, resolve
+from ..notifications import ReleaseScheduler
+from ..outbound import Outbox
 
 _ = Translator("City", __file__)
 
@@ -91,19 +93,19 @@ class PerkManager:
 class JailbreakScenario:
     """Represents a jailbreak attempt scenario."""
     
-    def __init__(self, data: Dict[str, Any]):
+    def __init__(self, data: Dict[str, Any], event_pool: Optional[EventPool] = None):
         self.name = data["name"]
         self.attempt_text = data["attempt_text"]
         self.success_text = data["success_text"]
         self.fail_text = data["fail_text"]
         self.base_chance = data["base_chance"]
         self.events = data["events"]
+        self.event_pool = event_pool if event_pool is not None else EventPool(self.events)
 
     @property
-    def random_events(self) -> List[Dict[str, Any]]:
+    def random_events(self) -> List[CompiledEvent]:
         """Get 1-3 random events for this scenario."""
-        num_events = random.randint(1, 3)
-        return random.sample(self.events, num_events)
+        return self.event_pool.sample(random.randint(1, 3))
 
     def format_text(self, text: str, **kwargs) -> str:
         """Format scenario text with given parameters."""
@@ -112,10 +114,11 @@ class JailbreakScenario:
 class JailManager:
     """Manages all jail-related functionality."""
     
-    def __init__(self, bot: Red, config: Config):
+    def __init__(self, bot: Red, config: Config, release_scheduler: ReleaseScheduler, outbox: Outbox):
         self.bot = bot
         self.config = config
-        self.notification_tasks: Dict[int, asyncio.Task] = {}  # member_id: task
+        self.release_scheduler = release_scheduler
+        self.outbox = outbox
         self.perk_manager = PerkManager(config)
         
     async def get_jail_state(self, member: discord.Member) -> Dict[str, Any]:
@@ -210,51 +213,33 @@ class JailManager:
     async def _schedule_release_notification(self, member: discord.Member, jail_time: int, channel: Optional[discord.TextChannel] = None) -> None:
         """Schedule a notification for when a member's jail sentence is over."""
         try:
-            # Cancel any existing notification
-            await self._cancel_notification(member)
-            
-            # Create new notification task
-            task = asyncio.create_task(self._notification_handler(member, jail_time, channel))
-            self.notification_tasks[member.id] = task
-            
+            # Replaces any existing notification
+            await self.release_scheduler.schedule(
+                member.guild.id,
+                member.id,
+                int(time.time()) + jail_time,
+                channel.id if channel else None
+            )
         except Exception as e:
             raise JailNotificationError(f"Failed to schedule release notification: {str(e)}")
 
     async def _cancel_notification(self, member: discord.Member) -> None:
         """Cancel a pending release notification."""
         try:
-            if member.id in self.notification_tasks:
-                self.notification_tasks[member.id].cancel()
-                del self.notification_tasks[member.id]
+            await self.release_scheduler.cancel(member.guild.id, member.id)
         except Exception as e:
             raise JailNotificationError(f"Failed to cancel notification: {str(e)}")
 
-    async def _notification_handler(self, member: discord.Member, jail_time: int, channel: Optional[discord.TextChannel] = None) -> None:
-        """Handle the notification process for jail release."""
-        try:
-            await asyncio.sleep(jail_time)
-            
-            # Verify they're actually out (in case sentence was extended)
-            remaining = await self.get_jail_time_remaining(member)
-            if remaining <= 0:
-                state = await self.get_jail_state(member)
-                if state["notify_on_release"]:
-                    await self._send_notification(member, channel)
-        except asyncio.CancelledError:
-            pass  # Task was cancelled, ignore
-        except Exception as e:
-            raise JailNotificationError(f"Notification handler failed: {str(e)}")
-
     async def _send_notification(self, member: discord.Member, channel: Optional[discord.TextChannel] = None) -> None:
         """Send the actual notification message."""
         try:
             message = f"🔔 {member.mention} Your jail sentence is over! You're now free to commit crimes again."
             
             if channel:
-                await channel.send(message)
+                await self.outbox.send(channel, message)
             else:
                 try:
-                    await member.send(message)
+                    await self.outbox.send(member, message)
                 except (discord.Forbidden, discord.HTTPException):
                     pass  # Can't DM the user, silently fail
         except Exception as e:
@@ -382,8 +367,8 @@ class JailManager:
         """Get a random jailbreak scenario."""
         try:
             # Get scenario from scenarios.py
-            scenario_data = get_random_jailbreak_scenario()
-            return JailbreakScenario(scenario_data)
+            scenario_data, event_pool = CATALOG.sample_jailbreak()
+            return JailbreakScenario(scenario_data, event_pool)
         except Exception as e:
             raise JailbreakError(f"Failed to get jailbreak scenario: {str(e)}")
 
@@ -408,30 +393,30 @@ class JailManager:
 
             # Get scenario and process events
             scenario = await self.get_jailbreak_scenario()
-            success_chance = scenario.base_chance
+            events = scenario.random_events
+            balance = await bank.get_balance(member)
+            resolution = resolve(scenario.base_chance, events, balance)
+            success_chance = resolution.success_chance
+            currency_name = await bank.get_currency_name(member.guild)
             event_messages = []
             
-            # Process random events
-            for event in scenario.random_events:
-                event_text = event["text"]
-                currency_name = await bank.get_currency_name(member.guild)
-                event_text = event_text.format(currency=currency_name)
-                
-                # Apply chance modifiers
-                if "chance_bonus" in event:
-                    success_chance = min(1.0, success_chance + event["chance_bonus"])
-                elif "chance_penalty" in event:
-                    success_chance = max(0.05, success_chance - event["chance_penalty"])
-                
-                # Apply currency effects
-                if "currency_bonus" in event:
-                    await bank.deposit_credits(member, event["currency_bonus"])
-                    event_text += f" (+{event['currency_bonus']} {currency_name})"
-                elif "currency_penalty" in event:
-                    await bank.withdraw_credits(member, event["currency_penalty"])
-                    event_text += f" (-{event['currency_penalty']} {currency_name})"
-                
+            # Describe random events
+            applied = 0
+            for shown, event in enumerate(events, 1):
+                event_text = event.template.render(currency=currency_name)
+                change = resolve(0.0, events[:shown], balance).credit_delta - applied
+                applied += change
+                if event.credits > 0:
+                    event_text += f" (+{change} {currency_name})"
+                elif event.credits < 0:
+                    event_text += f" (-{-change} {currency_name})"
                 event_messages.append(event_text)
+            
+            # Apply currency effects, never taking more than they have
+            if resolution.credit_delta > 0:
+                await bank.deposit_credits(member, resolution.credit_delta)
+            elif resolution.credit_delta < 0:
+                await bank.withdraw_credits(member, -resolution.credit_delta)
 
             # Roll for success
             success = random.random() < success_chance
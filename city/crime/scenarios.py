@@ -4,6 +4,7 @@ import random
 import discord
 from redbot.core import bank, commands, Config
 from typing import Union, List, Dict, Optional
+from .catalog import CrimeCatalog
 
 # Константы для уровней риска и коэффициентов успеха
 RISK_LOW = "низкий"
@@ -25,67 +26,32 @@ async def format_text(text: str, ctx: Union[commands.Context, discord.Interactio
         guild = ctx.guild
         user = ctx.user
         
+    template = CATALOG.template(text)
     currency_name = await bank.get_currency_name(guild)
     format_args = {
         'currency': currency_name,
-        'user': user.mention if "{user}" in text else user.display_name
+        'user': user.mention if "user" in template.fields else user.display_name
     }
     
     # Добавление дополнительных аргументов форматирования
     format_args.update(kwargs)
     
-    return text.format(**format_args)
+    return template.render(**format_args)
 
 def get_crime_event(crime_type: str) -> list:
     """Получение списка случайных событий для определенного типа преступления. Возвращает список, содержащий 1-3 события: - Первое событие гарантированно - Второе событие имеет 75% шанс - Третье событие имеет 50% шанс - Четвертое событие имеет 10% шанс """
-    if crime_type not in CRIME_EVENTS:
-        return []
-    
-    events = []
-    available_events = CRIME_EVENTS[crime_type].copy()
-    
-    # Первое событие гарантированно
-    if available_events:
-        event = random.choice(available_events)
-        events.append(event)
-        available_events.remove(event)
-    
-    # Второе событие имеет 75% шанс
-    if available_events and random.random() < 0.75:
-        event = random.choice(available_events)
-        events.append(event)
-        available_events.remove(event)
-    
-    # Третье событие имеет 50% шанс
-    if available_events and random.random() < 0.50:
-        event = random.choice(available_events)
-        events.append(event)
-        available_events.remove(event)
-
-    # Четвертое событие имеет 10% шанс
-    if available_events and random.random() < 0.10:
-        event = random.choice(available_events)
-        events.append(event)
-    
-    return events
+    return [event.data for event in CATALOG.sample_events(crime_type)]
 
 async def get_all_scenarios(config: Config, guild: discord.Guild) -> List[Dict]:
     """Получение всех доступных случайных сценариев. Это включает как стандартные сценарии, так и любые пользовательские сценарии, добавленные гильдией. Если включен режим custom_scenarios_only, возвращает только пользовательские сценарии. """
-    # Получение стандартных сценариев
-    scenarios = RANDOM_SCENARIOS.copy()
-    
-    # Получение пользовательских сценариев для этой гильдии
-    custom_scenarios = await config.guild(guild).custom_scenarios()
-    
-    # Добавление пользовательских сценариев
-    scenarios.extend(custom_scenarios)
-    
-    return scenarios
+    pool = await CATALOG.scenarios(config, guild)
+    return list(pool.scenarios)
 
 async def add_custom_scenario(config: Config, guild: discord.Guild, scenario: Dict) -> None:
     """Добавление пользовательского сценария в конфигурацию гильдии."""
     async with config.guild(guild).custom_scenarios() as scenarios:
         scenarios.append(scenario)
+    CATALOG.invalidate(guild.id)
 
 def get_random_scenario(scenarios: List[Dict]) -> Dict:
     """Получение случайного сценария из списка."""
@@ -93,7 +59,7 @@ def get_random_scenario(scenarios: List[Dict]) -> Dict:
 
 def get_random_jailbreak_scenario() -> Dict:
     """Получение случайного сценария побега из тюрьмы. Возвращает: Dict: Словарь, содержащий данные сценария с ключами: - name: Идентификатор сценария - attempt_text: Текст, отображаемый при попытке - success_text: Текст, отображаемый при успехе - fail_text: Текст, отображаемый при неудаче - base_chance: Базовый коэффициент успеха (0.0 до 1.0) - events: Список возможных случайных событий, которые могут повлиять на коэффициент успеха или награды """
-    return random.choice(PRISON_BREAK_SCENARIOS)
+    return CATALOG.jailbreaks.sample()
     # Each scenario has:
 # - name: Unique identifier for the scenario
 # - risk: Risk level (low, medium, high)
@@ -1321,3 +1287,6 @@ PRISON_BREAK_SCENARIOS = [
 ]
         
  
+
+# Everything above compiled once for fast sampling; see catalog.py
+CATALOG = CrimeCatalog(CRIME_EVENTS, RANDOM_SCENARIOS, PRISON_BREAK_SCENARIOS)
@@ -13,11 +13,31 @@ from ..utils import (
     update_streak,
     format_streak_text
 )
-import asyncio
-from .scenarios import get_random_scenario, get_crime_event, format_text, get_all_scenarios
+from .scenarios import CATALOG, add_custom_scenario, format_text
+from .catalog import resolve
+from ..banking import BankBatch
+from ..metrics import METRICS
+from ..timeline import RevealTimeline
+from ..outbound import Priority
+from ..perf import PERF
+
+CRIMES_ATTEMPTED = METRICS.counter("city_crimes_attempted_total", "Crimes rolled, by crime type", ("crime_type",))
+CRIMES_SUCCEEDED = METRICS.counter(
+    "city_crimes_succeeded_total", "Crimes that paid out, by crime type", ("crime_type",)
+)
 
 
 _ = Translator("Crime", __file__)
+
+# Most pool members tried for one random target before giving up
+RANDOM_TARGET_DRAWS = 25
+
+# Reveal pacing of a crime, in seconds: attempt to first event, between
+# events, and the suspense before the result by risk level
+ATTEMPT_DELAY = 2.0
+EVENT_DELAY = 4.0
+RESULT_DELAYS = {"high": 6.0, "medium": 5.0, "low": 4.0}
+
 class CrimeButton(discord.ui.Button):
     """A button for committing crimes"""
     def __init__(self, style: discord.ButtonStyle, label: str, emoji: str, custom_id: str, disabled: bool = False):
@@ -43,10 +63,13 @@ class CrimeButton(discord.ui.Button):
             crime_type = self.custom_id
             crime_data = view.crime_options[crime_type]
             
+            # Load jail state, cooldowns and settings once
+            snapshot = await view.cog.get_member_snapshot(interaction.user)
+            
             # Check if user is in jail
-            jail_remaining = await view.cog.get_jail_time_remaining(interaction.user)
+            jail_remaining = snapshot.jail_remaining()
             if jail_remaining > 0:
-                await interaction.channel.send(
+                await view.cog.outbox.send(interaction.channel,
                     _("⛓️ You're still in jail for {minutes}m {seconds}s! You can pay bail using `!crime bail` or jailbreak using `!crime jailbreak`").format(
                         minutes=jail_remaining // 60,
                         seconds=jail_remaining % 60
@@ -55,12 +78,12 @@ class CrimeButton(discord.ui.Button):
                 return
                 
             # Check cooldown
-            remaining = await view.cog.get_remaining_cooldown(interaction.user, crime_type)
+            remaining = snapshot.cooldown_remaining(crime_type)
             if remaining > 0:
                 if remaining > 3600:  # If more than 1 hour
                     hours = remaining // 3600
                     minutes = (remaining % 3600) // 60
-                    await interaction.channel.send(
+                    await view.cog.outbox.send(interaction.channel,
                         _("⏳ You must wait {hours}h {minutes}m before attempting {crime_type} again!").format(
                             hours=hours,
                             minutes=minutes,
@@ -68,7 +91,7 @@ class CrimeButton(discord.ui.Button):
                         )
                     )
                 else:
-                    await interaction.channel.send(
+                    await view.cog.outbox.send(interaction.channel,
                         _("⏳ You must wait {minutes}m {seconds}s before attempting {crime_type} again!").format(
                             minutes=remaining // 60,
                             seconds=remaining % 60,
@@ -78,7 +101,7 @@ class CrimeButton(discord.ui.Button):
                 return
                 
             # Get settings
-            settings = await view.cog.config.guild(interaction.guild).global_settings()
+            settings = snapshot.settings
             
             # Delete the crime list message since we're moving to confirmation
             # Only delete if we're past the cooldown and jail checks
@@ -90,7 +113,7 @@ class CrimeButton(discord.ui.Button):
             # If crime requires target, show target selection
             if crime_data.get("requires_target", False):
                 target_view = TargetSelectionView(view.cog, interaction, crime_type, crime_data)
-                message = await interaction.channel.send(
+                message = await view.cog.outbox.send(interaction.channel,
                     _("Choose your target:"),
                     view=target_view
                 )
@@ -126,7 +149,7 @@ class CrimeButton(discord.ui.Button):
                         inline=True
                     )
                 
-                message = await interaction.channel.send(
+                message = await view.cog.outbox.send(interaction.channel,
                     embed=embed,
                     view=crime_view
                 )
@@ -134,7 +157,7 @@ class CrimeButton(discord.ui.Button):
                 crime_view.all_messages = [message]  # Track message
                 
         except Exception as e:
-            await interaction.channel.send(
+            await view.cog.outbox.send(interaction.channel,
                 _("An error occurred while processing your crime. Please try again. Error: {error}").format(
                     error=str(e)
                 )
@@ -201,15 +224,16 @@ class CrimeListView(discord.ui.View):
             
     async def update_button_states(self):
         """Update button states based on jail and cooldowns"""
-        is_jailed = await self.cog.is_jailed(self.ctx.author)
+        snapshot = await self.cog.get_member_snapshot(self.ctx.author)
+        is_jailed = snapshot.is_jailed()
         
         for item in self.children:
             if isinstance(item, CrimeButton):
-                remaining = await self.cog.get_remaining_cooldown(self.ctx.author, item.custom_id)
+                remaining = snapshot.cooldown_remaining(item.custom_id)
                 item.disabled = is_jailed or remaining > 0
         
         if self.message:
-            await self.message.edit(view=self)
+            await self.cog.outbox.edit(self.message, view=self)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Only allow the author that invoked the command to use the interaction"""
@@ -373,7 +397,7 @@ class CrimeView(discord.ui.View):
             # Add jail time field
             if kwargs.get("jail_time", 0) > 0:
                 # Check if user has reduced sentence perk
-                member_data = await self.cog.config.member(self.interaction.user).all()
+                member_data = await self.cog.member_cache.get(self.interaction.user)
                 has_reducer = "jail_reducer" in member_data.get("purchased_perks", [])
                 
                 if has_reducer:
@@ -402,7 +426,7 @@ class CrimeView(discord.ui.View):
         
     async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
         """Handle errors in view interactions."""
-        await interaction.channel.send(
+        await self.cog.outbox.send(interaction.channel,
             _("An error occurred while processing your crime. Please try again. Error: {error}").format(
                 error=str(error)
             ))
@@ -418,10 +442,10 @@ class CrimeView(discord.ui.View):
             # Try to update the message if it still exists
             if self.message:
                 try:
-                    await self.message.edit(view=self)
+                    await self.cog.outbox.edit(self.message, view=self)
                     if not self.is_finished():
                         try:
-                            msg = await self.message.channel.send(_("Crime timed out."))
+                            msg = await self.cog.outbox.send(self.message.channel, _("Crime timed out."), priority=Priority.FLAVOR)
                             self.all_messages.append(msg)
                         except discord.HTTPException:
                             pass
@@ -434,6 +458,7 @@ class CrimeView(discord.ui.View):
             self.stop()
             
     @discord.ui.button(label="Confirm", style=discord.ButtonStyle.success)
+    @PERF.measured("crime.confirm")
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Handle crime confirmation"""
         if interaction.user.bot:
@@ -442,13 +467,14 @@ class CrimeView(discord.ui.View):
         try:
             await interaction.response.defer()
             
-            # Get settings
-            settings = await self.cog.config.guild(interaction.guild).global_settings()
+            # Load jail state, cooldowns and settings once
+            snapshot = await self.cog.get_member_snapshot(interaction.user)
+            settings = snapshot.settings
             
             # Double check cooldown
-            remaining = await self.cog.get_remaining_cooldown(interaction.user, self.crime_type)
+            remaining = snapshot.cooldown_remaining(self.crime_type)
             if remaining > 0:
-                msg = await interaction.channel.send(
+                msg = await self.cog.outbox.send(interaction.channel,
                     _("⏳ You must wait {hours}h {minutes}m before attempting {crime_type} again!").format(
                         hours=remaining // 3600,
                         minutes=(remaining % 3600) // 60,
@@ -459,9 +485,9 @@ class CrimeView(discord.ui.View):
                 return
                 
             # Check if user is jailed
-            if await self.cog.is_jailed(interaction.user):
-                remaining = await self.cog.get_jail_time_remaining(interaction.user)
-                msg = await interaction.channel.send(
+            if snapshot.is_jailed():
+                remaining = snapshot.jail_remaining()
+                msg = await self.cog.outbox.send(interaction.channel,
                     _("⛓️ You're still in jail for {minutes}m {seconds}s! You can pay bail using `!crime bail` or jailbreak using `!crime jailbreak`").format(
                         minutes=remaining // 60,
                         seconds=remaining % 60
@@ -473,11 +499,12 @@ class CrimeView(discord.ui.View):
             # For targeted crimes, check target's balance before attempting
             if self.target:
                 try:
-                    target_balance = await bank.get_balance(self.target)
+                    with PERF.timed("bank"):
+                        target_balance = await bank.get_balance(self.target)
                     min_required = max(settings.get("min_steal_balance", 100), self.crime_data["min_reward"])
                     
                     if target_balance < min_required:
-                        msg = await interaction.channel.send(
+                        msg = await self.cog.outbox.send(interaction.channel,
                             _("Your target doesn't have enough {currency} to steal from! (Minimum: {min:,})").format(
                                 currency=await bank.get_currency_name(interaction.guild),
                                 min=min_required
@@ -486,7 +513,7 @@ class CrimeView(discord.ui.View):
                         self.all_messages.append(msg)
                         return
                 except Exception as e:
-                    await interaction.channel.send(
+                    await self.cog.outbox.send(interaction.channel,
                         _("An error occurred while checking your target's balance. Please try again. Error: {error}").format(
                             error=str(e)
                         )
@@ -508,8 +535,8 @@ class CrimeView(discord.ui.View):
             
             # Handle random scenario if crime type is random
             if self.crime_type == "random":
-                scenarios = await get_all_scenarios(self.cog.config, interaction.guild)
-                self.scenario = get_random_scenario(scenarios)
+                scenarios = await CATALOG.scenarios(self.cog.config, interaction.guild)
+                self.scenario = scenarios.sample()
                 self.crime_data = self.crime_data.copy()  # Create a copy to modify
                 self.crime_data.update({
                     "min_reward": self.scenario["min_reward"],
@@ -522,7 +549,7 @@ class CrimeView(discord.ui.View):
                 events = []  # Initialize empty events list for random crimes
             else:
                 # Get and process events if this is not a random crime
-                events = get_crime_event(self.crime_type)
+                events = CATALOG.sample_events(self.crime_type)
             
             # Get attempt message based on crime type
             if self.crime_type == "random":
@@ -548,94 +575,44 @@ class CrimeView(discord.ui.View):
                     user=self.interaction.user.mention
                 )
             
-            # Create and send attempt message with bail out button
-            attempt_view = CrimeAttemptView(self.cog, interaction, self.crime_type)
-            msg = await interaction.channel.send(attempt_msg, view=attempt_view)
-            attempt_view.message = msg
-            self.all_messages.append(msg)
+            # The crime is settled right here. It's revealed in one message
+            # afterwards instead of sleeping in this handler.
+            timeline = RevealTimeline(interaction.channel)
+            timeline.reveal(0, attempt_msg, after=self.all_messages.append)
 
-            # Short pause after attempt message
-            await asyncio.sleep(2)
+            # Every credit change of this crime, applied once per account
+            credits = BankBatch(self.cog.bank_locks)
 
-            # Check if user bailed out
-            if attempt_view.bailed:
-                return
+            # Fold every event's effects at once; penalties never take more than the user has
+            balance = await credits.balance(interaction.user) if events else 0
+            resolution = resolve(self.crime_data["success_rate"], events, balance)
 
-            # Initialize modifiers
-            success_chance = self.crime_data["success_rate"]
-            jail_time = self.crime_data["jail_time"]
-            reward_multiplier = 1.0
-            total_credit_changes = 0  # Track direct credit changes
+            # Queue each event, the first after a short pause
+            delay = ATTEMPT_DELAY
+            for event in events:
+                # Add credit amounts if present
+                format_args = {}
+                if event.credits > 0:
+                    format_args["credits_bonus"] = str(event.credits)
+                elif event.credits < 0:
+                    format_args["credits_penalty"] = str(-event.credits)
 
-            # Get and process events if this is not a random crime
-            if self.crime_type != "random":
-                # Process each event
-                for event in events:
-                    # Check for bail out after each event
-                    if attempt_view.bailed:
-                        return
-                        
-                    # Send event message with delay
-                    event_text = event["text"]
-                    format_args = {}
-                    
-                    # Add credit amounts if present
-                    if "credits_bonus" in event:
-                        format_args["credits_bonus"] = str(event["credits_bonus"])
-                    elif "credits_penalty" in event:
-                        format_args["credits_penalty"] = str(event["credits_penalty"])
-                    
-                    # Format the message with all arguments at once
-                    msg = await interaction.channel.send(await format_text(event_text, interaction, **format_args))
-                    self.all_messages.append(msg)
-                    await asyncio.sleep(4.0)  # Increased delay between events
+                # Format the message with all arguments at once
+                event_text = await format_text(event.template.text, interaction, **format_args)
+                timeline.reveal(delay, event_text)
+                delay = EVENT_DELAY
 
-                    # Apply event modifiers
-                    if "chance_bonus" in event:
-                        success_chance = min(1.0, success_chance + event["chance_bonus"])
-                    elif "chance_penalty" in event:
-                        success_chance = max(0.05, success_chance - event["chance_penalty"])
-                    
-                    if "reward_multiplier" in event:
-                        reward_multiplier *= event["reward_multiplier"]
-                    
-                    if "jail_multiplier" in event:
-                        jail_time = int(jail_time * event["jail_multiplier"])
-                        
-                    # Handle direct credit changes (just track the totals here)
-                    if "credits_bonus" in event:
-                        bonus = event["credits_bonus"]
-                        await bank.deposit_credits(interaction.user, bonus)
-                        total_credit_changes += bonus
-                    elif "credits_penalty" in event:
-                        penalty = event["credits_penalty"]
-                        try:
-                            await bank.withdraw_credits(interaction.user, penalty)
-                            total_credit_changes -= penalty
-                        except ValueError:
-                            # If user doesn't have enough credits, take what they have
-                            current_balance = await bank.get_balance(interaction.user)
-                            if current_balance > 0:
-                                await bank.withdraw_credits(interaction.user, current_balance)
-                                total_credit_changes -= current_balance
+            success_chance = resolution.success_chance
+            jail_time = int(self.crime_data["jail_time"] * resolution.jail_mult)
+            total_credit_changes = resolution.credit_delta  # Track direct credit changes
+            credits.deposit(interaction.user, total_credit_changes)
 
             # Add suspense delay based on risk level
-            if self.crime_data["risk"] == "high":
-                await asyncio.sleep(6)  # More suspense for high-risk crimes (was 6s)
-            elif self.crime_data["risk"] == "medium":
-                await asyncio.sleep(5)  # Medium delay for medium-risk (was 5s)
-            else:
-                await asyncio.sleep(4)  # Quick result for low-risk (was 4s)
-
-            # Final bail out check before result
-            if attempt_view.bailed:
-                return
-
-            # Clean up attempt view
-            attempt_view.stop()
+            result_delay = delay + RESULT_DELAYS.get(self.crime_data["risk"], RESULT_DELAYS["low"])
             
             # Roll for success
             success = random.random() < success_chance
+            CRIMES_ATTEMPTED.inc(1, (self.crime_type,))
             
             if success:
                 # Handle success
@@ -644,58 +621,65 @@ class CrimeView(discord.ui.View):
                     self.crime_data["crime_type"] = self.crime_type  # Add crime type to data
                     try:
                         # Calculate base amount
-                        base_amount = await calculate_stolen_amount(self.target, self.crime_data, settings)
+                        base_amount = await calculate_stolen_amount(
+                            self.target, self.crime_data, settings, await credits.balance(self.target)
+                        )
                         self.reward_calculations = [("Base Amount", base_amount)]
                         current_amount = base_amount
                         
                         # Apply streak bonus if any
-                        streak, streak_multiplier = await update_streak(self.cog.config, interaction.user, True)
+                        streak, streak_multiplier = await update_streak(self.cog.member_cache, interaction.user, True)
                         if streak > 0:
                             current_amount = round(current_amount * streak_multiplier)  # Round after streak multiplier
                             self.reward_calculations.append((format_streak_text(streak, streak_multiplier), current_amount, streak_multiplier))
                         
                         # Process reward modifiers from events
                         for event in events:
-                            if "reward_multiplier" in event:
-                                current_amount = round(current_amount * event["reward_multiplier"])  # Round after each multiplier
-                                self.reward_calculations.append((event["text"], current_amount, event["reward_multiplier"]))
-                            elif "credits_bonus" in event:
-                                current_amount += event["credits_bonus"]
-                                self.reward_calculations.append((event["text"], current_amount, event["credits_bonus"]))
+                            if event.reward_mult != 1.0:
+                                current_amount = round(current_amount * event.reward_mult)  # Round after each multiplier
+                                self.reward_calculations.append((event.template.text, current_amount, event.reward_mult))
+                            elif event.credits > 0:
+                                current_amount += event.credits
+                                self.reward_calculations.append((event.template.text, current_amount, event.credits))
                         
                         # Check target's balance and perform transfer atomically
-                        try:
-                            target_balance = await bank.get_balance(self.target)
-                            min_required = max(settings.get("min_steal_balance", 100), self.crime_data["min_reward"])
-                            
-                            if target_balance < min_required:
-                                msg = await interaction.channel.send(
-                                    _("Your target doesn't have enough {currency} to steal from! (Minimum: {min:,})").format(
-                                        currency=await bank.get_currency_name(interaction.guild),
-                                        min=min_required
-                                    )
+                        target_balance = await credits.balance(self.target)
+                        min_required = max(settings.get("min_steal_balance", 100), self.crime_data["min_reward"])
+                        
+                        if target_balance < min_required:
+                            self.cog.target_pool.note_balance(self.target, target_balance)
+                            await credits.commit()
+                            timeline.reveal(
+                                result_delay,
+                                _("Your target doesn't have enough {currency} to steal from! (Minimum: {min:,})").format(
+                                    currency=await bank.get_currency_name(interaction.guild),
+                                    min=min_required
                                 )
-                                self.all_messages.append(msg)
-                                return
-                                
-                            # Try to perform the transfers
-                            await bank.withdraw_credits(self.target, current_amount)
-                            await bank.deposit_credits(interaction.user, current_amount)
+                            )
+                        else:
+                            # Move the loot atomically, never more than the target has left
+                            theft = credits.transfer(self.target, interaction.user, current_amount)
+                            balances = await credits.commit()
+                            current_amount = theft.moved
+                            self.cog.target_pool.note_balance(self.target, balances.get(self.target.id, target_balance))
+                            self.cog.target_pool.note_deposit(interaction.user)
                             
                             # Update stats and last target
-                            async with self.cog.config.member(interaction.user).all() as user_data:
+                            async with self.cog.member_cache.edit(interaction.user) as user_data:
                                 user_data["total_stolen_from"] += current_amount
                                 user_data["total_credits_earned"] += current_amount
                                 user_data["last_target"] = self.target.id
                                 user_data["total_successful_crimes"] += 1
                                 if current_amount > user_data.get("largest_heist", 0):
                                     user_data["largest_heist"] = current_amount
+                            CRIMES_SUCCEEDED.inc(1, (self.crime_type,))
                                     
-                            async with self.cog.config.member(self.target).all() as target_data:
+                            async with self.cog.member_cache.edit(self.target) as target_data:
                                 target_data["total_stolen_by"] += current_amount
                                 
-                            # Send success message
-                            msg = await interaction.channel.send(
+                            # Queue success message
+                            timeline.reveal(
+                                result_delay,
                                 embed=await self.format_crime_message(
                                     True,
                                     target=self.target,
@@ -705,29 +689,14 @@ class CrimeView(discord.ui.View):
                                     credit_changes=total_credit_changes
                                 )
                             )
-                            self.all_messages.append(msg)
-                            for item in attempt_view.children:
-                                item.disabled = True
-                            await attempt_view.message.edit(view=attempt_view)
-                            self.stop()  # Stop the view after success
-                            
-                        except discord.HTTPException as e:
-                            await interaction.channel.send(
-                                _("Failed to steal from target - they may not have enough {currency}. Error: {error}").format(
-                                    currency=await bank.get_currency_name(interaction.guild),
-                                    error=str(e)
-                                )
-                            )
-                            self.all_messages.append(msg)
-                            return
                             
                     except Exception as e:
-                        await interaction.channel.send(
+                        await credits.commit()
+                        await self.cog.outbox.send(interaction.channel,
                             _("An error occurred while processing the crime. Please try again. Error: {error}").format(
                                 error=str(e)
                             )
                         )
-                        self.all_messages.append(msg)
                         return
 
                 else:
@@ -738,27 +707,27 @@ class CrimeView(discord.ui.View):
                         current_amount = base_amount
                         
                         # Apply streak bonus if any
-                        streak, streak_multiplier = await update_streak(self.cog.config, interaction.user, True)
+                        streak, streak_multiplier = await update_streak(self.cog.member_cache, interaction.user, True)
                         if streak > 0:
                             current_amount = round(current_amount * streak_multiplier)  # Round after streak multiplier
                             self.reward_calculations.append((format_streak_text(streak, streak_multiplier), current_amount, streak_multiplier))
 
                         # Process reward modifiers from events
                         for event in events:
-                            if "reward_multiplier" in event:
-                                current_amount = round(current_amount * event["reward_multiplier"])  # Round after each multiplier
-                                self.reward_calculations.append((event["text"], current_amount, event["reward_multiplier"]))
-                            elif "credits_bonus" in event:
-                                current_amount += event["credits_bonus"]
-                                self.reward_calculations.append((f"Bonus Credits", current_amount, event["credits_bonus"]))
-                            elif "credits_penalty" in event:
-                                current_amount -= event["credits_penalty"]
-                                self.reward_calculations.append((f"Bonus Credits", current_amount, -event["credits_penalty"]))
+                            if event.reward_mult != 1.0:
+                                current_amount = round(current_amount * event.reward_mult)  # Round after each multiplier
+                                self.reward_calculations.append((event.template.text, current_amount, event.reward_mult))
+                            elif event.credits:
+                                current_amount += event.credits
+                                self.reward_calculations.append((f"Bonus Credits", current_amount, event.credits))
                         
-                        await bank.deposit_credits(interaction.user, current_amount)
+                        credits.deposit(interaction.user, current_amount)
+                        await credits.commit()
+                        self.cog.target_pool.note_deposit(interaction.user)
                         
-                        # Send success message
-                        msg = await interaction.channel.send(
+                        # Queue success message
+                        timeline.reveal(
+                            result_delay,
                             embed=await self.format_crime_message(
                                 True,
                                 reward=current_amount,
@@ -767,72 +736,64 @@ class CrimeView(discord.ui.View):
                                 credit_changes=total_credit_changes
                             )
                         )
-                        self.all_messages.append(msg)
-                        for item in attempt_view.children:
-                            item.disabled = True
-                        await attempt_view.message.edit(view=attempt_view)
-                        self.stop()  # Stop the view after success
                         
                         # Update stats
-                        async with self.cog.config.member(interaction.user).all() as user_data:
+                        async with self.cog.member_cache.edit(interaction.user) as user_data:
                             user_data["total_credits_earned"] += current_amount
                             user_data["total_successful_crimes"] += 1
                             if current_amount > user_data.get("largest_heist", 0):
                                 user_data["largest_heist"] = current_amount
+                        CRIMES_SUCCEEDED.inc(1, (self.crime_type,))
                                 
                     except Exception as e:
-                        await interaction.channel.send(
+                        await credits.commit()
+                        await self.cog.outbox.send(interaction.channel,
                             _("An error occurred while processing your crime. Please try again. Error: {error}").format(
                                 error=str(e)
                             )
                         )
-                        self.all_messages.append(msg)
                         return
             else:
                 # Crime failed, processing penalties
                 
                 # Reset streak on failure
-                await update_streak(self.cog.config, interaction.user, False)
+                await update_streak(self.cog.member_cache, interaction.user, False)
                 
                 fine_amount = int(self.crime_data["max_reward"] * self.crime_data["fine_multiplier"])
                 actual_fine = 0  # Track how much was actually paid
                 
                 # Apply fine if user can afford it
                 try:
-                    user_balance = await bank.get_balance(interaction.user)
-                    if user_balance >= fine_amount:
-                        await bank.withdraw_credits(interaction.user, fine_amount)
-                        actual_fine = fine_amount
-                        async with self.cog.config.member(interaction.user).all() as user_data:
-                            user_data["total_fines_paid"] += fine_amount
-                    else:
-                        # Take all their money and double jail time
-                        if user_balance > 0:  # Only take money if they have any
-                            await bank.withdraw_credits(interaction.user, user_balance)
-                            actual_fine = user_balance
-                            async with self.cog.config.member(interaction.user).all() as user_data:
-                                user_data["total_fines_paid"] += user_balance
-
-                        # Double the jail time
+                    # Takes what they have if it isn't enough, decided under the account lock
+                    fine = credits.withdraw(interaction.user, fine_amount)
+                    await credits.commit()
+                    actual_fine = fine.taken
+                    if actual_fine > 0:  # Only count money if they had any
+                        async with self.cog.member_cache.edit(interaction.user) as user_data:
+                            user_data["total_fines_paid"] += actual_fine
+                    if actual_fine < fine_amount:
+                        # All their money was taken, double jail time
                         jail_time *= 2
-                        await interaction.channel.send(
+                        timeline.reveal(
+                            result_delay,
                             _("You cannot afford the fine of {fine:,} {currency}. All your money has been confiscated and your jail time has been doubled!").format(
                                 fine=fine_amount,
                                 currency=await bank.get_currency_name(interaction.guild)
                             )
                         )
+                        result_delay = 0
 
                 except Exception as e:
-                    await interaction.channel.send(
+                    await self.cog.outbox.send(interaction.channel,
                         _("Failed to apply fine. Error: {error}").format(
                             error=str(e)
                         )
                     )
-                    self.all_messages.append(msg)
                     return
                 
-                # Send failure message with jail options
-                msg = await interaction.channel.send(
+                # Queue failure message with jail options
+                timeline.reveal(
+                    result_delay,
                     embed=await self.format_crime_message(
                         False,
                         fine=actual_fine,
@@ -842,22 +803,17 @@ class CrimeView(discord.ui.View):
                         credit_changes=total_credit_changes
                     )
                 )
-                self.all_messages.append(msg)
                 
-                # Add jail options view
+                # Add jail options to the result
                 jail_view = JailOptionsView(self.cog, interaction, jail_time)
-                jail_msg = await interaction.channel.send(view=jail_view)
-                jail_view.message = jail_msg
-                self.all_messages.append(jail_msg)
-                
-                # Disable attempt view buttons
-                for item in attempt_view.children:
-                    item.disabled = True
-                await attempt_view.message.edit(view=attempt_view)
-                self.stop()  # Stop the view after failure
+
+                def attach_jail_view(message: discord.Message) -> None:
+                    jail_view.message = message
+
+                timeline.reveal(0, view=jail_view, after=attach_jail_view)
                 
                 # Update stats
-                async with self.cog.config.member(interaction.user).all() as user_data:
+                async with self.cog.member_cache.edit(interaction.user) as user_data:
                     user_data["total_failed_crimes"] += 1
                 
                 # Send to jail
@@ -866,8 +822,12 @@ class CrimeView(discord.ui.View):
             # Set cooldown
             await self.cog.set_action_cooldown(interaction.user, self.crime_type)
             
+            # The outcome is final, only the reveal is left
+            self.stop()
+            self.cog.reveals.play(timeline)
+            
         except Exception as e:
-            await interaction.channel.send(
+            await self.cog.outbox.send(interaction.channel,
                 _("An error occurred while processing your crime. Please try again. Error: {error}").format(
                     error=str(e)
                 )
@@ -894,112 +854,16 @@ class CrimeView(discord.ui.View):
                 pass
             
             # Send cancellation message
-            msg = await interaction.channel.send(_("Crime cancelled."))
+            msg = await self.cog.outbox.send(interaction.channel, _("Crime cancelled."))
             self.stop()
         except Exception as e:
-            await interaction.channel.send(
+            await self.cog.outbox.send(interaction.channel,
                 _("An error occurred while cancelling the crime. Error: {error}").format(
                     error=str(e)
                 )
             )
             self.stop()
             
-class CrimeAttemptView(discord.ui.View):
-    """View for the crime attempt message with Bail Out button."""
-    
-    def __init__(self, cog, interaction: discord.Interaction, crime_type: str):
-        super().__init__(timeout=30)
-        self.cog = cog
-        self.interaction = interaction
-        self.crime_type = crime_type
-        self.message = None
-        self.bailed = False
-        
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Only allow the original user to use the view."""
-        return interaction.user.id == self.interaction.user.id
-        
-    @discord.ui.button(label="Bail Out!", style=discord.ButtonStyle.danger, emoji="🏃")
-    async def bail_out(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Handle bailing out of a crime attempt"""
-        if interaction.user.bot:
-            return
-            
-        try:
-            await interaction.response.defer()
-            
-            # Deduct bail out cost
-            currency = await bank.get_currency_name(interaction.guild)
-            try:
-                await bank.withdraw_credits(interaction.user, 100)
-            except ValueError:
-                await interaction.followup.send(
-                    _("You don't have enough {currency} to bail out! (Cost: 100)").format(
-                        currency=currency
-                    ),
-                    ephemeral=True
-                )
-                return
-
-            # Set cooldown
-            await self.cog.set_action_cooldown(interaction.user, self.crime_type)
-
-            # Disable the button
-            button.disabled = True
-            await self.message.edit(view=self)
-
-            # Send bail out message
-            embed = discord.Embed(
-                title="🏃 Bailed Out!",
-                description=f"{interaction.user.mention} chickened out and bailed on the {self.crime_type.replace('_', ' ')}!",
-                color=discord.Color.yellow()
-            )
-            embed.add_field(
-                name="Cost",
-                value=f"100 {currency}",
-                inline=False
-            )
-            
-            await interaction.followup.send(embed=embed)
-            
-            # Set bailed flag
-            self.bailed = True
-            
-            # Stop the view
-            self.stop()
-            
-        except Exception as e:
-            await interaction.followup.send(
-                _("An error occurred while bailing out. Error: {error}").format(
-                    error=str(e)
-                ),
-                ephemeral=True
-            )
-            self.stop()
-
-    async def on_timeout(self) -> None:
-        """Handle view timeout"""
-        if self.bailed:
-            # If already bailed out, don't try to modify the message
-            return
-            
-        try:
-            # Disable the button
-            for item in self.children:
-                item.disabled = True
-                
-            # Try to update the message if it still exists
-            if self.message:
-                try:
-                    await self.message.edit(view=self)
-                except (discord.NotFound, discord.HTTPException):
-                    # Message was deleted or became invalid, just ignore
-                    pass
-        except Exception as e:
-            # Log any other unexpected errors but don't try to send them
-            # since the channel/message might not be available
-            pass
-            
 class BailView(discord.ui.View):
     """View for paying bail"""
     def __init__(self, cog, ctx: commands.Context, bail_amount: int, jail_time: int):
@@ -1040,7 +904,7 @@ class BailView(discord.ui.View):
                 f"An error occurred while cleaning up messages: {str(e)}",
                 discord.Color.red()
             )
-            await self.message.channel.send(embed=error_embed)
+            await self.cog.outbox.send(self.message.channel, embed=error_embed)
             
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Only allow the author that invoked the command to use the interaction"""
@@ -1048,7 +912,7 @@ class BailView(discord.ui.View):
         
     async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
         """Handle any errors that occur during button interactions"""
-        msg = await interaction.channel.send(
+        msg = await self.cog.outbox.send(interaction.channel,
             _("An error occurred. Please try again. Error: {error}").format(
                 error=str(error)
             )
@@ -1058,6 +922,7 @@ class BailView(discord.ui.View):
         self.stop()
         
     @discord.ui.button(label="Pay Bail", style=discord.ButtonStyle.success, emoji="💸")
+    @PERF.measured("crime.bail")
     async def pay_bail(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Pay bail and get out of jail"""
         if interaction.user.bot:
@@ -1065,11 +930,22 @@ class BailView(discord.ui.View):
             
         try:
             # Get current balance and currency name
-            current_balance = await bank.get_balance(interaction.user)
-            currency_name = await bank.get_currency_name(interaction.guild)
-            
-            # Check if user has enough credits
-            if not await bank.can_spend(interaction.user, self.bail_amount):
+            credits = BankBatch(self.cog.bank_locks, source="bail")
+            current_balance = await credits.balance(interaction.user)
+            with PERF.timed("bank"):
+                currency_name = await bank.get_currency_name(interaction.guild)
+            
+            # Pay bail under the account lock, all or nothing
+            paid = False
+            new_balance = current_balance
+            if current_balance >= self.bail_amount:
+                bail = credits.withdraw(interaction.user, self.bail_amount, partial=False)
+                balances = await credits.commit()
+                paid = bail.taken == self.bail_amount
+                new_balance = balances.get(interaction.user.id, current_balance - bail.taken)
+            
+            # Check if user had enough credits
+            if not paid:
                 insufficient_embed = self.format_bail_embed(
                     "💵 Insufficient Funds",
                     f"You don't have enough {currency_name} to pay bail!\n\n"
@@ -1077,18 +953,12 @@ class BailView(discord.ui.View):
                     f"**Current Balance:** {current_balance:,} {currency_name}",
                     discord.Color.red()
                 )
-                msg = await interaction.channel.send(embed=insufficient_embed)
+                msg = await self.cog.outbox.send(interaction.channel, embed=insufficient_embed)
                 self.all_messages.append(msg)
                 return
                 
-            # Pay bail and remove from jail
-            await bank.withdraw_credits(interaction.user, self.bail_amount)
-            
-            # Get new balance
-            new_balance = await bank.get_balance(interaction.user)
-            
             # Update jail status and stats
-            async with self.cog.config.member(interaction.user).all() as user_data:
+            async with self.cog.member_cache.edit(interaction.user) as user_data:
                 user_data["jail_until"] = 0
                 user_data["total_bail_paid"] = user_data.get("total_bail_paid", 0) + self.bail_amount
             
@@ -1107,7 +977,7 @@ class BailView(discord.ui.View):
                 f"**New Balance:** {new_balance:,} {currency_name}",
                 discord.Color.green()
             )
-            await interaction.channel.send(embed=success_embed)
+            await self.cog.outbox.send(interaction.channel, embed=success_embed, priority=Priority.RESULT)
             self.stop()
             
         except Exception as e:
@@ -1116,7 +986,7 @@ class BailView(discord.ui.View):
                 f"An error occurred while paying bail: {str(e)}",
                 discord.Color.red()
             )
-            msg = await interaction.channel.send(embed=error_embed)
+            msg = await self.cog.outbox.send(interaction.channel, embed=error_embed)
             self.all_messages.append(msg)
             await self.cleanup_messages()
             self.stop()
@@ -1132,7 +1002,7 @@ class BailView(discord.ui.View):
             seconds = self.jail_time % 60
             
             # Check if user has reduced sentence perk
-            member_data = await self.cog.config.member(interaction.user).all()
+            member_data = await self.cog.member_cache.get(interaction.user)
             has_reducer = "jail_reducer" in member_data.get("purchased_perks", [])
             
             time_text = f"{minutes}m {seconds}s"
@@ -1145,7 +1015,7 @@ class BailView(discord.ui.View):
                 f"**Time Remaining:** {time_text}",
                 discord.Color.orange()
             )
-            msg = await interaction.channel.send(embed=cancel_embed)
+            msg = await self.cog.outbox.send(interaction.channel, embed=cancel_embed)
             self.all_messages.append(msg)
             await self.cleanup_messages()
             self.stop()
@@ -1155,7 +1025,7 @@ class BailView(discord.ui.View):
                 f"An error occurred while cancelling bail: {str(e)}",
                 discord.Color.red()
             )
-            await interaction.channel.send(embed=error_embed)
+            await self.cog.outbox.send(interaction.channel, embed=error_embed)
             
     async def on_timeout(self):
         """Handle view timeout"""
@@ -1163,13 +1033,13 @@ class BailView(discord.ui.View):
             for item in self.children:
                 item.disabled = True
             if self.message:
-                await self.message.edit(view=self)
+                await self.cog.outbox.edit(self.message, view=self)
                 timeout_embed = self.format_bail_embed(
                     "⏰ Time's Up",
                     "Bail payment timed out.",
                     discord.Color.greyple()
                 )
-                msg = await self.message.channel.send(embed=timeout_embed)
+                msg = await self.cog.outbox.send(self.message.channel, embed=timeout_embed)
                 self.all_messages.append(msg)
                 await self.cleanup_messages()
         except Exception:
@@ -1199,20 +1069,9 @@ class TargetModal(discord.ui.Modal):
             await interaction.response.defer()
             
             # Try to find the target member
-            exact_matches = []
-            partial_matches = []
-            input_value = self.target_input.value.lower()
-            
-            # First collect all exact and partial matches
-            for member in interaction.guild.members:
-                # Check exact matches first
-                if (input_value == member.name.lower() or 
-                    input_value == member.display_name.lower() or 
-                    input_value == str(member.id)):
-                    exact_matches.append(member)
-                elif (input_value in member.name.lower() or 
-                    input_value in member.display_name.lower()):
-                    partial_matches.append(member)
+            exact_matches, partial_matches = self.view.cog.member_names.search(
+                interaction.guild, self.target_input.value
+            )
             
             # Handle multiple exact matches
             if len(exact_matches) > 1:
@@ -1262,7 +1121,7 @@ class TargetModal(discord.ui.Modal):
                 return
                 
             # Check if target is valid
-            settings = await self.view.cog.config.guild(interaction.guild).global_settings()
+            settings = await self.view.cog.get_guild_settings(interaction.guild, "global_settings")
             can_target, reason = await can_target_for_crime(self.view.cog, interaction, target, self.view.crime_data, settings)
             
             if not can_target:
@@ -1358,7 +1217,7 @@ class TargetSelectionView(discord.ui.View):
                 except (discord.NotFound, discord.Forbidden):
                     pass
         except Exception as e:
-            await self.message.channel.send(
+            await self.cog.outbox.send(self.message.channel,
                 _("An error occurred while cleaning up messages. Error: {error}").format(
                     error=str(e)
                 )
@@ -1369,130 +1228,69 @@ class TargetSelectionView(discord.ui.View):
         try:
             # Get settings first - we need this for all checks
             try:
-                settings = await self.cog.config.guild(self.interaction.guild).global_settings()
+                settings = await self.cog.get_guild_settings(self.interaction.guild, "global_settings")
                 min_required = max(settings.get("min_steal_balance", 100), self.crime_data["min_reward"])
             except AttributeError:
-                await self.interaction.channel.send(_("Error: Could not access guild settings. Please try again."))
+                await self.cog.outbox.send(self.interaction.channel, _("Error: Could not access guild settings. Please try again."))
                 return None
             except Exception as e:
-                await self.interaction.channel.send(_("Error: Could not load settings. Error: {error}").format(error=str(e)))
+                await self.cog.outbox.send(self.interaction.channel, _("Error: Could not load settings. Error: {error}").format(error=str(e)))
                 return None
 
             # Get last target ID once - cheap memory lookup
             try:
-                last_target_id = await self.cog.config.member(self.interaction.user).last_target()
+                last_target_id = (await self.cog.member_cache.get(self.interaction.user))["last_target"]
             except Exception:
                 last_target_id = None
             
-            # Initial filtering with optimized memory usage
-            all_members = []
-            try:
-                for member in self.interaction.guild.members:
-                    # Combined early filtering with clear conditions
-                    if (member.bot or 
-                        member.id == self.interaction.user.id or
-                        (last_target_id is not None and member.id == last_target_id) or
-                        member.guild_permissions.administrator):  # Skip admins early
-                        continue
-                    all_members.append(member)
-            except AttributeError:
-                await self.interaction.channel.send(_("Error: Could not access guild members. Please try again."))
-                return None
-            
-            if not all_members:
-                await self.interaction.channel.send(_("No valid targets found! Everyone is either a bot or immune to crime."))
-                return None
-            
-            random.shuffle(all_members)
+            # Members who aren't bots, admins, jailed or known to be broke
+            guild = self.interaction.guild
+            pool = await self.cog.target_pool.ensure_built(
+                self.cog.jail_index, self.cog.config, guild, self.cog.member_cache, settings.get("min_steal_balance", 100)
+            )
+            exclude = {self.interaction.user.id, last_target_id}
             
-            # Get list of jailed members once instead of checking individually
-            jailed_members = set()
-            jail_check_errors = 0
-            for member in all_members:
+            # The pool can be slightly stale, so every draw is checked live
+            for _attempt in range(RANDOM_TARGET_DRAWS):
+                member_id = pool.sample(exclude)
+                if member_id is None:
+                    break
+                exclude.add(member_id)
+                
+                member = guild.get_member(member_id)
+                if member is None:
+                    self.cog.target_pool.member_left(guild.id, member_id)
+                    continue
+                if member.bot or member.guild_permissions.administrator:
+                    self.cog.target_pool.member_changed(member)
+                    continue
+                    
                 try:
-                    if await self.cog.is_jailed(member):
-                        jailed_members.add(member.id)
+                    balance = await bank.get_balance(member)
                 except Exception:
-                    jail_check_errors += 1
-                    if jail_check_errors > min(5, len(all_members) * 0.1):  # 10% or 5 errors, whichever is smaller
-                        await self.interaction.channel.send(_("Error: Too many jail status check failures. Please try again."))
-                        return None
                     continue
-            
-            # Process members in chunks
-            chunk_size = min(25, max(10, len(all_members) // 20))  # Dynamic chunk size
-            total_checked = 0
-            balance_check_errors = 0
-            targeting_check_errors = 0
-            
-            # Pre-cache bank data for first chunk to avoid initial lag
-            try:
-                first_chunk = all_members[:chunk_size]
-                balance_tasks = [bank.get_balance(member) for member in first_chunk if member.id not in jailed_members]
-                if balance_tasks:
-                    await asyncio.gather(*balance_tasks, return_exceptions=True)
-            except Exception:
-                pass  # Ignore pre-cache errors
-            
-            while total_checked < len(all_members):
-                chunk_end = min(total_checked + chunk_size, len(all_members))
-                current_chunk = all_members[total_checked:chunk_end]
-                
-                # Check balances in parallel for the chunk
-                balance_tasks = []
-                chunk_members = []
-                for member in current_chunk:
-                    if member.id not in jailed_members:
-                        balance_tasks.append(bank.get_balance(member))
-                        chunk_members.append(member)
-                        
-                if balance_tasks:
-                    try:
-                        balance_results = await asyncio.gather(*balance_tasks, return_exceptions=True)
-                        for member, balance_result in zip(chunk_members, balance_results):
-                            if isinstance(balance_result, Exception):
-                                if not isinstance(balance_result, discord.NotFound):
-                                    balance_check_errors += 1
-                                continue
-                                
-                            if balance_result >= min_required:
-                                try:
-                                    can_target, _ = await can_target_for_crime(self.cog, self.interaction, member, self.crime_data, settings)
-                                    if can_target:
-                                        return member
-                                except discord.NotFound:
-                                    continue
-                                except Exception:
-                                    targeting_check_errors += 1
-                                    
-                    except Exception:
-                        balance_check_errors += len(balance_tasks)
-                        
-                    # Check error thresholds
-                    if balance_check_errors > min(5, len(all_members) * 0.1):
-                        await self.interaction.channel.send(_("Error: Multiple balance check failures. Please try again later."))
-                        return None
-                    if targeting_check_errors > min(5, len(all_members) * 0.1):
-                        await self.interaction.channel.send(_("Error: Multiple targeting check failures. Please try again later."))
-                        return None
-                        
-                total_checked += chunk_size
-                
-                # Stop if we've checked enough members
-                if total_checked >= len(all_members) * 0.5:
-                    break
+                pool.note_balance(member_id, balance)
+                if balance < min_required:
+                    continue
+                    
+                try:
+                    can_target, _reason = await can_target_for_crime(self.cog, self.interaction, member, self.crime_data, settings)
+                except Exception:
+                    continue
+                if can_target:
+                    return member
                 
-            await self.interaction.channel.send(_("No valid targets found! Everyone is either broke, a bot, or immune to crime."))
+            await self.cog.outbox.send(self.interaction.channel, _("No valid targets found! Everyone is either broke, a bot, or immune to crime."))
             return None
             
         except discord.NotFound:
-            await self.interaction.channel.send(_("Error: The server or channel could not be found. Please try again."))
+            await self.cog.outbox.send(self.interaction.channel, _("Error: The server or channel could not be found. Please try again."))
             return None
         except discord.Forbidden:
-            await self.interaction.channel.send(_("Error: I don't have permission to perform this action."))
+            await self.cog.outbox.send(self.interaction.channel, _("Error: I don't have permission to perform this action."))
             return None
         except Exception as e:
-            await self.interaction.channel.send(
+            await self.cog.outbox.send(self.interaction.channel,
                 _("An unexpected error occurred while finding a random target. Please try again later. Error: {error}")
                 .format(error=str(e))
             )
@@ -1504,7 +1302,7 @@ class TargetSelectionView(discord.ui.View):
         
     async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
         """Handle any errors that occur during button interactions"""
-        msg = await interaction.channel.send(
+        msg = await self.cog.outbox.send(interaction.channel,
             _("An error occurred. Please try again. Error: {error}").format(
                 error=str(error)
             )
@@ -1543,7 +1341,7 @@ class TargetSelectionView(discord.ui.View):
                     inline=True
                 )
                 
-                message = await interaction.channel.send(
+                message = await self.cog.outbox.send(interaction.channel,
                     embed=embed,
                     view=crime_view
                 )
@@ -1551,8 +1349,8 @@ class TargetSelectionView(discord.ui.View):
                 crime_view.all_messages = self.all_messages + [message]  # Pass message list to crime view
                 self.stop()
             else:
-                settings = await self.cog.config.guild(interaction.guild).global_settings()
-                await interaction.channel.send(
+                settings = await self.cog.get_guild_settings(interaction.guild, "global_settings")
+                await self.cog.outbox.send(interaction.channel,
                     _("No valid targets found. A valid target must:\n"
                       "• Have at least {min_balance:,} {currency}\n"
                       "• Not be your last target\n"
@@ -1565,7 +1363,7 @@ class TargetSelectionView(discord.ui.View):
                 self.all_messages.append(msg)
                 await self.cleanup_messages()
         except Exception as e:
-            await interaction.channel.send(
+            await self.cog.outbox.send(interaction.channel,
                 _("An error occurred while selecting a target. Please try again. Error: {error}").format(
                     error=str(e)
                 )
@@ -1589,7 +1387,7 @@ class TargetSelectionView(discord.ui.View):
             return
             
         await interaction.response.defer()
-        msg = await interaction.channel.send(_("Crime cancelled."))
+        msg = await self.cog.outbox.send(interaction.channel, _("Crime cancelled."))
         self.all_messages.append(msg)
         await self.cleanup_messages()
         self.target = None
@@ -1605,9 +1403,9 @@ class TargetSelectionView(discord.ui.View):
             # Try to update the message if it still exists
             if self.message:
                 try:
-                    await self.message.edit(view=self)
+                    await self.cog.outbox.edit(self.message, view=self)
                     try:
-                        msg = await self.message.channel.send(_("Target selection timed out."))
+                        msg = await self.cog.outbox.send(self.message.channel, _("Target selection timed out."), priority=Priority.FLAVOR)
                         self.all_messages.append(msg)
                         await self.cleanup_messages()
                     except discord.HTTPException:
@@ -1645,7 +1443,7 @@ async def can_target_for_crime(cog, interaction: discord.Interaction, target: di
         return False, _("That user is in jail!")
         
     # Check if target was last victim
-    last_target = await cog.config.member(interaction.user).last_target()
+    last_target = (await cog.member_cache.get(interaction.user))["last_target"]
     if last_target is not None and last_target == target.id:
         return False, _("You can't target your last victim!")
         
@@ -1719,8 +1517,8 @@ class MainMenuSelect(discord.ui.Select):
     
     async def update_options(self):
         """Update options based on user's current status."""
-        is_jailed = await self.cog.is_jailed(self.ctx.author)
-        member_data = await self.cog.config.member(self.ctx.author).all()
+        snapshot = await self.cog.get_member_snapshot(self.ctx.author)
+        is_jailed = snapshot.is_jailed()
         
         # Create a new options list based on user status
         options = []
@@ -1741,7 +1539,7 @@ class MainMenuSelect(discord.ui.Select):
                     description="(Unavailable) Only available while in jail",
                     emoji=option.emoji
                 )
-            elif option.value == "jailbreak" and member_data.get("attempted_jailbreak", False):
+            elif option.value == "jailbreak" and snapshot.attempted_jailbreak:
                 # Update description for failed jailbreak
                 new_option = discord.SelectOption(
                     label=option.label,
@@ -1762,7 +1560,7 @@ class MainMenuSelect(discord.ui.Select):
         
         # Update the message with new options
         if self.view and self.view.message:
-            await self.view.message.edit(view=self.view)
+            await self.view.cog.outbox.edit(self.view.message, view=self.view)
     
     async def callback(self, interaction: discord.Interaction):
         """Handle menu selection."""
@@ -1771,8 +1569,8 @@ class MainMenuSelect(discord.ui.Select):
             return
             
         # Get current jail status
-        is_jailed = await self.cog.is_jailed(self.ctx.author)
-        member_data = await self.cog.config.member(self.ctx.author).all()
+        snapshot = await self.cog.get_member_snapshot(self.ctx.author)
+        is_jailed = snapshot.is_jailed()
         action = self.values[0]
         
         # Validate the selection based on current status
@@ -1782,7 +1580,7 @@ class MainMenuSelect(discord.ui.Select):
         elif action in ["bail", "jailbreak"] and not is_jailed:
             await interaction.response.send_message("You are not in jail!", ephemeral=True)
             return
-        elif action == "jailbreak" and member_data.get("attempted_jailbreak", False):
+        elif action == "jailbreak" and snapshot.attempted_jailbreak:
             await interaction.response.send_message("You've already attempted to break out this sentence!", ephemeral=True)
             return
             
@@ -1832,7 +1630,7 @@ class MainMenuView(discord.ui.View):
         try:
             self.select_menu.disabled = True
             if self.message:
-                await self.message.edit(view=self)
+                await self.cog.outbox.edit(self.message, view=self)
         except (discord.NotFound, discord.HTTPException):
             pass
 
@@ -1965,7 +1763,7 @@ class JailOptionsView(discord.ui.View):
         try:
             for item in self.children:
                 item.disabled = True
-            await self.message.edit(view=self)
+            await self.cog.outbox.edit(self.message, view=self)
         except (discord.NotFound, discord.HTTPException):
             pass
             
@@ -1980,7 +1778,7 @@ class JailOptionsView(discord.ui.View):
             
             # Disable the jailbreak button immediately after deferring
             button.disabled = True
-            await self.message.edit(view=self)
+            await self.cog.outbox.edit(self.message, view=self)
             
             # Create context from interaction
             ctx = await self.cog.bot.get_context(interaction.message)
@@ -2016,7 +1814,7 @@ class JailOptionsView(discord.ui.View):
             # Disable buttons after use
             for item in self.children:
                 item.disabled = True
-            await self.message.edit(view=self)
+            await self.cog.outbox.edit(self.message, view=self)
             self.stop()
             
         except Exception as e:
@@ -296,7 +296,7 @@ class InventoryView(discord.ui.View):
                 
             if item_id == "notify_ping":
                 # Toggle notification status
-                async with self.cog.config.member(self.ctx.author).all() as member_data:
+                async with self.cog.member_cache.edit(self.ctx.author) as member_data:
                     current_status = member_data.get("notify_on_release", False)
                     member_data["notify_on_release"] = not current_status
                     new_status = member_data["notify_on_release"]
@@ -314,7 +314,7 @@ class InventoryView(discord.ui.View):
                 )
                 await self._update_message()
         elif item["type"] == "consumable":
-            async with self.cog.config.member(self.ctx.author).all() as member_data:
+            async with self.cog.member_cache.edit(self.ctx.author) as member_data:
                 # Clean up expired items first
                 member_data = await cleanup_inventory(member_data, self.item_registry)
                 
@@ -435,7 +435,7 @@ class InventoryView(discord.ui.View):
         currency_name = await bank.get_currency_name(self.ctx.guild)
         
         # Remove item and give credits
-        async with self.cog.config.member(self.ctx.author).all() as member_data:
+        async with self.cog.member_cache.edit(self.ctx.author) as member_data:
             # Clean up expired items first
             member_data = await cleanup_inventory(member_data, self.item_registry)
             
@@ -519,11 +519,8 @@ async def display_inventory(cog: commands.Cog, ctx: commands.Context, item_regis
         }
     """
     # Get and clean member data
-    member_data = await cog.config.member(ctx.author).all()
-    member_data = await cleanup_inventory(member_data, item_registry)
-    
-    # Save cleaned data
-    await cog.config.member(ctx.author).set(member_data)
+    async with cog.member_cache.edit(ctx.author) as member_data:
+        member_data = await cleanup_inventory(member_data, item_registry)
     
     # Create view and initialize
     view = InventoryView(ctx, cog, member_data, item_registry)
@@ -0,0 +1,120 @@
+"""In-memory index of who is in jail, ordered by release time.
+
+Jail status used to be found out one member at a time by reading their
+``jail_until``. The index keeps every active sentence as a sorted
+``(jail_until, member_id)`` list per guild, so "who is jailed right now" is a
+binary search and a slice instead of a scan over members.
+
+It is loaded from Config once and then follows the member cache's change
+listener. Every way into or out of jail (crimes, ``crime jail``, bail,
+jailbreaks, wipes) writes ``jail_until`` through the cache, so no call site
+has to update the index itself.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from redbot.core import Config
+
+
+Sentence = Tuple[int, int]  # (jail_until, member_id)
+
+
+class JailIndex:
+    """Active jail sentences per guild."""
+
+    def __init__(self) -> None:
+        self._sentences: Dict[int, List[Sentence]] = {}
+        self._until: Dict[Tuple[int, int], int] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+    async def ensure_loaded(self, config: Config, member_cache) -> None:
+        """Load every active sentence from Config, once.
+
+        Cached member data is newer than what Config holds, so it replaces
+        the stored copy of those members.
+        """
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            all_members = await config.all_members()
+            for guild_id, members in all_members.items():
+                members.update(member_cache.cached_members(guild_id))
+                for member_id, data in members.items():
+                    self.set(guild_id, member_id, data.get("jail_until", 0))
+            self._loaded = True
+
+    def clear(self) -> None:
+        """Forget every sentence and reload on next use."""
+        self._sentences.clear()
+        self._until.clear()
+        self._loaded = False
+
+    def set(self, guild_id: int, member_id: int, jail_until: int) -> None:
+        """Record a member's sentence, or remove it if ``jail_until`` has passed."""
+        key = (guild_id, member_id)
+        current = self._until.get(key)
+        new = jail_until if jail_until > time.time() else None
+        if current == new:
+            return
+        sentences = self._sentences.setdefault(guild_id, [])
+        if current is not None:
+            index = bisect_left(sentences, (current, member_id))
+            if index < len(sentences) and sentences[index] == (current, member_id):
+                del sentences[index]
+            del self._until[key]
+        if new is not None:
+            insort(sentences, (new, member_id))
+            self._until[key] = new
+
+    def update(self, key: Tuple[int, int], data: Dict[str, Any]) -> None:
+        """Follow jail changes. Meant as a MemberStateCache listener."""
+        if self._loaded:
+            self.set(key[0], key[1], data.get("jail_until", 0))
+
+    def jail_until(self, guild_id: int, member_id: int) -> int:
+        """Get when a member's sentence ends, or 0 if they aren't jailed."""
+        until = self._until.get((guild_id, member_id), 0)
+        return until if until > time.time() else 0
+
+    def is_jailed(self, guild_id: int, member_id: int) -> bool:
+        """Check if a member is serving a sentence."""
+        return self.jail_until(guild_id, member_id) > 0
+
+    def active_count(self, now: Optional[float] = None) -> int:
+        """Count the sentences still running, across every guild."""
+        now = time.time() if now is None else now
+        return sum(
+            len(sentences) - bisect_right(sentences, (int(now), float("inf")))
+            for sentences in self._sentences.values()
+        )
+
+    def jailed_members(self, guild_id: int, now: Optional[float] = None) -> List[Sentence]:
+        """Get a guild's active sentences as (jail_until, member_id), soonest release first."""
+        now = time.time() if now is None else now
+        sentences = self._sentences.get(guild_id, [])
+        return sentences[bisect_right(sentences, (int(now), float("inf"))):]
+
+    def expire_due(self, now: Optional[float] = None) -> List[Tuple[int, int]]:
+        """Drop every sentence that has ended and return them as (guild_id, member_id)."""
+        now = time.time() if now is None else now
+        expired: List[Tuple[int, int]] = []
+        for guild_id, sentences in self._sentences.items():
+            end = bisect_right(sentences, (int(now), float("inf")))
+            for _until, member_id in sentences[:end]:
+                del self._until[(guild_id, member_id)]
+                expired.append((guild_id, member_id))
+            del sentences[:end]
+        return expired
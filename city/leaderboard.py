@@ -0,0 +1,141 @@
+"""Per-guild top-K index for the crime leaderboard.
+
+Every leaderboard category ranks members by a stat counter (or the sum of two)
+that only ever grows. That makes a small top-K list per category enough: a
+member outside the top K can only get in by raising their own score, which the
+index sees through the member cache's change listener. Anything that can lower
+a score (wipes, data deletion) marks the guild stale, and the next read
+rebuilds it from Config.
+
+Only members still in the guild are ranked. A member leaving while in a top-K
+list marks the guild stale too, so the members behind them move up.
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import discord
+from redbot.core import Config
+
+
+# Category -> stat fields whose sum is the ranking score
+LEADERBOARD_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "earnings": ("total_credits_earned",),
+    "crimes": ("total_successful_crimes", "total_failed_crimes"),
+    "stolen": ("total_stolen_from", "total_stolen_by"),
+    "largest_heist": ("largest_heist",),
+    "fines": ("total_fines_paid", "total_bail_paid"),
+    "streaks": ("highest_streak",),
+}
+
+# (score, member_id, field values)
+Entry = Tuple[int, int, Tuple[int, ...]]
+
+
+def _entry(fields: Tuple[str, ...], member_id: int, data: Dict[str, Any]) -> Entry:
+    values = tuple(data.get(field, 0) or 0 for field in fields)
+    return sum(values), member_id, values
+
+
+def _rank_key(entry: Entry) -> Tuple[int, int]:
+    # Highest score first, ties broken by member ID so order is stable
+    return -entry[0], entry[1]
+
+
+class CrimeLeaderboardIndex:
+    """Top-K members per leaderboard category, kept per guild.
+
+    Attributes
+    ----------
+    size: int
+        How many members are kept per category. Kept larger than what is
+        displayed so members who left the guild can be skipped.
+    """
+
+    def __init__(self, size: int = 10) -> None:
+        self.size = size
+        # guild_id -> category -> entries sorted best first
+        self._guilds: Dict[int, Dict[str, List[Entry]]] = {}
+
+    def is_built(self, guild_id: int) -> bool:
+        """Check if a guild's index is loaded and current."""
+        return guild_id in self._guilds
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Mark one guild, or every guild, for a rebuild on next read."""
+        if guild_id is None:
+            self._guilds.clear()
+        else:
+            self._guilds.pop(guild_id, None)
+
+    def member_left(self, guild_id: int, member_id: int) -> None:
+        """Mark a guild stale if a member who left holds a ranked spot."""
+        categories = self._guilds.get(guild_id)
+        if categories is None:
+            return
+        if any(entry[1] == member_id for entries in categories.values() for entry in entries):
+            self.invalidate(guild_id)
+
+    def update(self, key: Tuple[int, int], data: Dict[str, Any]) -> None:
+        """Apply a member's current stats to a built guild's index.
+
+        Meant to be registered as a MemberStateCache listener.
+        """
+        guild_id, member_id = key
+        categories = self._guilds.get(guild_id)
+        if categories is None:
+            # Not built yet, the rebuild will pick this change up
+            return
+        for category, fields in LEADERBOARD_CATEGORIES.items():
+            entries = categories[category]
+            entry = _entry(fields, member_id, data)
+            for i, existing in enumerate(entries):
+                if existing[1] == member_id:
+                    if existing == entry:
+                        break
+                    entries[i] = entry
+                    entries.sort(key=_rank_key)
+                    break
+            else:
+                if entry[0] <= 0:
+                    continue
+                if len(entries) < self.size or _rank_key(entry) < _rank_key(entries[-1]):
+                    entries.append(entry)
+                    entries.sort(key=_rank_key)
+                    del entries[self.size:]
+
+    def build(self, guild_id: int, members: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """Rebuild a guild's index from every member's data."""
+        members = list(members)
+        categories: Dict[str, List[Entry]] = {}
+        for category, fields in LEADERBOARD_CATEGORIES.items():
+            entries = (_entry(fields, member_id, data) for member_id, data in members)
+            categories[category] = heapq.nsmallest(
+                self.size,
+                (e for e in entries if e[0] > 0),
+                key=_rank_key,
+            )
+        self._guilds[guild_id] = categories
+
+    async def ensure_built(self, config: Config, guild: discord.Guild, member_cache) -> None:
+        """Build a guild's index from Config if it isn't loaded.
+
+        Cached member data is newer than what Config holds, so it replaces the
+        stored copy of those members. Members who left the guild are skipped.
+        """
+        if self.is_built(guild.id):
+            return
+        members = await config.all_members(guild)
+        members.update(member_cache.cached_members(guild.id))
+        self.build(
+            guild.id,
+            ((member_id, data) for member_id, data in members.items() if guild.get_member(member_id) is not None),
+        )
+
+    def top(self, guild_id: int, category: str) -> List[Tuple[int, Dict[str, int]]]:
+        """Get the ranked members of a category as (member_id, {field: value})."""
+        fields = LEADERBOARD_CATEGORIES[category]
+        return [
+            (member_id, dict(zip(fields, values)))
+            for _score, member_id, values in self._guilds.get(guild_id, {}).get(category, [])
+        ]
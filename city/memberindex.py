@@ -0,0 +1,194 @@
+"""Per-guild name index for resolving typed crime targets.
+
+Looking a member up by name used to scan every guild member and lowercase
+their names on each attempt. The index keeps the lowercased names once and
+answers lookups through hash tables instead:
+
+- Exact matches on username or display name come from one dict lookup.
+- Partial matches of three or more characters intersect the trigram posting
+  lists of the query, then confirm the substring on the few candidates left.
+- Shorter partial queries can't use trigrams, so they match name prefixes from
+  a sorted list instead.
+
+Guilds are indexed on their first lookup and kept current by the cog's member
+join, leave and update listeners.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set, Tuple
+
+import discord
+
+TRIGRAM = 3
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + TRIGRAM] for i in range(len(text) - TRIGRAM + 1)}
+
+
+class GuildNameIndex:
+    """Lowercased member names of a single guild."""
+
+    def __init__(self) -> None:
+        # member_id -> (name, display_name), both lowercased
+        self.names: Dict[int, Tuple[str, str]] = {}
+        self._exact: Dict[str, Set[int]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        # (name, member_id) for every username and display name, sorted
+        self._sorted: List[Tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_members(cls, members: Iterable[discord.Member]) -> "GuildNameIndex":
+        """Index a whole member list, sorting the prefix list once at the end."""
+        index = cls()
+        for member in members:
+            index._index(member.id, (member.name.lower(), member.display_name.lower()), keep_sorted=False)
+        index._sorted.sort()
+        return index
+
+    def _index(self, member_id: int, names: Tuple[str, str], keep_sorted: bool = True) -> None:
+        self.names[member_id] = names
+        for name in set(names):
+            self._exact.setdefault(name, set()).add(member_id)
+            for gram in _trigrams(name):
+                self._trigrams.setdefault(gram, set()).add(member_id)
+            if keep_sorted:
+                insort(self._sorted, (name, member_id))
+            else:
+                self._sorted.append((name, member_id))
+
+    def add(self, member: discord.Member) -> None:
+        """Index a member, replacing their previous names if they changed."""
+        names = (member.name.lower(), member.display_name.lower())
+        if self.names.get(member.id) == names:
+            return
+        self.remove(member.id)
+        self._index(member.id, names)
+
+    def remove(self, member_id: int) -> None:
+        """Drop a member from the index."""
+        names = self.names.pop(member_id, None)
+        if names is None:
+            return
+        for name in set(names):
+            self._discard(self._exact, name, member_id)
+            for gram in _trigrams(name):
+                self._discard(self._trigrams, gram, member_id)
+            index = bisect_left(self._sorted, (name, member_id))
+            if index < len(self._sorted) and self._sorted[index] == (name, member_id):
+                del self._sorted[index]
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[int]], key: str, member_id: int) -> None:
+        members = postings.get(key)
+        if members is not None:
+            members.discard(member_id)
+            if not members:
+                del postings[key]
+
+    def exact(self, query: str) -> Set[int]:
+        """Members whose username or display name equals ``query``."""
+        matches = set(self._exact.get(query, ()))
+        if query.isdigit() and int(query) in self.names:
+            matches.add(int(query))
+        return matches
+
+    def partial(self, query: str, limit: int) -> List[int]:
+        """Up to ``limit`` members whose names contain (or, for short queries, start with) ``query``."""
+        if len(query) < TRIGRAM:
+            return self._prefix(query, limit)
+
+        # Start from the rarest trigram so the intersection stays small
+        postings = sorted((self._trigrams.get(gram, set()) for gram in _trigrams(query)), key=len)
+        candidates = set(postings[0])
+        for members in postings[1:]:
+            candidates &= members
+            if not candidates:
+                return []
+
+        matches = []
+        for member_id in sorted(candidates):
+            name, display_name = self.names[member_id]
+            if query in name or query in display_name:
+                matches.append(member_id)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def _prefix(self, query: str, limit: int) -> List[int]:
+        matches: List[int] = []
+        index = bisect_left(self._sorted, (query, 0))
+        while index < len(self._sorted) and len(matches) < limit:
+            name, member_id = self._sorted[index]
+            if not name.startswith(query):
+                break
+            if member_id not in matches:
+                matches.append(member_id)
+            index += 1
+        return matches
+
+
+class MemberNameIndex:
+    """Name indexes for every guild that has been searched."""
+
+    def __init__(self) -> None:
+        self._guilds: Dict[int, GuildNameIndex] = {}
+
+    def guild(self, guild: discord.Guild) -> GuildNameIndex:
+        """Get a guild's index, building it from the member list on first use."""
+        index = self._guilds.get(guild.id)
+        if index is None:
+            index = GuildNameIndex.from_members(guild.members)
+            self._guilds[guild.id] = index
+        return index
+
+    def add(self, member: discord.Member) -> None:
+        """Index a joined or renamed member of an indexed guild."""
+        index = self._guilds.get(member.guild.id)
+        if index is not None:
+            index.add(member)
+
+    def remove(self, guild_id: int, member_id: int) -> None:
+        """Drop a member who left an indexed guild."""
+        index = self._guilds.get(guild_id)
+        if index is not None:
+            index.remove(member_id)
+
+    def forget(self, guild_id: int) -> None:
+        """Drop a guild's index, e.g. when the bot leaves it."""
+        self._guilds.pop(guild_id, None)
+
+    def search(
+        self, guild: discord.Guild, query: str, limit: int = 10
+    ) -> Tuple[List[discord.Member], List[discord.Member]]:
+        """Find members for a typed target.
+
+        Parameters
+        ----------
+        guild: discord.Guild
+            The guild to search
+        query: str
+            Username, display name or ID, matched case-insensitively
+        limit: int
+            Most partial matches returned
+
+        Returns
+        -------
+        Tuple[List[discord.Member], List[discord.Member]]
+            Exact matches, and partial matches (only looked up when there are
+            no exact ones)
+        """
+        index = self.guild(guild)
+        query = query.lower()
+        exact = self._members(guild, sorted(index.exact(query)))
+        if exact:
+            return exact, []
+        return [], self._members(guild, index.partial(query, limit))
+
+    @staticmethod
+    def _members(guild: discord.Guild, member_ids: Iterable[int]) -> List[discord.Member]:
+        members = (guild.get_member(member_id) for member_id in member_ids)
+        return [member for member in members if member is not None]
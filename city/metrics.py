@@ -0,0 +1,241 @@
+"""Counters and gauges in the Prometheus text format.
+
+Metrics are registered once, at import or cog load, on :data:`METRICS`:
+
+- A :class:`Counter` only goes up. ``inc`` is a single dict update, cheap
+  enough to call on every crime or payout.
+- A :class:`Gauge` is either set directly or, more usually here, given a
+  function that reads the value (``len(self.active_drops)``, say) when the
+  metrics are collected, so keeping it current costs nothing at all.
+
+:meth:`MetricsRegistry.render` produces the text exposition format, which a
+:class:`MetricsServer` serves on ``/metrics``. The server is off unless an
+owner turns it on, and it binds to localhost by default. It uses aiohttp,
+which is imported only when the server starts.
+
+LootDrop has no registry of its own. While City is loaded, LootDrop registers
+its counters and gauges on City's, so one endpoint serves both cogs.
+"""
+
+import logging
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+log = logging.getLogger("red.city.metrics")
+
+LabelValues = Tuple[str, ...]
+
+# Where the exposition server listens unless told otherwise
+DEFAULT_HOST = "127.0.0.1"
+
+# Text exposition format version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """A named family of values, one per combination of label values.
+
+    Attributes
+    ----------
+    name: str
+        Metric name, e.g. ``city_crimes_attempted_total``
+    help: str
+        One line description
+    labelnames: Tuple[str, ...]
+        Names of the labels every value carries
+    """
+
+    type_name = "untyped"
+
+    __slots__ = ("name", "help", "labelnames", "_values")
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def samples(self) -> Iterable[Tuple[LabelValues, float]]:
+        return list(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.help)}", f"# TYPE {self.name} {self.type_name}"]
+        for labels, value in self.samples():
+            if labels:
+                pairs = ",".join(f'{name}="{_escape(str(label))}"' for name, label in zip(self.labelnames, labels))
+                lines.append(f"{self.name}{{{pairs}}} {_format_value(value)}")
+            else:
+                lines.append(f"{self.name} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    type_name = "counter"
+
+    __slots__ = ()
+
+    def inc(self, amount: float = 1, labels: LabelValues = ()) -> None:
+        """Add ``amount``, for the values of this counter's labels in order."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that can go up and down, or is read when collected."""
+
+    type_name = "gauge"
+
+    __slots__ = ("function",)
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.function = function
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[Tuple[LabelValues, float]]:
+        if self.function is None:
+            return super().samples()
+        try:
+            return [((), float(self.function()))]
+        except Exception:
+            log.exception("Failed to read gauge %s", self.name)
+            return []
+
+
+class MetricsRegistry:
+    """Every metric a cog reports, by name."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def __iter__(self):
+        return iter(self._metrics.values())
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None and type(existing) is type(metric):
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get a counter, creating it on first use."""
+        return self._register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        """Get a gauge, creating it on first use.
+
+        A ``function`` replaces the one a gauge of the same name had, so a
+        reloaded cog's gauges read the new cog instead of the old one.
+        """
+        gauge: Gauge = self._register(Gauge(name, help, labelnames, function))  # type: ignore[assignment]
+        if function is not None:
+            gauge.function = function
+        return gauge
+
+    def unset(self, *names: str) -> None:
+        """Stop reading the given function gauges, e.g. when their cog unloads."""
+        for name in names:
+            metric = self._metrics.get(name)
+            if isinstance(metric, Gauge):
+                metric.function = lambda: 0
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves registries on ``http://host:port/metrics``.
+
+    Attributes
+    ----------
+    registries: Callable[[], Iterable[MetricsRegistry]]
+        Returns the registries to render, asked on every scrape
+    """
+
+    def __init__(self, registries: Callable[[], Iterable[MetricsRegistry]]) -> None:
+        self.registries = registries
+        self.host: Optional[str] = None
+        self.port: Optional[int] = None
+        self._runner: Any = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    def render(self) -> str:
+        return "".join(registry.render() for registry in self.registries())
+
+    async def start(self, port: int, host: str = DEFAULT_HOST) -> None:
+        """Start serving, replacing a server that is already running.
+
+        Raises
+        ------
+        RuntimeError
+            If aiohttp isn't installed
+        OSError
+            If the port can't be bound
+        """
+        try:
+            from aiohttp import web
+        except ImportError as e:
+            raise RuntimeError("The metrics server needs aiohttp installed") from e
+
+        await self.stop()
+
+        async def metrics(request: Any) -> Any:
+            return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+        app = web.Application()
+        app.router.add_get("/metrics", metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except Exception:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        self.host, self.port = host, port
+        log.info("Serving metrics on http://%s:%s/metrics", host, port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            runner, self._runner = self._runner, None
+            await runner.cleanup()
+            self.host = self.port = None
+
+
+# The registry every part of the cog reports to
+METRICS = MetricsRegistry()
@@ -0,0 +1,203 @@
+"""Durable scheduler for jail release notifications.
+
+Pending notifications are a time-ordered queue of
+``(release_at, guild_id, member_id, channel_id)``. The queue lives in memory
+as a min-heap and is mirrored to Config, so notifications survive reloads and
+restarts:
+
+- One runner task sleeps until the earliest release and drains every entry
+  that is due in one batch, instead of one sleeping task per jailed member.
+- Each member has at most one live entry. Rescheduling (a longer sentence) or
+  cancelling (bail, jailbreak) doesn't search the heap: the member's current
+  entry is kept in a dict and stale heap entries are dropped when they reach
+  the top.
+- The queue is rehydrated from Config when the cog loads. Entries that came
+  due while the bot was offline are sent on the first drain.
+- Entries are removed from Config only after the callback has handled them.
+  A batch whose callback fails is retried with a growing backoff, and one
+  interrupted by a shutdown is sent again after the next load.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from redbot.core import Config
+
+
+log = logging.getLogger("red.city.notifications")
+
+MemberKey = Tuple[int, int]  # (guild_id, member_id)
+
+# Seconds before a failed batch is retried, doubled per consecutive failure
+RETRY_DELAY = 30
+RETRY_DELAY_MAX = 30 * 60
+
+
+class ReleaseEntry(NamedTuple):
+    """A pending release notification."""
+
+    release_at: int
+    guild_id: int
+    member_id: int
+    channel_id: Optional[int]
+
+
+def _storage_key(guild_id: int, member_id: int) -> str:
+    return f"{guild_id}:{member_id}"
+
+
+class ReleaseScheduler:
+    """Sends release notifications when jail sentences end.
+
+    Attributes
+    ----------
+    config: Config
+        The cog's Config; pending entries are stored under the global
+        ``release_queue`` value
+    callback: Callable[[List[ReleaseEntry]], Awaitable[None]]
+        Called with every entry that came due in one drain
+    batch_size: int
+        Most entries handed to the callback per call
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        callback: Callable[[List[ReleaseEntry]], Awaitable[None]],
+        batch_size: int = 50,
+    ) -> None:
+        self.config = config
+        self.callback = callback
+        self.batch_size = batch_size
+        self._heap: List[Tuple[int, int, int]] = []
+        self._entries: Dict[MemberKey, ReleaseEntry] = {}
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._failures = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, guild_id: int, member_id: int) -> Optional[ReleaseEntry]:
+        """Get a member's pending notification, if any."""
+        return self._entries.get((guild_id, member_id))
+
+    def _push(self, entry: ReleaseEntry) -> None:
+        self._entries[(entry.guild_id, entry.member_id)] = entry
+        heapq.heappush(self._heap, (entry.release_at, entry.guild_id, entry.member_id))
+
+    async def load(self) -> None:
+        """Rebuild the queue from Config."""
+        stored = await self.config.release_queue()
+        self._heap.clear()
+        self._entries.clear()
+        for key, (release_at, channel_id) in stored.items():
+            guild_id, member_id = (int(part) for part in key.split(":"))
+            self._push(ReleaseEntry(int(release_at), guild_id, member_id, channel_id))
+        self._wakeup.set()
+
+    async def schedule(
+        self, guild_id: int, member_id: int, release_at: int, channel_id: Optional[int] = None
+    ) -> None:
+        """Schedule or move a member's release notification.
+
+        Parameters
+        ----------
+        guild_id: int
+            The member's guild
+        member_id: int
+            The jailed member
+        release_at: int
+            Unix timestamp the sentence ends at
+        channel_id: Optional[int]
+            Channel or thread to notify in, falls back to a DM when missing
+        """
+        entry = ReleaseEntry(int(release_at), guild_id, member_id, channel_id)
+        self._push(entry)
+        self._wakeup.set()
+        await self.config.release_queue.set_raw(
+            _storage_key(guild_id, member_id), value=[entry.release_at, channel_id]
+        )
+
+    async def extend(self, guild_id: int, member_id: int, seconds: int) -> None:
+        """Push a pending notification back by ``seconds``, if there is one."""
+        entry = self.get(guild_id, member_id)
+        if entry is not None:
+            await self.schedule(guild_id, member_id, entry.release_at + seconds, entry.channel_id)
+
+    async def cancel(self, guild_id: int, member_id: int) -> None:
+        """Drop a member's pending notification, if there is one."""
+        if self._entries.pop((guild_id, member_id), None) is None:
+            return
+        await self.config.release_queue.clear_raw(_storage_key(guild_id, member_id))
+
+    async def clear(self) -> None:
+        """Drop every pending notification."""
+        self._heap.clear()
+        self._entries.clear()
+        await self.config.release_queue.clear()
+
+    def _pop_due(self, now: float) -> List[ReleaseEntry]:
+        """Remove and return up to ``batch_size`` due entries."""
+        due: List[ReleaseEntry] = []
+        while self._heap and len(due) < self.batch_size:
+            release_at, guild_id, member_id = self._heap[0]
+            entry = self._entries.get((guild_id, member_id))
+            if entry is None or entry.release_at != release_at:
+                # Cancelled or rescheduled since this was pushed
+                heapq.heappop(self._heap)
+                continue
+            if release_at > now:
+                break
+            heapq.heappop(self._heap)
+            del self._entries[(guild_id, member_id)]
+            due.append(entry)
+        return due
+
+    async def _drain(self) -> None:
+        """Hand every due entry to the callback, one batch at a time."""
+        while True:
+            batch = self._pop_due(time.time())
+            if not batch:
+                return
+            try:
+                await self.callback(batch)
+            except Exception:
+                self._failures += 1
+                delay = min(RETRY_DELAY * 2 ** (self._failures - 1), RETRY_DELAY_MAX)
+                log.exception("Failed to send %s release notifications, retrying in %ss", len(batch), delay)
+                retry_at = int(time.time()) + delay
+                for entry in batch:
+                    # Unless the member was rescheduled while the callback ran
+                    if (entry.guild_id, entry.member_id) not in self._entries:
+                        self._push(entry._replace(release_at=retry_at))
+                continue
+            self._failures = 0
+            # Members rescheduled while the callback ran keep their new entry
+            for entry in batch:
+                if (entry.guild_id, entry.member_id) not in self._entries:
+                    await self.config.release_queue.clear_raw(_storage_key(entry.guild_id, entry.member_id))
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            await self._drain()
+            timeout = max(0, self._heap[0][0] - time.time()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start the runner task."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the runner. Pending entries stay stored for the next load."""
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
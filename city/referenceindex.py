@@ -0,0 +1,118 @@
+"""In-memory index of where a user appears in City member data.
+
+Deleting a user's data used to mean scanning ``all_members()`` of every guild,
+once to find their own records and once more for every member whose
+``last_target`` points at them, and then writing those members one by one.
+The index answers both questions from memory:
+
+- which guilds hold a record for a user, and
+- which members, per guild, have that user as their ``last_target``.
+
+Like :class:`~city.jailindex.JailIndex`, it is loaded from Config once and
+then follows the member cache's change listener, so crimes that set a
+``last_target`` keep it current without any call site updating it.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set, Tuple
+
+from redbot.core import Config
+
+
+MemberKey = Tuple[int, int]  # (guild_id, member_id)
+
+
+class ReferenceIndex:
+    """Reverse lookups from a user ID to the member data that mentions it."""
+
+    def __init__(self) -> None:
+        self._guilds: Dict[int, Set[int]] = {}
+        self._targets: Dict[MemberKey, int] = {}
+        self._referrers: Dict[int, Dict[int, Set[int]]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    async def ensure_loaded(self, config: Config, member_cache) -> None:
+        """Load every member record and ``last_target`` from Config, once.
+
+        Cached member data is newer than what Config holds, so it replaces
+        the stored copy of those members.
+        """
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            all_members = await config.all_members()
+            for guild_id, members in all_members.items():
+                members.update(member_cache.cached_members(guild_id))
+                for member_id, data in members.items():
+                    self.set(guild_id, member_id, data.get("last_target"))
+            self._loaded = True
+
+    def clear(self) -> None:
+        """Forget everything and reload on next use."""
+        self._guilds.clear()
+        self._targets.clear()
+        self._referrers.clear()
+        self._loaded = False
+
+    def set(self, guild_id: int, member_id: int, last_target: Optional[int]) -> None:
+        """Record that a member has data in a guild, and who they last targeted."""
+        self._guilds.setdefault(member_id, set()).add(guild_id)
+        key = (guild_id, member_id)
+        current = self._targets.get(key)
+        if current == last_target:
+            return
+        if current is not None:
+            self._unlink(guild_id, member_id, current)
+            del self._targets[key]
+        if last_target is not None:
+            self._referrers.setdefault(last_target, {}).setdefault(guild_id, set()).add(member_id)
+            self._targets[key] = last_target
+
+    def _unlink(self, guild_id: int, member_id: int, target_id: int) -> None:
+        guilds = self._referrers.get(target_id)
+        if guilds is None:
+            return
+        members = guilds.get(guild_id)
+        if members is not None:
+            members.discard(member_id)
+            if not members:
+                del guilds[guild_id]
+        if not guilds:
+            del self._referrers[target_id]
+
+    def update(self, key: MemberKey, data: Dict[str, Any]) -> None:
+        """Follow member data changes. Meant as a MemberStateCache listener."""
+        if self._loaded:
+            self.set(key[0], key[1], data.get("last_target"))
+
+    def guilds_of(self, user_id: int) -> Set[int]:
+        """Get the IDs of the guilds that hold a record for a user."""
+        return set(self._guilds.get(user_id, ()))
+
+    def referrers(self, user_id: int) -> Dict[int, Set[int]]:
+        """Get the members whose ``last_target`` is a user, as guild ID -> member IDs."""
+        return {guild_id: set(members) for guild_id, members in self._referrers.get(user_id, {}).items()}
+
+    def forget_target(self, user_id: int) -> None:
+        """Drop every reference to a user, after they were cleared from Config."""
+        for guild_id, members in self._referrers.pop(user_id, {}).items():
+            for member_id in members:
+                self._targets.pop((guild_id, member_id), None)
+
+    def forget_member(self, guild_id: int, member_id: int) -> None:
+        """Drop a member's record in a guild, after it was cleared from Config."""
+        guilds = self._guilds.get(member_id)
+        if guilds is not None:
+            guilds.discard(guild_id)
+            if not guilds:
+                del self._guilds[member_id]
+        target_id = self._targets.pop((guild_id, member_id), None)
+        if target_id is not None:
+            self._unlink(guild_id, member_id, target_id)
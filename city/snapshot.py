@@ -0,0 +1,106 @@
+"""Point-in-time view of a member's City state.
+
+A snapshot is loaded once per interaction and passed down the crime pipeline,
+so jail, cooldown and perk checks become plain functions of data already in
+memory instead of separate Config reads.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import discord
+
+
+class MemberSnapshot:
+    """A member's jail state, cooldowns, perks and streak plus guild settings.
+
+    Attributes
+    ----------
+    member_id: int
+        ID of the member the snapshot belongs to
+    guild_id: int
+        ID of the guild the snapshot belongs to
+    jail_until: int
+        Unix timestamp when the jail sentence ends, 0 if not jailed
+    attempted_jailbreak: bool
+        Whether a jailbreak was already attempted this sentence
+    last_actions: Dict[str, int]
+        Action type -> timestamp of the last attempt
+    purchased_perks: FrozenSet[str]
+        Permanent perks the member owns
+    current_streak: int
+        Current crime streak
+    streak_multiplier: float
+        Reward multiplier for the current streak
+    last_target: Optional[int]
+        ID of the last targeted member
+    settings: Dict[str, Any]
+        The guild's global_settings
+    crime_options: Dict[str, Dict[str, Any]]
+        The guild's crime_options
+    taken_at: int
+        Unix timestamp the snapshot was taken at, used as "now" by default
+    """
+
+    __slots__ = (
+        "member_id",
+        "guild_id",
+        "jail_until",
+        "attempted_jailbreak",
+        "last_actions",
+        "purchased_perks",
+        "current_streak",
+        "streak_multiplier",
+        "last_target",
+        "settings",
+        "crime_options",
+        "taken_at",
+    )
+
+    def __init__(
+        self,
+        member: discord.Member,
+        member_data: Dict[str, Any],
+        guild_data: Dict[str, Any],
+        now: Optional[int] = None,
+    ) -> None:
+        self.member_id = member.id
+        self.guild_id = member.guild.id
+        self.jail_until = member_data.get("jail_until", 0) or 0
+        self.attempted_jailbreak = member_data.get("attempted_jailbreak", False)
+        self.last_actions = dict(member_data.get("last_actions", {}))
+        self.purchased_perks = frozenset(member_data.get("purchased_perks", []))
+        self.current_streak = member_data.get("current_streak", 0)
+        self.streak_multiplier = member_data.get("streak_multiplier", 1.0)
+        self.last_target = member_data.get("last_target")
+        self.settings = guild_data.get("global_settings", {})
+        self.crime_options = guild_data.get("crime_options", {})
+        self.taken_at = int(time.time()) if now is None else now
+
+    def jail_remaining(self, now: Optional[int] = None) -> int:
+        """Get remaining jail time in seconds."""
+        if not self.jail_until:
+            return 0
+        now = self.taken_at if now is None else now
+        return max(0, self.jail_until - now)
+
+    def is_jailed(self, now: Optional[int] = None) -> bool:
+        """Check if the member is jailed."""
+        return self.jail_remaining(now) > 0
+
+    def cooldown_remaining(self, action_type: str, now: Optional[int] = None) -> int:
+        """Get remaining cooldown in seconds for an action."""
+        last_attempt = self.last_actions.get(action_type, 0)
+        if not last_attempt or action_type not in self.crime_options:
+            return 0
+        now = self.taken_at if now is None else now
+        cooldown = self.crime_options[action_type]["cooldown"]
+        return max(0, cooldown - (now - last_attempt))
+
+    def has_perk(self, perk: str) -> bool:
+        """Check if the member owns a perk."""
+        return perk in self.purchased_perks
+
+    def is_last_target(self, target_id: int) -> bool:
+        """Check if a member was the last one targeted."""
+        return self.last_target is not None and self.last_target == target_id
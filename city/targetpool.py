@@ -0,0 +1,223 @@
+"""Per-guild pools of members that can be picked as random crime targets.
+
+Picking a random target used to shuffle the whole member list and then check
+jail status and balance member by member, which cost a Config read per member.
+The pool keeps the members who are currently worth drawing instead:
+
+- Bots and administrators are never added.
+- Jailed members are benched until their sentence ends. Jail changes arrive
+  through the member cache's change listener, so bail and jailbreaks put
+  members straight back.
+- Members seen with less than the guild's minimum steal balance are benched
+  for :data:`BROKE_RECHECK` seconds. Red's bank doesn't announce balance
+  changes, so deposits made by this cog bring members back early and anything
+  else is picked up by the recheck.
+
+Draws are O(1): members live in a list with a position map so removal is a
+swap with the last element. A drawn member still gets a live balance check
+before being used, so a stale pool can only cost an extra draw.
+"""
+
+import heapq
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+from redbot.core import Config
+
+# Seconds a member below the minimum steal balance stays out of the pool
+BROKE_RECHECK = 300
+
+
+def is_pool_eligible(member: discord.Member) -> bool:
+    """Check the member-level rules that never depend on Config or the bank."""
+    return not member.bot and not member.guild_permissions.administrator
+
+
+class GuildTargetPool:
+    """Targetable members of a single guild.
+
+    Attributes
+    ----------
+    min_balance: int
+        The guild's ``min_steal_balance`` as of the last draw
+    """
+
+    def __init__(self, min_balance: int = 0) -> None:
+        self.min_balance = min_balance
+        self._members: List[int] = []
+        self._positions: Dict[int, int] = {}
+        # member_id -> (return_at, jailed)
+        self._benched: Dict[int, Tuple[float, bool]] = {}
+        self._returns: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self._positions
+
+    def _insert(self, member_id: int) -> None:
+        if member_id not in self._positions:
+            self._positions[member_id] = len(self._members)
+            self._members.append(member_id)
+
+    def _take(self, member_id: int) -> None:
+        position = self._positions.pop(member_id, None)
+        if position is None:
+            return
+        last = self._members.pop()
+        if last != member_id:
+            self._members[position] = last
+            self._positions[last] = position
+
+    def add(self, member_id: int) -> None:
+        """Add a member, unless they're benched."""
+        if member_id not in self._benched:
+            self._insert(member_id)
+
+    def remove(self, member_id: int) -> None:
+        """Remove a member for good, e.g. when they leave or become an admin."""
+        self._take(member_id)
+        self._benched.pop(member_id, None)
+
+    def bench(self, member_id: int, until: float, jailed: bool = False) -> None:
+        """Take a member out of the pool until ``until``."""
+        self._take(member_id)
+        self._benched[member_id] = (until, jailed)
+        heapq.heappush(self._returns, (until, member_id))
+
+    def restore(self, member_id: int, jailed: bool = False) -> None:
+        """Put a benched member back early.
+
+        Only members benched for the given reason are restored, so a deposit
+        can't let a jailed member back in.
+        """
+        benched = self._benched.get(member_id)
+        if benched is not None and benched[1] == jailed:
+            del self._benched[member_id]
+            self._insert(member_id)
+
+    def _restore_due(self, now: float) -> None:
+        while self._returns and self._returns[0][0] <= now:
+            until, member_id = heapq.heappop(self._returns)
+            benched = self._benched.get(member_id)
+            if benched is not None and benched[0] == until:
+                del self._benched[member_id]
+                self._insert(member_id)
+
+    def set_jail(self, member_id: int, jail_until: int) -> None:
+        """Bench a member for their sentence, or restore them once it's cleared."""
+        benched = self._benched.get(member_id)
+        if jail_until > time.time():
+            # Members who aren't pooled (bots, admins) stay out
+            if benched != (jail_until, True) and (member_id in self._positions or benched is not None):
+                self.bench(member_id, jail_until, jailed=True)
+        elif benched is not None and benched[1]:
+            self.restore(member_id, jailed=True)
+
+    def note_balance(self, member_id: int, balance: int) -> None:
+        """Bench or restore a member based on a balance the cog just saw."""
+        if balance < self.min_balance:
+            if member_id in self._positions:
+                self.bench(member_id, time.time() + BROKE_RECHECK)
+        else:
+            self.restore(member_id)
+
+    def sample(self, exclude: Set[int], rng: random.Random = random) -> Optional[int]:
+        """Draw a random member that isn't in ``exclude``, or None if there's none."""
+        self._restore_due(time.time())
+        available = len(self._members) - sum(1 for member_id in exclude if member_id in self._positions)
+        if available <= 0:
+            return None
+        while True:
+            member_id = self._members[rng.randrange(len(self._members))]
+            if member_id not in exclude:
+                return member_id
+
+
+class TargetPool:
+    """Target pools for every guild that has drawn a random target."""
+
+    def __init__(self) -> None:
+        self._guilds: Dict[int, GuildTargetPool] = {}
+
+    def get(self, guild_id: int) -> Optional[GuildTargetPool]:
+        """Get a guild's pool if it has been built."""
+        return self._guilds.get(guild_id)
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Drop one guild's pool, or all of them, to be rebuilt on next draw."""
+        if guild_id is None:
+            self._guilds.clear()
+        else:
+            self._guilds.pop(guild_id, None)
+
+    def build(
+        self,
+        guild_id: int,
+        members: Iterable[discord.Member],
+        jail_until: Dict[int, int],
+        min_balance: int,
+    ) -> GuildTargetPool:
+        """Build a guild's pool from its members and their jail sentences."""
+        pool = GuildTargetPool(min_balance)
+        now = time.time()
+        for member in members:
+            if not is_pool_eligible(member):
+                continue
+            until = jail_until.get(member.id, 0)
+            if until > now:
+                pool.bench(member.id, until, jailed=True)
+            else:
+                pool.add(member.id)
+        self._guilds[guild_id] = pool
+        return pool
+
+    async def ensure_built(
+        self, jail_index, config: Config, guild: discord.Guild, member_cache, min_balance: int
+    ) -> GuildTargetPool:
+        """Get a guild's pool, building it from the jail index if needed."""
+        pool = self._guilds.get(guild.id)
+        if pool is None:
+            await jail_index.ensure_loaded(config, member_cache)
+            jail_until = {member_id: until for until, member_id in jail_index.jailed_members(guild.id)}
+            pool = self.build(guild.id, guild.members, jail_until, min_balance)
+        pool.min_balance = min_balance
+        return pool
+
+    def update(self, key: Tuple[int, int], data: Dict[str, Any]) -> None:
+        """Follow jail and release changes. Meant as a MemberStateCache listener."""
+        guild_id, member_id = key
+        pool = self._guilds.get(guild_id)
+        if pool is not None:
+            pool.set_jail(member_id, data.get("jail_until", 0))
+
+    def note_balance(self, member: discord.Member, balance: int) -> None:
+        """Record a balance the cog just saw for a member."""
+        pool = self._guilds.get(member.guild.id)
+        if pool is not None:
+            pool.note_balance(member.id, balance)
+
+    def note_deposit(self, member: discord.Member) -> None:
+        """Bring a member benched for a low balance back after a deposit."""
+        pool = self._guilds.get(member.guild.id)
+        if pool is not None:
+            pool.restore(member.id)
+
+    def member_changed(self, member: discord.Member) -> None:
+        """Add or remove a member after they joined or their roles changed."""
+        pool = self._guilds.get(member.guild.id)
+        if pool is None:
+            return
+        if is_pool_eligible(member):
+            pool.add(member.id)
+        else:
+            pool.remove(member.id)
+
+    def member_left(self, guild_id: int, member_id: int) -> None:
+        """Remove a member who left the guild."""
+        pool = self._guilds.get(guild_id)
+        if pool is not None:
+            pool.remove(member_id)
@@ -0,0 +1,260 @@
+"""Scheduled reveals of crime and jailbreak results.
+
+A crime used to hold its interaction handler for up to half a minute, sleeping
+between the attempt message, each event and the result, and only settled the
+outcome at the end. Outcomes are now rolled and committed as soon as a crime
+is confirmed. What's left to do is presentation, which is described as a
+:class:`RevealTimeline`: steps that each add a line or the final result, a
+fixed delay after the previous one.
+
+A timeline is shown as a single embed. The first step sends it and every
+later step edits it, instead of one message per event that later had to be
+deleted again. That brings a crime from about ten API calls to one create,
+one edit per event and one for the result.
+
+A single :class:`TimelineRunner` plays every timeline. Timelines wait in a
+min-heap keyed on when their next step is due, and one runner task sleeps
+until the earliest of them. A crime waiting to be revealed is then just its
+timeline record, rather than a suspended handler with its views and messages.
+
+The runner also paces each channel. Discord allows about five message
+creates or edits per channel every five seconds, so a channel gets at most
+one reveal call per :data:`CHANNEL_INTERVAL`. A timeline that has to wait
+for its channel doesn't fall behind: once it gets a turn, every step that
+came due in the meantime is folded into one edit.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import discord
+
+from .outbound import Outbox, Priority
+
+log = logging.getLogger("red.city.timeline")
+
+# Seconds between two reveal calls in the same channel
+CHANNEL_INTERVAL = 1.0
+
+
+class RevealStep(NamedTuple):
+    """One change to a reveal, due ``delay`` seconds after the previous one."""
+
+    delay: float
+    line: Optional[str]
+    embed: Optional[discord.Embed]
+    view: Optional[discord.ui.View]
+    after: Optional[Callable[[discord.Message], Any]]
+
+
+class RevealTimeline:
+    """A single embed revealed step by step.
+
+    Lines build up the embed's description. The result embed, once
+    revealed, supplies the title, colour and fields, and its description is
+    added below the lines.
+
+    Attributes
+    ----------
+    channel: discord.abc.Messageable
+        Where the reveal is shown
+    message: Optional[discord.Message]
+        The reveal message, once sent
+    lines: List[str]
+        Lines revealed so far
+    result: Optional[discord.Embed]
+        The result embed, once revealed
+    """
+
+    __slots__ = ("channel", "color", "steps", "message", "lines", "result", "view", "_due")
+
+    def __init__(self, channel: discord.abc.Messageable, color: discord.Color = discord.Color.greyple()) -> None:
+        self.channel = channel
+        self.color = color
+        self.steps: Deque[RevealStep] = deque()
+        self.message: Optional[discord.Message] = None
+        self.lines: List[str] = []
+        self.result: Optional[discord.Embed] = None
+        self.view: Optional[discord.ui.View] = None
+        self._due = 0.0
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def reveal(
+        self,
+        delay: float,
+        line: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+        view: Optional[discord.ui.View] = None,
+        after: Optional[Callable[[discord.Message], Any]] = None,
+    ) -> None:
+        """Queue a step.
+
+        Parameters
+        ----------
+        delay: float
+            Seconds after the previous step, or after the timeline starts
+            playing for the first one
+        line: Optional[str]
+            A line to add to the description
+        embed: Optional[discord.Embed]
+            The result to show
+        view: Optional[discord.ui.View]
+            Components to attach from this step on
+        after: Optional[Callable[[discord.Message], Any]]
+            Called with the message once this step is shown, e.g. to hand it
+            to a view
+        """
+        self.steps.append(RevealStep(delay, line, embed, view, after))
+
+    @property
+    def next_due(self) -> float:
+        """Monotonic time the next step is due at."""
+        return self._due + self.steps[0].delay
+
+    def apply_due(self, now: float) -> List[Callable[[discord.Message], Any]]:
+        """Apply every step due by ``now`` and return their callbacks."""
+        callbacks: List[Callable[[discord.Message], Any]] = []
+        while self.steps and self.next_due <= now:
+            self._due = self.next_due
+            step = self.steps.popleft()
+            if step.line is not None:
+                self.lines.append(step.line)
+            if step.embed is not None:
+                self.result = step.embed
+            if step.view is not None:
+                self.view = step.view
+            if step.after is not None:
+                callbacks.append(step.after)
+        return callbacks
+
+    def render(self) -> discord.Embed:
+        """Build the embed as it stands."""
+        if self.result is None:
+            return discord.Embed(description="\n\n".join(self.lines), color=self.color)
+        embed = self.result.copy()
+        lines = self.lines + [self.result.description] if self.result.description else self.lines
+        embed.description = "\n\n".join(lines)
+        return embed
+
+
+class TimelineRunner:
+    """Plays every pending reveal timeline from one task.
+
+    Attributes
+    ----------
+    outbox: Outbox
+        Sends and edits the reveal messages. Results go out at
+        :attr:`Priority.RESULT`, everything before them as flavor.
+    channel_interval: float
+        Seconds between two reveal calls in the same channel
+    """
+
+    def __init__(self, outbox: Outbox, channel_interval: float = CHANNEL_INTERVAL) -> None:
+        self.outbox = outbox
+        self.channel_interval = channel_interval
+        self._heap: List[Tuple[float, int, RevealTimeline]] = []
+        self._order = itertools.count()
+        self._channel_ready: Dict[int, float] = {}
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        """Number of timelines still playing."""
+        return len(self._heap) + len(self._running)
+
+    def _push(self, due: float, timeline: RevealTimeline) -> None:
+        heapq.heappush(self._heap, (due, next(self._order), timeline))
+        self._wakeup.set()
+
+    def play(self, timeline: RevealTimeline) -> None:
+        """Start revealing a timeline."""
+        if timeline.steps:
+            timeline._due = time.monotonic()
+            self._push(timeline.next_due, timeline)
+            self.start()
+
+    def _pop_due(self, now: float) -> List[RevealTimeline]:
+        """Remove and return every timeline whose turn it is.
+
+        Timelines whose channel was used too recently go back into the heap
+        until the channel is ready.
+        """
+        timelines: List[RevealTimeline] = []
+        waiting: List[Tuple[float, RevealTimeline]] = []
+        while self._heap and self._heap[0][0] <= now:
+            timeline = heapq.heappop(self._heap)[2]
+            channel_id = timeline.channel.id
+            ready = self._channel_ready.get(channel_id, 0.0)
+            if ready > now:
+                waiting.append((ready, timeline))
+                continue
+            self._channel_ready[channel_id] = now + self.channel_interval
+            timelines.append(timeline)
+        for ready, timeline in waiting:
+            heapq.heappush(self._heap, (ready, next(self._order), timeline))
+        if not self._heap:
+            # Nothing left that could be held back
+            self._channel_ready = {
+                channel_id: ready for channel_id, ready in self._channel_ready.items() if ready > now
+            }
+        return timelines
+
+    async def _show(self, timeline: RevealTimeline) -> None:
+        callbacks = timeline.apply_due(time.monotonic())
+        kwargs: Dict[str, Any] = {"embed": timeline.render()}
+        if timeline.view is not None:
+            kwargs["view"] = timeline.view
+        priority = Priority.FLAVOR if timeline.result is None else Priority.RESULT
+        try:
+            if timeline.message is None:
+                timeline.message = await self.outbox.send(timeline.channel, priority=priority, **kwargs)
+            else:
+                await self.outbox.edit(timeline.message, priority=priority, **kwargs)
+            for callback in callbacks:
+                callback(timeline.message)
+        except discord.HTTPException:
+            log.exception("Failed to show a reveal step")
+        except Exception:
+            log.exception("Reveal step failed")
+        # The next step waits for this call, so a slow one can't reorder them
+        if timeline.steps:
+            self._push(max(timeline.next_due, time.monotonic()), timeline)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            for timeline in self._pop_due(time.monotonic()):
+                task = asyncio.create_task(self._show(timeline))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start the runner task."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the runner and drop every unrevealed step."""
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        for task in self._running:
+            task.cancel()
+        self._running.clear()
+        self._heap.clear()
+        self._channel_ready.clear()
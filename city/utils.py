@@ -84,20 +84,22 @@ async def can_target_user(interaction_or_ctx: Union[discord.Interaction, command
         
     return True, ""
 
-async def calculate_stolen_amount(target: discord.Member, crime_data: dict, settings: dict) -> int:
+async def calculate_stolen_amount(target: discord.Member, crime_data: dict, settings: dict, target_balance: Optional[int] = None) -> int:
     """Calculate how much to steal from the target based on settings.
     
     Args:
         target: The member being stolen from
         crime_data: The crime data containing requirements
         settings: Global settings containing maximum steal amount
+        target_balance: The target's balance if the caller already has it
         
     Returns:
         Amount to steal, or 0 if error
     """
     try:
         # Get target's balance
-        target_balance = await bank.get_balance(target)
+        if target_balance is None:
+            target_balance = await bank.get_balance(target)
         
         # For crimes with steal percentages, calculate based on balance
         if "min_steal_percentage" in crime_data and "max_steal_percentage" in crime_data:
@@ -238,18 +240,18 @@ def calculate_streak_bonus(streak: int) -> float:
     bonus = min(0.25, streak * 0.05)  # Cap at 25% bonus
     return 1.0 + bonus
 
-async def update_streak(config, member: discord.Member, success: bool) -> tuple[int, float]:
+async def update_streak(member_cache, member: discord.Member, success: bool) -> tuple[int, float]:
     """Update a member's crime streak and return new streak and multiplier.
     
     Args:
-        config: The config instance to use for data storage
+        member_cache: The cog's MemberStateCache holding member data
         member (discord.Member): The member to update
         success (bool): Whether the crime was successful
         
     Returns:
         tuple[int, float]: The new streak count and reward multiplier
     """
-    async with config.member(member).all() as member_data:
+    async with member_cache.edit(member) as member_data:
         current_time = int(time.time())
         last_crime = member_data.get("last_crime_time", 0)
         
@@ -0,0 +1,164 @@
+"""Chunked, resumable wipes of a cog's Config data.
+
+Wiping everything used to mean loading ``all_members()`` into memory and
+clearing members one at a time, then every guild. That holds the whole member
+dataset at once, and a restart halfway through left it half wiped with
+nothing to say so.
+
+:class:`ConfigWipe` walks the bot's guilds in ascending ID chunks instead and
+clears each guild's members and settings through Config's public clears,
+without reading them. After every chunk the last guild cleared is saved as a
+checkpoint in global Config, so an interrupted wipe picks up after it, either
+the next time it is started or when the cog loads. What is left afterwards
+belongs to guilds the bot is no longer in and is swept with a scope-wide
+clear, only if there is any, after which the checkpoint is removed.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import discord
+from redbot.core import Config
+
+from .outbound import Outbox
+
+log = logging.getLogger("red.city.wipe")
+
+# Guilds cleared at once between two checkpoints
+WIPE_CHUNK_SIZE = 25
+
+# Seconds between two edits of a wipe's progress message
+PROGRESS_INTERVAL = 2.0
+
+Progress = Callable[[int, int], Awaitable[None]]
+
+
+class WipeResult(NamedTuple):
+    """What a finished wipe cleared."""
+
+    scopes: List[str]
+    guilds: int
+    resumed: bool
+
+
+class ConfigWipe:
+    """Clears Config scopes guild by guild, with a checkpoint after each chunk.
+
+    Attributes
+    ----------
+    config: Config
+        The cog's Config
+    checkpoint: Any
+        The global value the checkpoint is kept in, registered with a
+        default of ``None``
+    chunk_size: int
+        Guilds cleared concurrently between two checkpoints
+    """
+
+    def __init__(self, config: Config, checkpoint: Any, chunk_size: int = WIPE_CHUNK_SIZE) -> None:
+        self.config = config
+        self.checkpoint = checkpoint
+        self.chunk_size = chunk_size
+        self._lock = asyncio.Lock()
+
+    async def pending(self) -> Optional[Dict[str, Any]]:
+        """Get the checkpoint of an unfinished wipe, if there is one."""
+        return await self.checkpoint()
+
+    async def run(
+        self,
+        guilds: Iterable[discord.Guild],
+        scopes: Sequence[str] = (),
+        progress: Optional[Progress] = None,
+    ) -> WipeResult:
+        """Wipe ``scopes`` for every guild, resuming an unfinished wipe first.
+
+        Parameters
+        ----------
+        guilds: Iterable[discord.Guild]
+            The guilds to clear one by one. Anything else in the scopes is
+            cleared by the final sweep.
+        scopes: Sequence[str]
+            ``Config.MEMBER`` and/or ``Config.GUILD``. Empty to only resume
+            the pending wipe.
+        progress: Optional[Progress]
+            Awaited with (guilds done, guilds total) after each chunk
+
+        Returns
+        -------
+        WipeResult
+            The scopes that were cleared, how many guilds were cleared one by
+            one and whether an unfinished wipe was picked up
+        """
+        async with self._lock:
+            pending = await self.checkpoint()
+            cursor: Optional[int] = None
+            resumed = pending is not None
+            wanted = sorted(set(scopes) | set(pending["scopes"] if pending else ()))
+            if pending is not None and wanted == sorted(pending["scopes"]):
+                cursor = pending["cursor"]
+            if not wanted:
+                return WipeResult([], 0, False)
+
+            started = pending["started"] if pending is not None else int(time.time())
+            remaining = sorted(
+                (guild for guild in guilds if cursor is None or guild.id > cursor), key=lambda guild: guild.id
+            )
+            await self.checkpoint.set({"scopes": wanted, "cursor": cursor, "started": started})
+
+            done = 0
+            for start in range(0, len(remaining), self.chunk_size):
+                chunk = remaining[start:start + self.chunk_size]
+                await asyncio.gather(*(self._clear_guild(guild, wanted) for guild in chunk))
+                done += len(chunk)
+                await self.checkpoint.set({"scopes": wanted, "cursor": chunk[-1].id, "started": started})
+                if progress is not None:
+                    await progress(done, len(remaining))
+
+            # Whatever is left belongs to guilds that weren't in the list. Only
+            # their data is read, the bot's guilds are already cleared.
+            if Config.MEMBER in wanted and await self.config.all_members():
+                await self.config.clear_all_members()
+            if Config.GUILD in wanted and await self.config.all_guilds():
+                await self.config.clear_all_guilds()
+            await self.checkpoint.clear()
+            if resumed:
+                log.info("Finished an interrupted wipe of %s", ", ".join(wanted))
+            return WipeResult(wanted, done, resumed)
+
+
+    async def _clear_guild(self, guild: discord.Guild, scopes: Sequence[str]) -> None:
+        if Config.MEMBER in scopes:
+            await self.config.clear_all_members(guild)
+        if Config.GUILD in scopes:
+            await self.config.guild_from_id(guild.id).clear()
+
+
+class WipeProgress:
+    """Edits a status message with a wipe's progress every few seconds.
+
+    Attributes
+    ----------
+    message: discord.Message
+        The status message
+    label: str
+        What is being wiped, shown before the count
+    """
+
+    def __init__(
+        self, outbox: Outbox, message: discord.Message, label: str, interval: float = PROGRESS_INTERVAL
+    ) -> None:
+        self.outbox = outbox
+        self.message = message
+        self.label = label
+        self.interval = interval
+        self._last_edit = 0.0
+
+    async def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done < total and now - self._last_edit < self.interval:
+            return
+        self._last_edit = now
+        await self.outbox.edit(self.message, content=f"⏳ {self.label}... {done:,}/{total:,}")
@@ -1,17 +1,23 @@
 """LootDrop cog for Red-DiscordBot - Drop random loot in channels for users to grab"""
-from typing import Optional, Dict, List, Union, Tuple, Any, cast
+from typing import Optional, Dict, List, NamedTuple, Union, Tuple, Any, cast
 import discord
 from redbot.core import commands, Config, bank
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import box, humanize_list
 import datetime
 import random
-from discord.ext import tasks
 from collections import defaultdict
 import asyncio
+import logging
 from .scenarios import SCENARIOS, Scenario
+from .rankindex import GuildRanking
+from .scheduler import DropScheduler
+from .outbound import Outbox, Priority
+from .perf import PERF, PerfRecorder
 import time
 
+log = logging.getLogger("red.lootdrop")
+
 # Default guild settings
 DEFAULT_GUILD_SETTINGS: Dict[str, Any] = {
     "enabled": False,
@@ -26,7 +32,7 @@ DEFAULT_GUILD_SETTINGS: Dict[str, Any] = {
     "last_drop": 0,
     "next_drop": 0,
     "messages": {"expired": "The opportunity has passed..."},
-    "user_stats": {},  # {user_id: {"good": count, "bad": count}}
+    "user_stats": {},  # Legacy {user_id: stats} blob, migrated to member scope on load
     "streak_bonus": 10,  # Percentage bonus per streak level
     "streak_max": 5,     # Maximum streak multiplier
     "streak_timeout": 24,  # Hours before streak resets
@@ -36,6 +42,33 @@ DEFAULT_GUILD_SETTINGS: Dict[str, Any] = {
     "party_drop_timeout": 30  # Seconds to claim party drop
 }
 
+# Default per-member stats
+DEFAULT_MEMBER_STATS: Dict[str, Any] = {
+    "good": 0,
+    "bad": 0,
+    "streak": 0,
+    "highest_streak": 0,
+    "last_claim": 0
+}
+
+# Bump when stored data needs migrating, see LootDrop._migrate_config
+CONFIG_SCHEMA_VERSION: int = 1
+
+# Max bank deposits or stats writes in flight while settling a party drop
+PARTY_DEPOSIT_CONCURRENCY: int = 10
+
+# Seconds a cached currency name is trusted, bank settings have no change event
+CURRENCY_NAME_TTL: int = 300
+
+# Seconds to wait before retrying a due drop while another drop is still active
+ACTIVE_DROP_RETRY: int = 30
+
+# Counters reported on City's metrics registry while City is loaded, name -> (help, labels)
+COUNTERS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "lootdrop_credits_minted_total": ("Credits paid out by drops", ("source",)),
+    "lootdrop_credits_burned_total": ("Credits taken by bad drop outcomes", ("source",)),
+}
+
 
 class ActiveDrop:
     """Represents an active loot drop in a channel
@@ -55,6 +88,62 @@ class ActiveDrop:
         self.created: int = created
 
 
+class GuildSettings(NamedTuple):
+    """Immutable snapshot of a guild's LootDrop settings
+    
+    Held in memory by the cog and replaced whenever a ``lootdrop set``
+    command changes the guild's settings. Runtime state such as ``next_drop``
+    and per-user stats is not part of it.
+    """
+    enabled: bool
+    channels: Tuple[int, ...]
+    min_credits: int
+    max_credits: int
+    bad_outcome_chance: int
+    drop_timeout: int
+    min_frequency: int
+    max_frequency: int
+    activity_timeout: int
+    streak_bonus: int
+    streak_max: int
+    streak_timeout: int
+    party_drop_chance: int
+    party_drop_min: int
+    party_drop_max: int
+    party_drop_timeout: int
+    
+    @classmethod
+    def from_config(cls, data: Dict[str, Any]) -> "GuildSettings":
+        """Build a snapshot from a guild's raw Config data"""
+        return cls(**{
+            field: tuple(data[field]) if field == "channels" else data[field]
+            for field in cls._fields
+        })
+
+
+class PartyPayout(NamedTuple):
+    """A single party-goer's reward
+    
+    Attributes
+    ----------
+    position: int
+        1-based claim order
+    user: discord.Member
+        The party-goer
+    credits: int
+        Credits to pay out
+    reaction_time: float
+        Seconds between the drop and the claim
+    time_percentage: float
+        Reaction time as a percentage of the party timeout
+    """
+    position: int
+    user: discord.Member
+    credits: int
+    reaction_time: float
+    time_percentage: float
+
+
 class LootDrop(commands.Cog):
     """Drop random loot in channels for users to grab
     
@@ -75,6 +164,21 @@ class LootDrop(commands.Cog):
         Last message timestamp per channel
     channel_perms_cache: Dict[int, Tuple[int, bool]]
         Cache of channel permission checks
+    rankings: Dict[int, GuildRanking]
+        Leaderboard ranks, keyed by guild ID. Built on first use.
+    settings_cache: Dict[int, GuildSettings]
+        Settings snapshots, keyed by guild ID
+    currency_names: Dict[int, Tuple[float, str]]
+        Cached currency names with the time they were fetched, keyed by guild ID
+    scheduler: DropScheduler
+        Wakes up when the next guild's drop is due
+    outbox: Outbox
+        Sends and edits every drop and command message, one queue per channel
+    perf: PerfRecorder
+        Latency histograms for claims and the calls they make
+    metrics: Optional[Any]
+        City's metrics registry while City is loaded. LootDrop's counters and
+        gauges are registered on it and served through City's endpoint.
     """
     
     def __init__(self, bot: Red) -> None:
@@ -84,23 +188,110 @@ class LootDrop(commands.Cog):
             identifier=582650109,
             force_registration=True
         )
+        self.perf: PerfRecorder = PERF
         
         self.config.register_guild(**DEFAULT_GUILD_SETTINGS)
+        self.config.register_member(**DEFAULT_MEMBER_STATS)
+        self.config.register_global(schema_version=0)
         
         self.active_drops: Dict[int, ActiveDrop] = {}
         self.tasks: Dict[int, asyncio.Task] = {}
         self.channel_last_message: Dict[int, int] = defaultdict(lambda: 0)
         self.channel_perms_cache: Dict[int, Tuple[int, bool]] = {}
+        self.rankings: Dict[int, GuildRanking] = {}
+        self.settings_cache: Dict[int, GuildSettings] = {}
+        self.currency_names: Dict[int, Tuple[float, str]] = {}
+        self.scheduler: DropScheduler = DropScheduler(self._run_scheduled_drop)
+        self.outbox: Outbox = Outbox()
+        
+        self.metrics: Optional[Any] = None
+        self.counters: Dict[str, Any] = {}
+        self._register_metrics(self.bot.get_cog("City"))
+        self._scheduler_setup: Optional[asyncio.Task] = None
+    
+    def _register_metrics(self, city: Optional[commands.Cog]) -> None:
+        """Register LootDrop's counters and gauges on City's registry, if City is loaded"""
+        registry = getattr(city, "metrics", None)
+        self.metrics = registry
+        if registry is None:
+            self.counters = {}
+            return
+        self.counters = {name: registry.counter(name, help, labels) for name, (help, labels) in COUNTERS.items()}
+        registry.gauge("lootdrop_active_drops", "Drops waiting to be claimed", function=self.active_drops.__len__)
+        registry.gauge(
+            "lootdrop_tracked_channels", "Channels with a remembered last message time",
+            function=self.channel_last_message.__len__
+        )
+    
+    def _count(self, name: str, amount: int, labels: Tuple[str, ...]) -> None:
+        """Add to one of LootDrop's counters. Nothing is counted while City isn't loaded."""
+        counter = self.counters.get(name)
+        if counter is not None:
+            counter.inc(amount, labels)
+    
+    @commands.Cog.listener()
+    async def on_cog_add(self, cog: commands.Cog) -> None:
+        if cog.qualified_name == "City":
+            self._register_metrics(cog)
+    
+    @commands.Cog.listener()
+    async def on_cog_remove(self, cog: commands.Cog) -> None:
+        if cog.qualified_name == "City":
+            self._register_metrics(None)
+    
+    async def cog_load(self) -> None:
+        """Migrate stored data before the cog starts handling claims"""
+        await self._migrate_config()
+        self._scheduler_setup = asyncio.create_task(self._start_scheduler())
+    
+    async def _start_scheduler(self) -> None:
+        """Rebuild the drop schedule from Config once the bot is ready"""
+        await self.bot.wait_until_ready()
+        await self._load_schedule()
+        self.scheduler.start()
+    
+    async def _load_schedule(self) -> None:
+        """Schedule every enabled guild at its stored ``next_drop`` time"""
+        all_guilds = await self.config.all_guilds()
+        for guild_id, guild_data in all_guilds.items():
+            if guild_data.get("enabled") and self.bot.get_guild(guild_id):
+                self.scheduler.schedule(guild_id, guild_data.get("next_drop", 0))
+    
+    async def _migrate_config(self) -> None:
+        """Bring stored data up to the current schema version
         
-        self.start_drops.start()
+        Version 1 moves per-user stats out of the guild's ``user_stats`` blob
+        into member scope, so a claim only rewrites the claiming user's data.
+        """
+        schema_version: int = await self.config.schema_version()
+        if schema_version >= CONFIG_SCHEMA_VERSION:
+            return
+            
+        if schema_version < 1:
+            all_guilds = await self.config.all_guilds()
+            for guild_id, guild_data in all_guilds.items():
+                legacy_stats: Dict[str, Dict[str, Any]] = guild_data.get("user_stats", {})
+                for user_id, user_stats in legacy_stats.items():
+                    await self.config.member_from_ids(guild_id, int(user_id)).set(
+                        {**DEFAULT_MEMBER_STATS, **user_stats}
+                    )
+                if legacy_stats:
+                    await self.config.guild_from_id(guild_id).user_stats.clear()
+                    
+        await self.config.schema_version.set(CONFIG_SCHEMA_VERSION)
     
     def cog_unload(self) -> None:
         """Cleanup when cog is unloaded
         
         Cancels all tasks and removes active drops
         """
-        # Stop the background task first
-        self.start_drops.cancel()
+        # Stop the scheduler first
+        if self._scheduler_setup is not None:
+            self._scheduler_setup.cancel()
+        self.scheduler.stop()
+        self.outbox.close()
+        if self.metrics is not None:
+            self.metrics.unset("lootdrop_active_drops", "lootdrop_tracked_channels")
         
         try:
             # Cancel all timeout tasks
@@ -119,6 +310,33 @@ class LootDrop(commands.Cog):
             self.tasks.clear()
             self.channel_last_message.clear()
             self.channel_perms_cache.clear()
+            self.rankings.clear()
+            self.settings_cache.clear()
+            self.currency_names.clear()
+
+    async def get_settings(self, guild: discord.Guild) -> GuildSettings:
+        """Get a guild's settings snapshot, loading it from Config on first use"""
+        settings = self.settings_cache.get(guild.id)
+        if settings is None:
+            with PERF.timed("config.read"):
+                stored = await self.config.guild(guild).all()
+            settings = GuildSettings.from_config(stored)
+            self.settings_cache[guild.id] = settings
+        return settings
+    
+    def invalidate_settings(self, guild: discord.Guild) -> None:
+        """Drop a guild's settings snapshot after its settings changed"""
+        self.settings_cache.pop(guild.id, None)
+    
+    async def get_currency_name(self, guild: discord.Guild) -> str:
+        """Get the bank's currency name, cached for a few minutes"""
+        now = time.monotonic()
+        cached = self.currency_names.get(guild.id)
+        if cached is not None and now - cached[0] < CURRENCY_NAME_TTL:
+            return cached[1]
+        currency_name = await bank.get_currency_name(guild)
+        self.currency_names[guild.id] = (now, currency_name)
+        return currency_name
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
@@ -131,7 +349,7 @@ class LootDrop(commands.Cog):
         """Check if a channel has had message activity within the activity timeout"""
         now: int = int(datetime.datetime.now().timestamp())
         last_message: int = self.channel_last_message[channel.id]
-        timeout: int = await self.config.guild(channel.guild).activity_timeout()
+        timeout: int = (await self.get_settings(channel.guild)).activity_timeout
         
         # For threads, also check if they're still active
         if isinstance(channel, discord.Thread) and not channel.parent:
@@ -161,7 +379,7 @@ class LootDrop(commands.Cog):
     
     async def get_active_channel(self, guild: discord.Guild) -> Optional[Union[discord.TextChannel, discord.Thread]]:
         """Get a random active channel from the configured channels"""
-        channels: List[int] = await self.config.guild(guild).channels()
+        channels: Tuple[int, ...] = (await self.get_settings(guild)).channels
         active_channels: List[Union[discord.TextChannel, discord.Thread]] = []
         
         for channel_id in channels:
@@ -180,38 +398,43 @@ class LootDrop(commands.Cog):
         
         return random.choice(active_channels) if active_channels else None
     
-    @tasks.loop(seconds=30)
-    async def start_drops(self) -> None:
-        """Check for and create drops in all guilds"""
-        for guild in self.bot.guilds:
-            try:
-                if not await self.config.guild(guild).enabled() or guild.id in self.active_drops:
-                    continue
+    async def _run_scheduled_drop(self, guild_id: int) -> None:
+        """Create a guild's drop now that it is due, then schedule the next one"""
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+            
+        try:
+            if not (await self.get_settings(guild)).enabled:
+                return
                 
-                now: int = int(datetime.datetime.now().timestamp())
-                if now >= await self.config.guild(guild).next_drop():
-                    if channel := await self.get_active_channel(guild):
-                        await self.create_drop(channel)
-                    await self.schedule_next_drop(guild)
-            except Exception as e:
-                if guild.system_channel and guild.system_channel.permissions_for(guild.me).send_messages:
-                    await guild.system_channel.send(f"Error creating loot drop: {e}")
-    
-    @start_drops.before_loop
-    async def before_start_drops(self) -> None:
-        """Wait for bot to be ready before starting drops"""
-        await self.bot.wait_until_ready()
+            if guild.id in self.active_drops:
+                # Try again once the current drop had a chance to finish
+                self.scheduler.schedule(guild.id, time.time() + ACTIVE_DROP_RETRY)
+                return
+                
+            if channel := await self.get_active_channel(guild):
+                await self.create_drop(channel)
+            await self.schedule_next_drop(guild)
+        except Exception as e:
+            if guild.system_channel and guild.system_channel.permissions_for(guild.me).send_messages:
+                await self.outbox.send(guild.system_channel, f"Error creating loot drop: {e}")
+            await self.schedule_next_drop(guild)
     
     async def schedule_next_drop(self, guild: discord.Guild) -> None:
         """Schedule the next drop for a guild"""
-        if not await self.config.guild(guild).enabled():
+        settings = await self.get_settings(guild)
+        if not settings.enabled:
+            self.scheduler.cancel(guild.id)
             return
             
-        min_freq: int = await self.config.guild(guild).min_frequency()
-        max_freq: int = await self.config.guild(guild).max_frequency()
+        min_freq: int = settings.min_frequency
+        max_freq: int = settings.max_frequency
         now: int = int(datetime.datetime.now().timestamp())
+        next_drop: int = now + random.randint(min_freq, max_freq)
         
-        await self.config.guild(guild).next_drop.set(now + random.randint(min_freq, max_freq))
+        await self.config.guild(guild).next_drop.set(next_drop)
+        self.scheduler.schedule(guild.id, next_drop)
     
     async def create_drop(self, channel: Union[discord.TextChannel, discord.Thread]) -> None:
         """Create a new loot drop in the specified channel"""
@@ -221,16 +444,18 @@ class LootDrop(commands.Cog):
         if channel.guild.id in self.active_drops:
             return
             
+        settings = await self.get_settings(channel.guild)
+        
         # Check for party drop
-        is_party = random.randint(1, 100) <= await self.config.guild(channel.guild).party_drop_chance()
+        is_party = random.randint(1, 100) <= settings.party_drop_chance
         
         if is_party:
             await self.create_party_drop(channel)
         else:
             scenario = random.choice(SCENARIOS)
-            timeout = await self.config.guild(channel.guild).drop_timeout()
+            timeout = settings.drop_timeout
             view = LootDropView(self, scenario, float(timeout))
-            view.message = await channel.send(scenario["start"], view=view)
+            view.message = await self.outbox.send(channel, scenario["start"], view=view)
             
             self.active_drops[channel.guild.id] = ActiveDrop(
                 message=view.message,
@@ -255,7 +480,7 @@ class LootDrop(commands.Cog):
                 if guild_id in self.active_drops:
                     drop = self.active_drops[guild_id]
                     if not drop.view.claimed:
-                        await drop.message.edit(content="The opportunity has passed...", view=None)
+                        await self.outbox.edit(drop.message, content="The opportunity has passed...", view=None)
                     del self.active_drops[guild_id]
         except Exception:
             pass
@@ -274,9 +499,10 @@ class LootDrop(commands.Cog):
         if channel.guild.id in self.active_drops:
             return
             
-        timeout = await self.config.guild(channel.guild).party_drop_timeout()
+        timeout = (await self.get_settings(channel.guild)).party_drop_timeout
         view = PartyDropView(self, timeout)
-        message = await channel.send(
+        message = await self.outbox.send(
+            channel,
             "🎉 **PARTY DROP!** 🎉\n"
             "Everyone who clicks the button in the next "
             f"{timeout} seconds gets a prize!\n",
@@ -320,80 +546,42 @@ class LootDrop(commands.Cog):
                 view = cast(PartyDropView, drop.view)
                 
                 if not view.claimed_users:
-                    await drop.message.edit(content="No one joined the party... 😢", view=None)
+                    await self.outbox.edit(drop.message, content="No one joined the party... 😢", view=None)
                 else:
-                    min_credits = await self.config.guild(drop.message.guild).party_drop_min()
-                    max_credits = await self.config.guild(drop.message.guild).party_drop_max()
-                    credit_range = max_credits - min_credits
+                    guild = drop.message.guild
                     
-                    # Sort users by click speed
-                    sorted_users = sorted(view.claimed_users.items(), key=lambda x: x[1])
+                    # Read everything settlement needs once, up front
+                    settings = await self.get_settings(guild)
+                    currency_name = await self.get_currency_name(guild)
                     
+                    payouts = self._compute_party_payouts(
+                        guild, view, timeout, settings.party_drop_min, settings.party_drop_max
+                    )
+                    paid = await self._deposit_party_payouts(payouts)
+                    stats = await self._commit_party_stats(guild, paid, settings.streak_timeout)
+                    
+                    paid_ids = {payout.user.id for payout in paid}
                     results = []
-                    for position, (user_id, claim_time) in enumerate(sorted_users, 1):
-                        user = drop.message.guild.get_member(int(user_id))
-                        if user:
-                            # Calculate reaction time and percentage of timeout
-                            reaction_time = claim_time - view.start_time
-                            time_percentage = (reaction_time / timeout) * 100
-                            
-                            # Calculate credits based on reaction time
-                            if time_percentage <= 20:  # Super fast (80-100% of max)
-                                credits = max_credits - int((time_percentage / 20) * (credit_range * 0.2))
-                            elif time_percentage <= 40:  # Fast (60-80% of max)
-                                credits = int(max_credits * 0.8) - int(((time_percentage - 20) / 20) * (credit_range * 0.2))
-                            elif time_percentage <= 60:  # Medium (40-60% of max)
-                                credits = int(max_credits * 0.6) - int(((time_percentage - 40) / 20) * (credit_range * 0.2))
-                            elif time_percentage <= 80:  # Slow (20-40% of max)
-                                credits = int(max_credits * 0.4) - int(((time_percentage - 60) / 20) * (credit_range * 0.2))
-                            else:  # Very slow (min credits)
-                                credits = min_credits
-                            
-                            await bank.deposit_credits(user, credits)
+                    for payout in payouts:
+                        position_emoji = ["🥇", "🥈", "🥉"][payout.position-1] if payout.position <= 3 else f"{payout.position}th"
+                        if payout.user.id not in paid_ids:
+                            results.append(f"{position_emoji} {payout.user.mention}: ⚠️ payout failed")
+                            continue
                             
-                            # Update stats and streak
-                            async with self.config.guild(drop.message.guild).user_stats() as stats:
-                                if user_id not in stats:
-                                    stats[user_id] = {"good": 0, "bad": 0, "streak": 0, "highest_streak": 0, "last_claim": 0}
-                                
-                                stats[user_id]["good"] += 1
-                                
-                                # Update streak if within timeout
-                                now = int(datetime.datetime.now().timestamp())
-                                streak_timeout = await self.config.guild(drop.message.guild).streak_timeout()
-                                if now - stats[user_id]["last_claim"] < streak_timeout * 3600:
-                                    stats[user_id]["streak"] += 1
-                                    stats[user_id]["highest_streak"] = max(stats[user_id]["streak"], stats[user_id]["highest_streak"])
-                                else:
-                                    stats[user_id]["streak"] = 1
-                                
-                                stats[user_id]["last_claim"] = now
-                                
-                                # Add result with streak and timing info
-                                streak_display = f" (🔥{stats[user_id]['streak']})" if stats[user_id]['streak'] > 1 else ""
-                                position_emoji = ["🥇", "🥈", "🥉"][position-1] if position <= 3 else f"{position}th"
-                                
-                                # Add speed indicator based on time percentage
-                                if time_percentage <= 20:
-                                    speed = "💨 Super Fast!"
-                                elif time_percentage <= 40:
-                                    speed = "⚡ Fast!"
-                                elif time_percentage <= 60:
-                                    speed = "👍 Good"
-                                elif time_percentage <= 80:
-                                    speed = "🐌 Slow"
-                                else:
-                                    speed = "🦥 Very Slow"
-                                
-                                currency_name = await bank.get_currency_name(drop.message.guild)
-                                results.append(
-                                    f"{position_emoji} {user.mention}{streak_display}: {credits:,} {currency_name}\n"
-                                    f"└ {speed} ({reaction_time:.2f}s)"
-                                )
+                        # Add result with streak and timing info, the streak is
+                        # left out if their stats couldn't be saved
+                        user_stats = stats.get(str(payout.user.id))
+                        streak_display = f" (🔥{user_stats['streak']})" if user_stats and user_stats['streak'] > 1 else ""
+                        results.append(
+                            f"{position_emoji} {payout.user.mention}{streak_display}: {payout.credits:,} {currency_name}\n"
+                            f"└ {self._party_speed_label(payout.time_percentage)} ({payout.reaction_time:.2f}s)"
+                        )
                     
-                    await drop.message.edit(
+                    await self.outbox.edit(
+                        drop.message,
+                        priority=Priority.RESULT,
                         content=f"🎊 **Party Drop Results!** 🎊\n"
-                        f"{len(results)} party-goers claimed rewards:\n\n" +
+                        f"{len(paid)} party-goers claimed rewards:\n\n" +
                         "\n".join(results),
                         view=None
                     )
@@ -403,7 +591,7 @@ class LootDrop(commands.Cog):
         except Exception as e:
             if guild_id in self.active_drops:
                 try:
-                    await self.active_drops[guild_id].message.edit(content=f"Error processing party drop: {e}", view=None)
+                    await self.outbox.edit(self.active_drops[guild_id].message, content=f"Error processing party drop: {e}", view=None)
                 except:
                     pass
                 del self.active_drops[guild_id]
@@ -411,19 +599,184 @@ class LootDrop(commands.Cog):
             if guild_id in self.tasks:
                 del self.tasks[guild_id]
 
+    @staticmethod
+    def _compute_party_payouts(
+        guild: discord.Guild,
+        view: "PartyDropView",
+        timeout: int,
+        min_credits: int,
+        max_credits: int
+    ) -> List[PartyPayout]:
+        """Work out every party-goer's reward from their reaction time
+        
+        Parameters
+        ----------
+        guild: discord.Guild
+            The guild the party drop happened in
+        view: PartyDropView
+            The finished party drop view
+        timeout: int
+            Seconds the party drop was open for
+        min_credits: int
+            Reward for the slowest claims
+        max_credits: int
+            Reward for the fastest claims
+        
+        Returns
+        -------
+        List[PartyPayout]
+            Payouts ordered by click speed. Users who left are skipped.
+        """
+        credit_range = max_credits - min_credits
+        payouts: List[PartyPayout] = []
+        
+        # Sort users by click speed
+        sorted_users = sorted(view.claimed_users.items(), key=lambda x: x[1])
+        for position, (user_id, claim_time) in enumerate(sorted_users, 1):
+            user = guild.get_member(int(user_id))
+            if not user:
+                continue
+                
+            # Calculate reaction time and percentage of timeout
+            reaction_time = claim_time - view.start_time
+            time_percentage = (reaction_time / timeout) * 100
+            
+            # Calculate credits based on reaction time
+            if time_percentage <= 20:  # Super fast (80-100% of max)
+                credits = max_credits - int((time_percentage / 20) * (credit_range * 0.2))
+            elif time_percentage <= 40:  # Fast (60-80% of max)
+                credits = int(max_credits * 0.8) - int(((time_percentage - 20) / 20) * (credit_range * 0.2))
+            elif time_percentage <= 60:  # Medium (40-60% of max)
+                credits = int(max_credits * 0.6) - int(((time_percentage - 40) / 20) * (credit_range * 0.2))
+            elif time_percentage <= 80:  # Slow (20-40% of max)
+                credits = int(max_credits * 0.4) - int(((time_percentage - 60) / 20) * (credit_range * 0.2))
+            else:  # Very slow (min credits)
+                credits = min_credits
+                
+            payouts.append(PartyPayout(position, user, credits, reaction_time, time_percentage))
+        
+        return payouts
+    
+    @staticmethod
+    def _party_speed_label(time_percentage: float) -> str:
+        """Get the speed indicator for a party claim"""
+        if time_percentage <= 20:
+            return "💨 Super Fast!"
+        elif time_percentage <= 40:
+            return "⚡ Fast!"
+        elif time_percentage <= 60:
+            return "👍 Good"
+        elif time_percentage <= 80:
+            return "🐌 Slow"
+        return "🦥 Very Slow"
+    
+    async def _deposit_party_payouts(self, payouts: List[PartyPayout]) -> List[PartyPayout]:
+        """Pay out party rewards concurrently, a few deposits at a time
+        
+        Parameters
+        ----------
+        payouts: List[PartyPayout]
+            The rewards to pay
+        
+        Returns
+        -------
+        List[PartyPayout]
+            The payouts that were deposited successfully
+        """
+        semaphore = asyncio.Semaphore(PARTY_DEPOSIT_CONCURRENCY)
+        
+        async def deposit(payout: PartyPayout) -> None:
+            async with semaphore:
+                with PERF.timed("bank"):
+                    await bank.deposit_credits(payout.user, payout.credits)
+                self._count("lootdrop_credits_minted_total", payout.credits, ("party",))
+        
+        results = await asyncio.gather(*(deposit(p) for p in payouts), return_exceptions=True)
+        paid: List[PartyPayout] = []
+        for payout, result in zip(payouts, results):
+            if isinstance(result, Exception):
+                log.error(
+                    "Failed to deposit %s party drop credits for %s in guild %s",
+                    payout.credits, payout.user.id, payout.user.guild.id, exc_info=result
+                )
+            else:
+                paid.append(payout)
+        return paid
+    
+    async def _commit_party_stats(
+        self,
+        guild: discord.Guild,
+        payouts: List[PartyPayout],
+        streak_timeout: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Update every paid party-goer's stats and streak, a few writes at a time
+        
+        Parameters
+        ----------
+        guild: discord.Guild
+            The guild the party drop happened in
+        payouts: List[PartyPayout]
+            The payouts that were deposited
+        streak_timeout: int
+            Hours before a streak resets
+        
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            The updated stats, keyed by user ID. Users whose stats couldn't
+            be written are left out.
+        """
+        updated: Dict[str, Dict[str, Any]] = {}
+        if not payouts:
+            return updated
+            
+        now = int(datetime.datetime.now().timestamp())
+        semaphore = asyncio.Semaphore(PARTY_DEPOSIT_CONCURRENCY)
+        
+        async def commit(payout: PartyPayout) -> None:
+            async with semaphore:
+                async with self.config.member(payout.user).all() as stats:
+                    stats["good"] += 1
+                    
+                    # Update streak if within timeout
+                    if now - stats["last_claim"] < streak_timeout * 3600:
+                        stats["streak"] += 1
+                        stats["highest_streak"] = max(stats["streak"], stats["highest_streak"])
+                    else:
+                        stats["streak"] = 1
+                        
+                    stats["last_claim"] = now
+                    updated[str(payout.user.id)] = dict(stats)
+        
+        results = await asyncio.gather(*(commit(p) for p in payouts), return_exceptions=True)
+        for payout, result in zip(payouts, results):
+            if isinstance(result, Exception):
+                # They were paid already, so only their stats are missing
+                log.error(
+                    "Failed to update party drop stats for %s in guild %s",
+                    payout.user.id, guild.id, exc_info=result
+                )
+        
+        ranking = await self.get_ranking(guild)
+        for user_id, stats in updated.items():
+            ranking.update(user_id, stats)
+        return updated
+
+    @PERF.measured("lootdrop.claim")
     async def process_loot_claim(self, interaction: discord.Interaction) -> None:
         """Process a user's loot claim"""
         try:
             guild: discord.Guild = interaction.guild
             user: discord.Member = interaction.user
             
-            min_credits: int = await self.config.guild(guild).min_credits()
-            max_credits: int = await self.config.guild(guild).max_credits()
-            bad_chance: int = await self.config.guild(guild).bad_outcome_chance()
-            streak_bonus: int = await self.config.guild(guild).streak_bonus()
-            streak_max: int = await self.config.guild(guild).streak_max()
-            streak_timeout: int = await self.config.guild(guild).streak_timeout()
-            currency_name: str = await bank.get_currency_name(guild)
+            settings = await self.get_settings(guild)
+            min_credits: int = settings.min_credits
+            max_credits: int = settings.max_credits
+            bad_chance: int = settings.bad_outcome_chance
+            streak_bonus: int = settings.streak_bonus
+            streak_max: int = settings.streak_max
+            streak_timeout: int = settings.streak_timeout
+            currency_name: str = await self.get_currency_name(guild)
             
             scenario: Scenario = next(
                 (s for s in SCENARIOS if s["start"] == interaction.message.content),
@@ -433,16 +786,11 @@ class LootDrop(commands.Cog):
             amount: int = random.randint(min_credits, max_credits)
             is_bad: bool = random.randint(1, 100) <= bad_chance
             
+            ranking = await self.get_ranking(guild)
+            
             # Update user stats and streaks
-            async with self.config.guild(guild).user_stats() as stats:
+            async with self.config.member(user).all() as user_stats:
                 now = int(datetime.datetime.now().timestamp())
-                user_stats = stats.setdefault(str(user.id), {
-                    "good": 0,
-                    "bad": 0,
-                    "streak": 0,
-                    "last_claim": 0,
-                    "highest_streak": 0
-                })
                 
                 # Check if streak should reset due to timeout
                 hours_since_last = (now - user_stats.get("last_claim", 0)) / 3600
@@ -453,8 +801,11 @@ class LootDrop(commands.Cog):
                 
                 try:
                     if is_bad:
-                        amount = min(amount, await bank.get_balance(user))
-                        await bank.withdraw_credits(user, amount)
+                        with PERF.timed("bank"):
+                            amount = min(amount, await bank.get_balance(user))
+                        with PERF.timed("bank"):
+                            await bank.withdraw_credits(user, amount)
+                        self._count("lootdrop_credits_burned_total", amount, ("drop",))
                         message: str = scenario["bad"].format(user=user.mention, amount=f"{amount:,}", currency=currency_name)
                         user_stats["bad"] += 1
                         user_stats["streak"] = 0
@@ -464,7 +815,9 @@ class LootDrop(commands.Cog):
                         bonus = int(amount * (streak * streak_bonus / 100))
                         total = amount + bonus
                         
-                        await bank.deposit_credits(user, total)
+                        with PERF.timed("bank"):
+                            await bank.deposit_credits(user, total)
+                        self._count("lootdrop_credits_minted_total", total, ("drop",))
                         if bonus > 0:
                             message: str = (
                                 f"{scenario['good'].format(user=user.mention, amount=f'{total:,}', currency=currency_name)}\n"
@@ -477,20 +830,22 @@ class LootDrop(commands.Cog):
                         user_stats["streak"] += 1
                         user_stats["highest_streak"] = max(user_stats["streak"], user_stats.get("highest_streak", 0))
                     
+                    ranking.update(str(user.id), user_stats)
+                    
                     # Add stats to message
                     message += f"\n-# (✅ {user_stats['good']} | ❌ {user_stats.get('bad', 0)} drops claimed | "
                     if user_stats["streak"] > 0:
                         message += f"🔥 {user_stats['streak']} streak"
                     else:
                         message += "❄️ streak lost"
-                    position, _ = await self.get_leaderboard_position(guild, str(user.id))
-                    message += f" | Rank #{position})"
+                    message += f" | Rank #{ranking.rank(str(user.id))})"
                     
                     # Use followup instead of response since we might have already responded
-                    if interaction.response.is_done():
-                        await interaction.followup.send(message)
-                    else:
-                        await interaction.response.send_message(message)
+                    with PERF.timed("discord"):
+                        if interaction.response.is_done():
+                            await interaction.followup.send(message)
+                        else:
+                            await interaction.response.send_message(message)
                         
                 except Exception as e:
                     if interaction.response.is_done():
@@ -547,11 +902,13 @@ class LootDrop(commands.Cog):
             on_off = not curr_state
             
         await self.config.guild(ctx.guild).enabled.set(on_off)
+        self.invalidate_settings(ctx.guild)
         if on_off:
             await self.schedule_next_drop(ctx.guild)
-            await ctx.send("LootDrop is now enabled! Drops will begin shortly.")
+            await self.outbox.send(ctx.channel, "LootDrop is now enabled! Drops will begin shortly.")
         else:
-            await ctx.send("LootDrop is now disabled.")
+            self.scheduler.cancel(ctx.guild.id)
+            await self.outbox.send(ctx.channel, "LootDrop is now disabled.")
     
     @lootdrop_set.command(name="addchannel")
     async def lootdrop_set_addchannel(
@@ -561,21 +918,22 @@ class LootDrop(commands.Cog):
     ) -> None:
         """Add a channel or thread to the loot drop pool"""
         if isinstance(channel, discord.Thread) and not channel.parent:
-            await ctx.send("That thread no longer exists!")
+            await self.outbox.send(ctx.channel, "That thread no longer exists!")
             return
             
         if not channel.permissions_for(ctx.guild.me).send_messages:
-            await ctx.send("I don't have permission to send messages there!")
+            await self.outbox.send(ctx.channel, "I don't have permission to send messages there!")
             return
             
         async with self.config.guild(ctx.guild).channels() as channels:
             if channel.id in channels:
-                await ctx.send(f"{channel.mention} is already in the loot drop pool!")
+                await self.outbox.send(ctx.channel, f"{channel.mention} is already in the loot drop pool!")
                 return
                 
             channels.append(channel.id)
             
-        await ctx.send(f"Added {channel.mention} to the loot drop pool!")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Added {channel.mention} to the loot drop pool!")
 
     @lootdrop_set.command(name="removechannel")
     async def lootdrop_set_removechannel(
@@ -586,39 +944,42 @@ class LootDrop(commands.Cog):
         """Remove a channel or thread from the loot drop pool"""
         async with self.config.guild(ctx.guild).channels() as channels:
             if channel.id not in channels:
-                await ctx.send(f"{channel.mention} is not in the loot drop pool!")
+                await self.outbox.send(ctx.channel, f"{channel.mention} is not in the loot drop pool!")
                 return
                 
             channels.remove(channel.id)
             
-        await ctx.send(f"Removed {channel.mention} from the loot drop pool!")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Removed {channel.mention} from the loot drop pool!")
 
     @lootdrop_set.command(name="credits")
     async def lootdrop_set_credits(self, ctx: commands.Context, min_credits: int, max_credits: int) -> None:
         """Set the credit range for drops"""
-        currency_name = await bank.get_currency_name(ctx.guild)
+        currency_name = await self.get_currency_name(ctx.guild)
         
         if min_credits < 1:
-            await ctx.send(f"Minimum {currency_name} must be at least 1!")
+            await self.outbox.send(ctx.channel, f"Minimum {currency_name} must be at least 1!")
             return
             
         if max_credits < min_credits:
-            await ctx.send(f"Maximum {currency_name} must be greater than minimum {currency_name}!")
+            await self.outbox.send(ctx.channel, f"Maximum {currency_name} must be greater than minimum {currency_name}!")
             return
             
         await self.config.guild(ctx.guild).min_credits.set(min_credits)
         await self.config.guild(ctx.guild).max_credits.set(max_credits)
-        await ctx.send(f"Drops will now give between {min_credits:,} and {max_credits:,} {currency_name}!")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Drops will now give between {min_credits:,} and {max_credits:,} {currency_name}!")
 
     @lootdrop_set.command(name="badchance")
     async def lootdrop_set_badchance(self, ctx: commands.Context, chance: int) -> None:
         """Set the chance of bad outcomes (0-100)"""
         if not 0 <= chance <= 100:
-            await ctx.send("Chance must be between 0 and 100!")
+            await self.outbox.send(ctx.channel, "Chance must be between 0 and 100!")
             return
             
         await self.config.guild(ctx.guild).bad_outcome_chance.set(chance)
-        await ctx.send(f"Bad outcome chance set to {chance}%")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Bad outcome chance set to {chance}%")
     
     @lootdrop_set.command(name="timeout")
     async def lootdrop_set_timeout(self, ctx: commands.Context, seconds: int) -> None:
@@ -631,10 +992,11 @@ class LootDrop(commands.Cog):
             Example: 3600 = 1 hour, 1800 = 30 minutes
         """
         if seconds < 10:
-            await ctx.send("Timeout must be at least 10 seconds!")
+            await self.outbox.send(ctx.channel, "Timeout must be at least 10 seconds!")
             return
             
         await self.config.guild(ctx.guild).drop_timeout.set(seconds)
+        self.invalidate_settings(ctx.guild)
         
         # Convert to a more readable format for the response
         if seconds >= 3600:
@@ -648,33 +1010,35 @@ class LootDrop(commands.Cog):
         else:
             time_str = f"{seconds} seconds"
             
-        await ctx.send(f"Users will now have {time_str} to claim drops!")
+        await self.outbox.send(ctx.channel, f"Users will now have {time_str} to claim drops!")
     
     @lootdrop_set.command(name="frequency")
     async def lootdrop_set_frequency(self, ctx: commands.Context, min_minutes: int, max_minutes: int) -> None:
         """Set how frequently drops appear"""
         if min_minutes < 1:
-            await ctx.send("Minimum frequency must be at least 1 minute!")
+            await self.outbox.send(ctx.channel, "Minimum frequency must be at least 1 minute!")
             return
             
         if max_minutes < min_minutes:
-            await ctx.send("Maximum frequency must be greater than minimum frequency!")
+            await self.outbox.send(ctx.channel, "Maximum frequency must be greater than minimum frequency!")
             return
             
         await self.config.guild(ctx.guild).min_frequency.set(min_minutes * 60)
         await self.config.guild(ctx.guild).max_frequency.set(max_minutes * 60)
+        self.invalidate_settings(ctx.guild)
         await self.schedule_next_drop(ctx.guild)
-        await ctx.send(f"Drops will occur randomly between {min_minutes} and {max_minutes} minutes apart.")
+        await self.outbox.send(ctx.channel, f"Drops will occur randomly between {min_minutes} and {max_minutes} minutes apart.")
     
     @lootdrop_set.command(name="activitytimeout")
     async def lootdrop_set_activitytimeout(self, ctx: commands.Context, minutes: int) -> None:
         """Set how long a channel can be inactive before drops are skipped"""
         if minutes < 1:
-            await ctx.send("Timeout must be at least 1 minute!")
+            await self.outbox.send(ctx.channel, "Timeout must be at least 1 minute!")
             return
             
         await self.config.guild(ctx.guild).activity_timeout.set(minutes * 60)
-        await ctx.send(f"Channels will now be considered inactive after {minutes} minutes without messages.")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Channels will now be considered inactive after {minutes} minutes without messages.")
     
     @lootdrop_set.command(name="streakbonus")
     async def lootdrop_set_streakbonus(self, ctx: commands.Context, percentage: int) -> None:
@@ -684,11 +1048,12 @@ class LootDrop(commands.Cog):
         So streak 3 would give a 30% bonus
         """
         if percentage < 0:
-            await ctx.send("Bonus percentage must be positive!")
+            await self.outbox.send(ctx.channel, "Bonus percentage must be positive!")
             return
             
         await self.config.guild(ctx.guild).streak_bonus.set(percentage)
-        await ctx.send(f"Streak bonus set to {percentage}% per level")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Streak bonus set to {percentage}% per level")
     
     @lootdrop_set.command(name="streakmax")
     async def lootdrop_set_streakmax(self, ctx: commands.Context, max_level: int) -> None:
@@ -697,11 +1062,12 @@ class LootDrop(commands.Cog):
         Example: A max of 5 means streaks cap at 5x the bonus
         """
         if max_level < 1:
-            await ctx.send("Maximum streak level must be at least 1!")
+            await self.outbox.send(ctx.channel, "Maximum streak level must be at least 1!")
             return
             
         await self.config.guild(ctx.guild).streak_max.set(max_level)
-        await ctx.send(f"Maximum streak level set to {max_level}")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Maximum streak level set to {max_level}")
     
     @lootdrop_set.command(name="streaktimeout")
     async def lootdrop_set_streaktimeout(self, ctx: commands.Context, hours: int) -> None:
@@ -710,11 +1076,12 @@ class LootDrop(commands.Cog):
         Example: A timeout of 24 means you must claim within 24 hours to keep streak
         """
         if hours < 1:
-            await ctx.send("Timeout must be at least 1 hour!")
+            await self.outbox.send(ctx.channel, "Timeout must be at least 1 hour!")
             return
             
         await self.config.guild(ctx.guild).streak_timeout.set(hours)
-        await ctx.send(f"Streak timeout set to {hours} hours")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Streak timeout set to {hours} hours")
     
     @lootdrop_set.command(name="partychance")
     async def lootdrop_set_partychance(self, ctx: commands.Context, chance: int) -> None:
@@ -723,11 +1090,12 @@ class LootDrop(commands.Cog):
         Party drops allow everyone to claim within a time limit
         """
         if not 0 <= chance <= 100:
-            await ctx.send("Chance must be between 0 and 100!")
+            await self.outbox.send(ctx.channel, "Chance must be between 0 and 100!")
             return
             
         await self.config.guild(ctx.guild).party_drop_chance.set(chance)
-        await ctx.send(f"Party drop chance set to {chance}%")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Party drop chance set to {chance}%")
     
     @lootdrop_set.command(name="partycredits")
     async def lootdrop_set_partycredits(self, ctx: commands.Context, min_credits: int, max_credits: int) -> None:
@@ -735,29 +1103,31 @@ class LootDrop(commands.Cog):
         
         Each person who claims gets this amount
         """
-        currency_name = await bank.get_currency_name(ctx.guild)
+        currency_name = await self.get_currency_name(ctx.guild)
         
         if min_credits < 1:
-            await ctx.send(f"Minimum {currency_name} must be at least 1!")
+            await self.outbox.send(ctx.channel, f"Minimum {currency_name} must be at least 1!")
             return
             
         if max_credits < min_credits:
-            await ctx.send(f"Maximum {currency_name} must be greater than minimum {currency_name}!")
+            await self.outbox.send(ctx.channel, f"Maximum {currency_name} must be greater than minimum {currency_name}!")
             return
             
         await self.config.guild(ctx.guild).party_drop_min.set(min_credits)
         await self.config.guild(ctx.guild).party_drop_max.set(max_credits)
-        await ctx.send(f"Party drops will now give between {min_credits:,} and {max_credits:,} {currency_name} per person!")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Party drops will now give between {min_credits:,} and {max_credits:,} {currency_name} per person!")
 
     @lootdrop_set.command(name="partytimeout")
     async def lootdrop_set_partytimeout(self, ctx: commands.Context, seconds: int) -> None:
         """Set how long users have to claim a party drop"""
         if seconds < 5:
-            await ctx.send("Timeout must be at least 5 seconds!")
+            await self.outbox.send(ctx.channel, "Timeout must be at least 5 seconds!")
             return
             
         await self.config.guild(ctx.guild).party_drop_timeout.set(seconds)
-        await ctx.send(f"Users will now have {seconds} seconds to claim party drops!")
+        self.invalidate_settings(ctx.guild)
+        await self.outbox.send(ctx.channel, f"Users will now have {seconds} seconds to claim party drops!")
     
     @commands.is_owner()
     @lootdrop.command(name="wipedata")
@@ -772,7 +1142,8 @@ class LootDrop(commands.Cog):
         This action cannot be undone!
         """
         # Ask for confirmation
-        msg = await ctx.send(
+        msg = await self.outbox.send(
+            ctx.channel,
             "⚠️ **WARNING**: This will completely wipe all LootDrop data across all servers!\n"
             "This includes all settings, stats, and streaks.\n\n"
             "**This action cannot be undone!**\n\n"
@@ -786,15 +1157,15 @@ class LootDrop(commands.Cog):
                 check=lambda m: m.author == ctx.author and m.channel == ctx.channel
             )
         except asyncio.TimeoutError:
-            await msg.edit(content="Data wipe cancelled - timed out.")
+            await self.outbox.edit(msg, content="Data wipe cancelled - timed out.")
             return
             
         if response.content.lower() != "yes, wipe all data":
-            await msg.edit(content="Data wipe cancelled - incorrect confirmation.")
+            await self.outbox.edit(msg, content="Data wipe cancelled - incorrect confirmation.")
             return
             
         # Stop all active drops and tasks
-        self.start_drops.cancel()
+        self.scheduler.clear()
         for task in self.tasks.values():
             task.cancel()
         
@@ -811,17 +1182,17 @@ class LootDrop(commands.Cog):
             self.tasks.clear()
             self.channel_last_message.clear()
             self.channel_perms_cache.clear()
+            self.rankings.clear()
+            self.settings_cache.clear()
             
-            # Clear all data from config
-            await self.config.clear_all()
-            
-            # Restart the drop task
-            self.start_drops.start()
+            # Clear member stats and guild settings, globals like the schema version stay
+            await self.config.clear_all_members()
+            await self.config.clear_all_guilds()
             
-            await msg.edit(content="✅ All LootDrop data has been wiped!")
+            await self.outbox.edit(msg, content="✅ All LootDrop data has been wiped!")
             
         except Exception as e:
-            await msg.edit(content=f"Error wiping data: {e}")
+            await self.outbox.edit(msg, content=f"Error wiping data: {e}")
     
     @commands.is_owner()
     @lootdrop.command(name="wipestats")
@@ -837,7 +1208,8 @@ class LootDrop(commands.Cog):
         Settings and active drops will be preserved.
         """
         # Ask for confirmation
-        msg = await ctx.send(
+        msg = await self.outbox.send(
+            ctx.channel,
             "⚠️ **WARNING**: This will wipe all user stats and streaks across all servers!\n"
             "This includes all drop counts, streaks, and leaderboard data.\n\n"
             "**This action cannot be undone!**\n"
@@ -852,26 +1224,22 @@ class LootDrop(commands.Cog):
                 check=lambda m: m.author == ctx.author and m.channel == ctx.channel
             )
         except asyncio.TimeoutError:
-            await msg.edit(content="Stats wipe cancelled - timed out.")
+            await self.outbox.edit(msg, content="Stats wipe cancelled - timed out.")
             return
             
         if response.content.lower() != "yes, wipe stats":
-            await msg.edit(content="Stats wipe cancelled - incorrect confirmation.")
+            await self.outbox.edit(msg, content="Stats wipe cancelled - incorrect confirmation.")
             return
             
         try:
-            # Get all guild data
-            all_guilds = await self.config.all_guilds()
-            
-            # Clear only user_stats for each guild
-            for guild_id in all_guilds:
-                async with self.config.guild_from_id(guild_id).user_stats() as stats:
-                    stats.clear()
+            # Clear only member stats, guild settings stay
+            await self.config.clear_all_members()
+            self.rankings.clear()
             
-            await msg.edit(content="✅ All user stats and streaks have been wiped!")
+            await self.outbox.edit(msg, content="✅ All user stats and streaks have been wiped!")
             
         except Exception as e:
-            await msg.edit(content=f"Error wiping stats: {e}")
+            await self.outbox.edit(msg, content=f"Error wiping stats: {e}")
     
     @lootdrop.command(name="force")
     @commands.admin_or_permissions(administrator=True)
@@ -880,18 +1248,18 @@ class LootDrop(commands.Cog):
         channel = channel or ctx.channel
         
         if channel.guild.id in self.active_drops:
-            await ctx.send("There's already an active drop in this server! Wait for it to be claimed or expire.")
+            await self.outbox.send(ctx.channel, "There's already an active drop in this server! Wait for it to be claimed or expire.")
             return
             
         if not channel.permissions_for(channel.guild.me).send_messages:
-            await ctx.send(f"I don't have permission to send messages in {channel.mention}!")
+            await self.outbox.send(ctx.channel, f"I don't have permission to send messages in {channel.mention}!")
             return
         
         try:
             await self.create_drop(channel)
             await self.config.guild(channel.guild).last_drop.set(int(datetime.datetime.now().timestamp()))
         except Exception as e:
-            await ctx.send(f"Error creating drop: {e}")
+            await self.outbox.send(ctx.channel, f"Error creating drop: {e}")
     
     @lootdrop.command(name="forceparty")
     @commands.admin_or_permissions(administrator=True)
@@ -903,39 +1271,33 @@ class LootDrop(commands.Cog):
         channel = channel or ctx.channel
         
         if channel.guild.id in self.active_drops:
-            await ctx.send("There's already an active drop in this server! Wait for it to be claimed or expire.")
+            await self.outbox.send(ctx.channel, "There's already an active drop in this server! Wait for it to be claimed or expire.")
             return
             
         if not channel.permissions_for(channel.guild.me).send_messages:
-            await ctx.send(f"I don't have permission to send messages in {channel.mention}!")
+            await self.outbox.send(ctx.channel, f"I don't have permission to send messages in {channel.mention}!")
             return
         
         try:
             await self.create_party_drop(channel)
             await self.config.guild(channel.guild).last_drop.set(int(datetime.datetime.now().timestamp()))
         except Exception as e:
-            await ctx.send(f"Error creating party drop: {e}")
+            await self.outbox.send(ctx.channel, f"Error creating party drop: {e}")
     
     @lootdrop.command(name="stats")
     async def lootdrop_stats(self, ctx: commands.Context, user: Optional[discord.Member] = None) -> None:
         """View loot drop statistics for a user"""
         user = user or ctx.author
-        stats = await self.config.guild(ctx.guild).user_stats()
-        user_stats = stats.get(str(user.id), {
-            "good": 0, 
-            "bad": 0,
-            "streak": 0,
-            "highest_streak": 0
-        })
+        user_stats = await self.config.member(user).all()
         
         total = user_stats["good"] + user_stats.get("bad", 0)
         if total == 0:
-            await ctx.send(f"{user.mention} hasn't claimed any drops yet!")
+            await self.outbox.send(ctx.channel, f"{user.mention} hasn't claimed any drops yet!")
             return
             
         success_rate = (user_stats["good"] / total) * 100
-        streak_bonus = await self.config.guild(ctx.guild).streak_bonus()
-        current_bonus = min(user_stats["streak"], await self.config.guild(ctx.guild).streak_max()) * streak_bonus
+        settings = await self.get_settings(ctx.guild)
+        current_bonus = min(user_stats["streak"], settings.streak_max) * settings.streak_bonus
         
         embed = discord.Embed(
             title="🎲 Drop Statistics",
@@ -954,15 +1316,16 @@ class LootDrop(commands.Cog):
         )
         
         embed.add_field(name="📊 Statistics", value=stats_text, inline=False)
-        await ctx.send(embed=embed)
+        await self.outbox.send(ctx.channel, embed=embed)
     
     @lootdrop.command(name="leaderboard", aliases=["lb"])
     async def lootdrop_leaderboard(self, ctx: commands.Context) -> None:
         """View the loot drop leaderboard (Top 5)"""
-        _, leaderboard = await self.get_leaderboard_position(ctx.guild, str(ctx.author.id))
+        ranking = await self.get_ranking(ctx.guild)
+        leaderboard = ranking.top(5)
         
         if not leaderboard:
-            await ctx.send("No drops have been claimed yet!")
+            await self.outbox.send(ctx.channel, "No drops have been claimed yet!")
             return
         
         embed = discord.Embed(
@@ -972,7 +1335,7 @@ class LootDrop(commands.Cog):
         
         # Get top 5 users
         description = []
-        for i, (user_id, total, good, highest_streak) in enumerate(leaderboard[:5], 1):
+        for i, (user_id, total, good, highest_streak) in enumerate(leaderboard, 1):
             user = ctx.guild.get_member(int(user_id))
             if not user:
                 continue
@@ -991,30 +1354,28 @@ class LootDrop(commands.Cog):
             embed.description = "No valid leaderboard entries found"
         
         # Add author's position if not in top 5
-        author_pos, _ = await self.get_leaderboard_position(ctx.guild, str(ctx.author.id))
+        author_pos = ranking.rank(str(ctx.author.id))
         if author_pos > 5:
-            stats = await self.config.guild(ctx.guild).user_stats()
-            author_stats = stats.get(str(ctx.author.id), {"good": 0, "bad": 0, "highest_streak": 0})
-            total = author_stats["good"] + author_stats.get("bad", 0)
-            success_rate = (author_stats["good"] / total) * 100 if total > 0 else 0
+            total, good, highest_streak = ranking.entries[str(ctx.author.id)]
+            success_rate = (good / total) * 100 if total > 0 else 0
             
             embed.add_field(
                 name="Your Position",
                 value=(
                     f"#{author_pos} with {total:,} drops "
-                    f"(✅ {author_stats['good']:,} | {success_rate:.1f}% success) | "
-                    f"⭐ Highest Streak: {author_stats.get('highest_streak', 0)}"
+                    f"(✅ {good:,} | {success_rate:.1f}% success) | "
+                    f"⭐ Highest Streak: {highest_streak}"
                 ),
                 inline=False
             )
         
-        await ctx.send(embed=embed)
+        await self.outbox.send(ctx.channel, embed=embed)
 
     @lootdrop.command(name="settings")
     async def lootdrop_settings(self, ctx: commands.Context) -> None:
         """View current LootDrop settings"""
         settings: Dict[str, Any] = await self.config.guild(ctx.guild).all()
-        currency_name = await bank.get_currency_name(ctx.guild)
+        currency_name = await self.get_currency_name(ctx.guild)
         
         channels: List[str] = []
         for channel_id in settings["channels"]:
@@ -1103,33 +1464,22 @@ class LootDrop(commands.Cog):
         # Footer with command hint
         embed.set_footer(text="Use 'help lootdrop' to see all commands")
                 
-        await ctx.send(embed=embed)
+        await self.outbox.send(ctx.channel, embed=embed)
 
-    async def get_leaderboard_position(self, guild: discord.Guild, user_id: str) -> Tuple[int, List[Tuple[str, int, int, int]]]:
-        """Get user's position and full leaderboard data"""
-        stats = await self.config.guild(guild).user_stats()
-        
-        # Convert stats to list of (user_id, total_claims, good_claims, highest_streak)
-        leaderboard = [
-            (uid, data["good"] + data.get("bad", 0), data["good"], data.get("highest_streak", 0))
-            for uid, data in stats.items()
-            if data["good"] + data.get("bad", 0) > 0  # Only include users with at least one drop
-        ]
-        
-        # Sort by total claims (desc) and then highest streak (desc)
-        leaderboard.sort(key=lambda x: (x[1], x[3]), reverse=True)
-        
-        # Find user's position (1-based index)
-        # If user has drops but somehow not in leaderboard, give last place instead of 0
-        user_stats = stats.get(user_id, {"good": 0, "bad": 0})
-        total_drops = user_stats["good"] + user_stats.get("bad", 0)
-        
-        if total_drops == 0:
-            position = 0
-        else:
-            position = next((i + 1 for i, (uid, _, _, _) in enumerate(leaderboard) if uid == user_id), len(leaderboard) + 1)
+    async def get_ranking(self, guild: discord.Guild) -> GuildRanking:
+        """Get the leaderboard ranking for a guild, building it on first use
         
-        return position, leaderboard
+        The ranking is updated in place on every claim, so after the first
+        call rank lookups are O(log N) and no longer read Config.
+        """
+        ranking = self.rankings.get(guild.id)
+        if ranking is None:
+            with PERF.timed("config.read"):
+                members = await self.config.all_members(guild)
+            stats = {str(user_id): data for user_id, data in members.items()}
+            # Another claim may have built it while we were reading
+            ranking = self.rankings.setdefault(guild.id, GuildRanking.from_stats(stats))
+        return ranking
 
 
 class DropButton(discord.ui.Button['LootDropView']):
@@ -1180,7 +1530,7 @@ class DropButton(discord.ui.Button['LootDropView']):
             
         await self.view.cog.process_loot_claim(interaction)
         try:
-            await interaction.message.edit(view=None)
+            await self.view.cog.outbox.edit(interaction.message, view=None)
         except:
             pass
 
@@ -1217,7 +1567,7 @@ class LootDropView(discord.ui.View):
         """
         if self.message and not self.claimed:
             try:
-                await self.message.edit(content="The opportunity has passed...", view=None)
+                await self.cog.outbox.edit(self.message, content="The opportunity has passed...", view=None)
             except:
                 pass
 
@@ -1284,6 +1634,6 @@ class PartyDropView(discord.ui.View):
         """
         if self.message:
             try:
-                await self.message.edit(view=None)
+                await self.cog.outbox.edit(self.message, view=None)
             except:
                 pass
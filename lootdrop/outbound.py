@@ -0,0 +1,275 @@
+"""Per-channel outbound message queue.
+
+Crime flows, bail, jailbreaks, reveals and release notifications used to call
+``channel.send`` and ``message.edit`` directly, from whichever coroutine
+happened to be running. Under load those calls pile up on discord.py's
+per-route rate limit buckets and go out in no particular order.
+:class:`Outbox` sends them from one queue per channel instead:
+
+- Each queued call has a :class:`Priority`. Results go out before ordinary
+  replies, and ordinary replies before flavor text. Within a priority, calls
+  keep the order they were queued in.
+- A channel's queue is drained by one worker task while it has anything in
+  it, so a channel's messages never race each other for the rate limit.
+- Consecutive plain-text flavor messages still waiting in the same channel
+  are sent as one message. A queued edit to a message that already has an
+  edit waiting is folded into that edit.
+- Queue depth and time spent queued are tracked in :class:`OutboxStats`.
+  Each call's wait, queue included, is timed as ``discord`` for the handler
+  making it, and the API call alone as ``discord.api``.
+
+Callers await the send or edit as before and get the message back, or the
+exception Discord raised. Interaction responses and followups don't go
+through here: they use the interaction's webhook, which has its own limits
+and a three second deadline.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Union
+
+import discord
+
+from .perf import PERF
+
+# Named after the importing cog, this file is the same in both
+log = logging.getLogger(f"red.{__name__}")
+
+# Discord's limit on message content
+MAX_CONTENT_LENGTH = 2000
+
+
+class Priority(IntEnum):
+    """Send order within a channel, lowest first."""
+
+    RESULT = 0
+    NORMAL = 1
+    FLAVOR = 2
+
+
+class OutboundCall:
+    """A queued send or edit."""
+
+    __slots__ = ("priority", "order", "target", "content", "kwargs", "futures", "queued_at", "is_edit")
+
+    def __init__(
+        self,
+        priority: Priority,
+        order: int,
+        target: Union[discord.abc.Messageable, discord.Message],
+        content: Optional[str],
+        kwargs: Dict[str, Any],
+        is_edit: bool,
+    ) -> None:
+        self.priority = priority
+        self.order = order
+        self.target = target
+        self.content = content
+        self.kwargs = kwargs
+        self.is_edit = is_edit
+        self.futures: List[asyncio.Future] = [asyncio.get_running_loop().create_future()]
+        self.queued_at = time.monotonic()
+
+    def __lt__(self, other: "OutboundCall") -> bool:
+        return (self.priority, self.order) < (other.priority, other.order)
+
+    @property
+    def mergeable(self) -> bool:
+        """Whether this is flavor text that can share a message with its neighbours."""
+        return (
+            self.priority is Priority.FLAVOR
+            and not self.is_edit
+            and self.content is not None
+            and not self.kwargs
+        )
+
+    def resolve(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        for future in self.futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+class OutboxStats:
+    """Counters for an :class:`Outbox`.
+
+    Attributes
+    ----------
+    sent: int
+        API calls made
+    merged: int
+        Calls that were folded into another call instead of being made
+    failed: int
+        API calls that raised
+    max_depth: int
+        Most calls ever waiting at once, across every channel
+    latency_total: float
+        Seconds calls spent queued, summed
+    latency_max: float
+        Longest a call spent queued
+    """
+
+    __slots__ = ("sent", "merged", "failed", "max_depth", "latency_total", "latency_max")
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.merged = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.sent if self.sent else 0.0
+
+    def record(self, latency: float) -> None:
+        self.sent += 1
+        self.latency_total += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+
+
+class Outbox:
+    """Sends and edits messages through one priority queue per channel."""
+
+    def __init__(self) -> None:
+        self.stats = OutboxStats()
+        self._queues: Dict[int, List[OutboundCall]] = {}
+        self._pending_edits: Dict[int, OutboundCall] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._order = itertools.count()
+
+    @property
+    def depth(self) -> int:
+        """Calls waiting across every channel."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def channel_depths(self) -> Dict[int, int]:
+        """Calls waiting per channel ID."""
+        return {channel_id: len(queue) for channel_id, queue in self._queues.items() if queue}
+
+    @staticmethod
+    def _channel_id(target: Union[discord.abc.Messageable, discord.Message]) -> int:
+        if isinstance(target, discord.Message):
+            return target.channel.id
+        # Members and users are keyed by their own ID for DMs
+        channel = getattr(target, "channel", None)
+        return channel.id if channel is not None else target.id
+
+    def _enqueue(self, channel_id: int, call: OutboundCall) -> None:
+        heapq.heappush(self._queues.setdefault(channel_id, []), call)
+        depth = self.depth
+        if depth > self.stats.max_depth:
+            self.stats.max_depth = depth
+        if channel_id not in self._workers:
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id))
+
+    async def send(
+        self,
+        channel: discord.abc.Messageable,
+        content: Optional[str] = None,
+        *,
+        priority: Priority = Priority.NORMAL,
+        **kwargs: Any,
+    ) -> discord.Message:
+        """Queue ``channel.send(content, **kwargs)`` and wait for it to be sent.
+
+        Returns
+        -------
+        discord.Message
+            The sent message. Merged flavor messages all get the same one.
+        """
+        call = OutboundCall(priority, next(self._order), channel, content, kwargs, is_edit=False)
+        self._enqueue(self._channel_id(channel), call)
+        with PERF.timed("discord"):
+            return await call.futures[0]
+
+    async def edit(
+        self, message: discord.Message, *, priority: Priority = Priority.NORMAL, **kwargs: Any
+    ) -> Optional[discord.Message]:
+        """Queue ``message.edit(**kwargs)`` and wait for it to be made.
+
+        If the message already has an edit waiting, the two are made as one,
+        with this call's values winning.
+        """
+        waiting = self._pending_edits.get(message.id)
+        if waiting is not None:
+            future = asyncio.get_running_loop().create_future()
+            waiting.kwargs.update(kwargs)
+            waiting.futures.append(future)
+            self.stats.merged += 1
+            if priority < waiting.priority:
+                # Move it up with the more urgent edit
+                queue = self._queues[self._channel_id(message)]
+                waiting.priority = priority
+                heapq.heapify(queue)
+            with PERF.timed("discord"):
+                return await future
+
+        call = OutboundCall(priority, next(self._order), message, None, kwargs, is_edit=True)
+        self._pending_edits[message.id] = call
+        self._enqueue(self._channel_id(message), call)
+        with PERF.timed("discord"):
+            return await call.futures[0]
+
+    def _pop(self, channel_id: int) -> OutboundCall:
+        """Take the next call for a channel, folding in flavor text right behind it."""
+        queue = self._queues[channel_id]
+        call = heapq.heappop(queue)
+        if call.is_edit:
+            self._pending_edits.pop(call.target.id, None)
+        elif call.mergeable:
+            while queue and queue[0].mergeable and queue[0].target == call.target:
+                extra = queue[0]
+                content = f"{call.content}\n{extra.content}"
+                if len(content) > MAX_CONTENT_LENGTH:
+                    break
+                heapq.heappop(queue)
+                call.content = content
+                call.futures.extend(extra.futures)
+                self.stats.merged += 1
+        return call
+
+    async def _drain(self, channel_id: int) -> None:
+        queue = self._queues[channel_id]
+        try:
+            while queue:
+                call = self._pop(channel_id)
+                self.stats.record(time.monotonic() - call.queued_at)
+                started = time.perf_counter()
+                try:
+                    if call.is_edit:
+                        result = await call.target.edit(**call.kwargs)
+                    else:
+                        result = await call.target.send(call.content, **call.kwargs)
+                except Exception as e:
+                    self.stats.failed += 1
+                    call.resolve(error=e)
+                else:
+                    call.resolve(result)
+                # Not PERF.timed, this worker may have inherited some other handler's span
+                PERF.record("discord.api", time.perf_counter() - started)
+        finally:
+            if not queue:
+                self._queues.pop(channel_id, None)
+            self._workers.pop(channel_id, None)
+
+    def close(self) -> None:
+        """Stop every worker and cancel whatever is still waiting."""
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        for queue in self._queues.values():
+            for call in queue:
+                for future in call.futures:
+                    future.cancel()
+        self._queues.clear()
+        self._pending_edits.clear()
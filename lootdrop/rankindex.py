@@ -0,0 +1,90 @@
+"""Order-statistics index for LootDrop leaderboard ranks"""
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Mapping, Tuple
+
+# (-total, -highest_streak, user_id): ascending order is leaderboard order
+RankKey = Tuple[int, int, str]
+
+
+class GuildRanking:
+    """Leaderboard ranks for a single guild
+
+    Users are kept in a sorted list of rank keys, ordered by total drops and
+    then highest streak (both descending), so a user's rank is a binary search
+    away and the top of the leaderboard is a slice.
+
+    Attributes
+    ----------
+    entries: Dict[str, Tuple[int, int, int]]
+        (total, good, highest_streak) per user ID
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[RankKey] = []
+        self.entries: Dict[str, Tuple[int, int, int]] = {}
+
+    @classmethod
+    def from_stats(cls, stats: Mapping[str, Mapping[str, Any]]) -> "GuildRanking":
+        """Build a ranking from a ``{user_id: stats}`` mapping
+
+        Parameters
+        ----------
+        stats: Mapping[str, Mapping[str, Any]]
+            Per-user LootDrop stats
+        """
+        ranking = cls()
+        for user_id, data in stats.items():
+            total = data.get("good", 0) + data.get("bad", 0)
+            if total > 0:
+                ranking.entries[user_id] = (total, data.get("good", 0), data.get("highest_streak", 0))
+        ranking._keys = sorted(ranking._key(uid) for uid in ranking.entries)
+        return ranking
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, user_id: str) -> RankKey:
+        total, _good, highest = self.entries[user_id]
+        return -total, -highest, user_id
+
+    def update(self, user_id: str, stats: Mapping[str, Any]) -> None:
+        """Move a user to the rank matching their current stats
+
+        Parameters
+        ----------
+        user_id: str
+            The user's ID
+        stats: Mapping[str, Any]
+            The user's current LootDrop stats
+        """
+        self.remove(user_id)
+        total = stats.get("good", 0) + stats.get("bad", 0)
+        if total > 0:
+            self.entries[user_id] = (total, stats.get("good", 0), stats.get("highest_streak", 0))
+            insort(self._keys, self._key(user_id))
+
+    def remove(self, user_id: str) -> None:
+        """Remove a user from the ranking"""
+        if user_id not in self.entries:
+            return
+        key = self._key(user_id)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+        del self.entries[user_id]
+
+    def rank(self, user_id: str) -> int:
+        """Get a user's 1-based rank, or 0 if they haven't claimed any drops"""
+        if user_id not in self.entries:
+            return 0
+        return bisect_left(self._keys, self._key(user_id)) + 1
+
+    def top(self, count: int) -> List[Tuple[str, int, int, int]]:
+        """Get the top users as (user_id, total, good, highest_streak)
+
+        Parameters
+        ----------
+        count: int
+            How many users to return
+        """
+        return [(uid, *self.entries[uid]) for _total, _highest, uid in self._keys[:count]]
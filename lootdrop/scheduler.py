@@ -0,0 +1,113 @@
+"""Min-heap scheduler that wakes up exactly when the next loot drop is due"""
+import asyncio
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+log = logging.getLogger("red.lootdrop.scheduler")
+
+
+class DropScheduler:
+    """Fires a callback for each guild when its next drop is due
+
+    Due times live in a min-heap of ``(due, guild_id)``. The runner sleeps
+    until the earliest one and is woken early whenever a schedule changes.
+    Rescheduling or cancelling a guild doesn't search the heap: the guild's
+    current due time is kept in a dict and heap entries that no longer match
+    it are discarded when they reach the top.
+
+    Attributes
+    ----------
+    callback: Callable[[int], Awaitable[None]]
+        Called with the guild ID when a guild's drop is due. Each call runs in
+        its own task so a slow guild doesn't hold up the others.
+    """
+
+    def __init__(self, callback: Callable[[int], Awaitable[None]]) -> None:
+        self.callback = callback
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def due(self, guild_id: int) -> Optional[float]:
+        """Get when a guild's next drop is due, if it has one scheduled"""
+        return self._due.get(guild_id)
+
+    def schedule(self, guild_id: int, due: float) -> None:
+        """Schedule a guild's next drop, replacing any earlier schedule
+
+        Parameters
+        ----------
+        guild_id: int
+            The guild to schedule
+        due: float
+            Unix timestamp the drop is due at
+        """
+        self._due[guild_id] = due
+        heapq.heappush(self._heap, (due, guild_id))
+        self._wakeup.set()
+
+    def cancel(self, guild_id: int) -> None:
+        """Stop scheduling drops for a guild"""
+        self._due.pop(guild_id, None)
+
+    def clear(self) -> None:
+        """Cancel every guild's schedule"""
+        self._due.clear()
+        self._heap.clear()
+
+    def _pop_due(self, now: float) -> List[int]:
+        """Remove and return every guild whose drop is due"""
+        guild_ids: List[int] = []
+        while self._heap:
+            due, guild_id = self._heap[0]
+            if self._due.get(guild_id) != due:
+                # Rescheduled or cancelled since this entry was pushed
+                heapq.heappop(self._heap)
+                continue
+            if due > now:
+                break
+            heapq.heappop(self._heap)
+            del self._due[guild_id]
+            guild_ids.append(guild_id)
+        return guild_ids
+
+    async def _fire(self, guild_id: int) -> None:
+        try:
+            await self.callback(guild_id)
+        except Exception:
+            log.exception("Scheduled loot drop failed for guild %s", guild_id)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            for guild_id in self._pop_due(time.time()):
+                task = asyncio.create_task(self._fire(guild_id))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start the runner task"""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the runner and any drops it is still creating"""
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        for task in self._running:
+            task.cancel()
+        self._running.clear()
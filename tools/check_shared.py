@@ -0,0 +1,44 @@
+"""Check that the modules City and LootDrop both ship are still identical.
+
+The two cogs are installed and loaded separately, so neither can import the
+other's code. Modules both need are kept as one file per cog, and this check
+fails when a copy has drifted from City's.
+
+Run from the repository root::
+
+    python -m tools.check_shared
+"""
+
+import difflib
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules kept identical in city/ and lootdrop/
+SHARED_MODULES = ("outbound.py", "perf.py")
+
+
+def drifted() -> List[str]:
+    """Get a unified diff of every shared module whose copies differ."""
+    diffs: List[str] = []
+    for name in SHARED_MODULES:
+        city = (ROOT / "city" / name).read_text(encoding="utf-8").splitlines(keepends=True)
+        lootdrop = (ROOT / "lootdrop" / name).read_text(encoding="utf-8").splitlines(keepends=True)
+        diffs.extend(difflib.unified_diff(city, lootdrop, f"city/{name}", f"lootdrop/{name}"))
+    return diffs
+
+
+def main() -> int:
+    diffs = drifted()
+    if diffs:
+        sys.stdout.writelines(diffs)
+        print(f"\nShared modules have drifted, copy the change to both cogs: {', '.join(SHARED_MODULES)}")
+        return 1
+    print(f"Shared modules are in sync: {', '.join(SHARED_MODULES)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+"""Offline Monte Carlo simulator for the City and LootDrop economies.
+
+Runs many simulated players through crimes, jailbreaks and loot claims using
+the cogs' own data tables and payout rules, batched with NumPy so every step
+of every player is drawn at once. Each player repeats one activity as fast as
+cooldowns and jail allow. Reported per crime type:
+
+- credits per hour a player earns, and the spread of that across players
+- how much of the time players sit in jail, and jail sentence percentiles
+- credits created or destroyed per player-hour (inflation), and what that
+  means per day relative to the starting balance
+
+Thefts move credits between players, so only event bonuses, fines, bail and
+untargeted crimes change the amount of money in circulation.
+
+Settings can be overridden with a JSON file before trying them on a server::
+
+    {
+        "crime_options": {"mugging": {"success_rate": 0.5}},
+        "global_settings": {"max_steal_amount": 2000},
+        "custom_scenarios": [],
+        "lootdrop": {"bad_outcome_chance": 20}
+    }
+
+Run from the repository root (needs NumPy)::
+
+    python -m tools.economy_sim [--players N] [--attempts N] [--settings FILE]
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from city.crime.catalog import EXTRA_EVENT_CHANCES, MIN_SUCCESS_CHANCE, EventPool, ScenarioPool
+from city.crime.data import CRIME_TYPES, DEFAULT_GUILD
+from city.crime.scenarios import CATALOG, RANDOM_SCENARIOS
+from lootdrop.lootdrop import DEFAULT_GUILD_SETTINGS as LOOTDROP_DEFAULTS
+
+STRATEGIES = ("serve", "bail", "jailbreak")
+
+# Fixed-layout copy of CompiledEvent for batched resolution
+EFFECT_DTYPE = np.dtype([
+    ("chance", "f8"),
+    ("reward_mult", "f8"),
+    ("jail_mult", "f8"),
+    ("credits", "i8"),
+    ("weight", "f8"),
+])
+
+# Jail sentences are tallied per minute for the percentiles
+JAIL_BIN = 60
+
+
+def effect_table(pool: EventPool) -> np.ndarray:
+    """Copy a pool's compiled events into a structured array."""
+    return np.array(
+        [
+            (event.chance, event.reward_mult, event.jail_mult, event.credits, event.data.get("weight", 1))
+            for event in pool.events
+        ],
+        dtype=EFFECT_DTYPE,
+    )
+
+
+def sample_events(
+    rng: np.random.Generator, table: np.ndarray, counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw ``counts[i]`` distinct weighted events for every player at once.
+
+    Uses Efraimidis-Spirakis keys, which gives the same distribution as
+    drawing weighted events one by one and skipping repeats.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        ``(events, mask)``, both shaped (players, most events drawn). Events
+        past a player's count are masked out.
+    """
+    players = len(counts)
+    width = min(int(counts.max(initial=0)), len(table))
+    if not width:
+        return np.zeros((players, 0), dtype=EFFECT_DTYPE), np.zeros((players, 0), dtype=bool)
+    keys = rng.random((players, len(table))) ** (1.0 / table["weight"])
+    order = np.argsort(-keys, axis=1)[:, :width]
+    return table[order], np.arange(width) < counts[:, None]
+
+
+def resolve_batch(
+    base_chance: np.ndarray, events: np.ndarray, mask: np.ndarray, balance: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """:func:`city.crime.catalog.resolve` over every player at once.
+
+    Events are folded column by column with the same limits, so both give
+    identical results.
+    """
+    chance = np.asarray(base_chance, dtype=float).copy()
+    reward_mult = np.ones(len(mask))
+    jail_mult = np.ones(len(mask))
+    credit_delta = np.zeros(len(mask), dtype=np.int64)
+    for column in range(mask.shape[1]):
+        event, present = events[:, column], mask[:, column]
+        change = np.where(present, event["chance"], 0.0)
+        chance = np.where(
+            change > 0,
+            np.minimum(1.0, chance + change),
+            np.where(change < 0, np.maximum(MIN_SUCCESS_CHANCE, chance + change), chance),
+        )
+        reward_mult *= np.where(present, event["reward_mult"], 1.0)
+        jail_mult *= np.where(present, event["jail_mult"], 1.0)
+        credits = np.where(present, event["credits"], 0)
+        credits = np.where(credits < 0, np.maximum(credits, -(balance + credit_delta)), credits)
+        credit_delta += credits
+    return chance, reward_mult, jail_mult, credit_delta
+
+
+def streak_bonus(streak: np.ndarray) -> np.ndarray:
+    """:func:`city.utils.calculate_streak_bonus` for arrays."""
+    return np.where(streak > 0, 1.0 + np.minimum(0.25, streak * 0.05), 1.0)
+
+
+def percentile_from_bins(counts: np.ndarray, q: float) -> int:
+    """Get a percentile, in seconds, from per-:data:`JAIL_BIN` counts."""
+    total = counts.sum()
+    if not total:
+        return 0
+    return int(np.searchsorted(np.cumsum(counts), q * total)) * JAIL_BIN
+
+
+class Player:
+    """Per-player state arrays for one simulation."""
+
+    def __init__(self, players: int, start_balance: int) -> None:
+        self.balance = np.full(players, start_balance, dtype=np.int64)
+        self.streak = np.zeros(players, dtype=np.int64)
+        self.clock = np.zeros(players)
+        self.gap = np.zeros(players)
+        self.earned = np.zeros(players, dtype=np.int64)
+        self.minted = np.zeros(players, dtype=np.int64)
+        self.jailed = np.zeros(players)
+
+    def credit(self, amount: np.ndarray, minted: bool = True) -> np.ndarray:
+        """Change balances like BankBatch.commit does, never below zero.
+
+        Returns how much each balance actually changed.
+        """
+        new_balance = np.maximum(0, self.balance + amount)
+        change = new_balance - self.balance
+        self.balance = new_balance
+        self.earned += change
+        if minted:
+            self.minted += change
+        return change
+
+
+class Simulation:
+    """Crime and loot simulations against one set of guild settings.
+
+    Parameters
+    ----------
+    settings: Dict[str, Any]
+        Overrides, laid out as in the module docstring
+    players: int
+        Simulated players per activity
+    attempts: int
+        Crimes or claims each player makes
+    start_balance: int
+        Every player's starting balance
+    target_balance: int
+        Balance of the members targeted crimes steal from
+    strategy: str
+        What jailed players do, one of :data:`STRATEGIES`
+    seed: Optional[int]
+        RNG seed, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        settings: Dict[str, Any],
+        players: int = 10_000,
+        attempts: int = 100,
+        start_balance: int = 5_000,
+        target_balance: int = 10_000,
+        strategy: str = "serve",
+        seed: Optional[int] = None,
+    ) -> None:
+        self.crime_options = {
+            crime_type: {**data, **settings.get("crime_options", {}).get(crime_type, {})}
+            for crime_type, data in CRIME_TYPES.items()
+        }
+        self.global_settings = {**DEFAULT_GUILD["global_settings"], **settings.get("global_settings", {})}
+        self.lootdrop = {**LOOTDROP_DEFAULTS, **settings.get("lootdrop", {})}
+        custom = settings.get("custom_scenarios", [])
+        self.scenarios = ScenarioPool(RANDOM_SCENARIOS + custom) if custom else ScenarioPool(RANDOM_SCENARIOS)
+        self.events = {
+            crime_type: effect_table(pool) for crime_type, pool in CATALOG.crime_events.items()
+        }
+        self.jailbreak_events = [effect_table(pool) for pool in CATALOG.jailbreak_events]
+        self.players = players
+        self.attempts = attempts
+        self.start_balance = start_balance
+        self.target_balance = target_balance
+        self.strategy = strategy
+        self.rng = np.random.default_rng(seed)
+
+    def _scenario_params(self, crime_type: str) -> Dict[str, np.ndarray]:
+        """Get every player's crime parameters for this attempt."""
+        keys = ("min_reward", "max_reward", "success_rate", "jail_time", "fine_multiplier")
+        crime = self.crime_options[crime_type]
+        if crime_type != "random":
+            return {key: np.full(self.players, crime[key]) for key in keys}
+        weights = np.array([scenario.get("weight", 1) for scenario in self.scenarios.scenarios], dtype=float)
+        picked = self.rng.choice(len(weights), size=self.players, p=weights / weights.sum())
+        return {
+            key: np.array([scenario[key] for scenario in self.scenarios.scenarios])[picked]
+            for key in keys
+        }
+
+    def _draw_crime_events(self, crime_type: str) -> Tuple[np.ndarray, np.ndarray]:
+        table = self.events.get(crime_type)
+        if crime_type == "random" or table is None or not len(table):
+            return sample_events(self.rng, np.zeros(0, dtype=EFFECT_DTYPE), np.zeros(self.players, dtype=int))
+        extras = self.rng.random((self.players, len(EXTRA_EVENT_CHANCES))) < np.array(EXTRA_EVENT_CHANCES)
+        return sample_events(self.rng, table, 1 + extras.sum(axis=1))
+
+    def _stolen_amount(self, crime: Dict[str, Any]) -> np.ndarray:
+        """:func:`city.utils.calculate_stolen_amount` against ``target_balance``."""
+        if "min_steal_percentage" not in crime or "max_steal_percentage" not in crime:
+            return self.rng.integers(crime["min_reward"], crime["max_reward"] + 1, self.players)
+        percentage = self.rng.uniform(crime["min_steal_percentage"], crime["max_steal_percentage"], self.players)
+        amount = (self.target_balance * percentage).astype(np.int64)
+        amount = np.minimum(amount, self.global_settings.get("max_steal_amount", 1000))
+        amount = np.minimum(amount, crime["max_reward"])
+        if self.target_balance >= crime["min_reward"] / crime["min_steal_percentage"]:
+            amount = np.maximum(amount, crime["min_reward"])
+        return amount
+
+    def _escape(self, player: Player, jail: np.ndarray, failed: np.ndarray) -> np.ndarray:
+        """Apply the jail strategy to players who were just jailed."""
+        if self.strategy == "bail" and self.global_settings.get("allow_bail", True):
+            cost = (self.global_settings.get("bail_cost_multiplier", 1.5) * (jail / 60)).astype(np.int64)
+            bails = failed & (jail > 0) & (player.balance >= cost)
+            player.credit(np.where(bails, -cost, 0))
+            return np.where(bails, 0, jail)
+
+        if self.strategy == "jailbreak":
+            scenarios = CATALOG.jailbreaks.scenarios
+            weights = np.array([scenario.get("weight", 1) for scenario in scenarios], dtype=float)
+            picked = self.rng.choice(len(scenarios), size=self.players, p=weights / weights.sum())
+            base_chance = np.array([scenario["base_chance"] for scenario in scenarios])[picked]
+            counts = self.rng.integers(1, 4, self.players)
+            chance = base_chance.astype(float)
+            delta = np.zeros(self.players, dtype=np.int64)
+            for i, table in enumerate(self.jailbreak_events):
+                group = failed & (picked == i)
+                if not group.any():
+                    continue
+                events, mask = sample_events(self.rng, table, counts[group])
+                chance[group], _, _, delta[group] = resolve_batch(
+                    base_chance[group], events, mask, player.balance[group]
+                )
+            player.credit(np.where(failed, delta, 0))
+            escaped = self.rng.random(self.players) < chance
+            return np.where(failed & escaped, 0, np.where(failed, jail + (jail * 0.3).astype(np.int64), jail))
+
+        return jail
+
+    def run_crime(self, crime_type: str) -> Dict[str, Any]:
+        """Simulate every player repeating one crime type."""
+        crime = self.crime_options[crime_type]
+        targeted = crime.get("requires_target", False)
+        min_required = max(self.global_settings.get("min_steal_balance", 100), crime["min_reward"])
+        player = Player(self.players, self.start_balance)
+        jail_bins = np.zeros(1, dtype=np.int64)
+        successes = 0
+
+        for _attempt in range(self.attempts):
+            # update_streak resets streaks after a day without crimes
+            player.streak[player.gap > 86400] = 0
+            params = self._scenario_params(crime_type)
+            events, mask = self._draw_crime_events(crime_type)
+            chance, _, jail_mult, credit_delta = resolve_batch(
+                params["success_rate"], events, mask, player.balance
+            )
+            player.credit(credit_delta)
+            success = self.rng.random(self.players) < chance
+            successes += int(success.sum())
+
+            # Success: base amount, streak, then each event in order
+            player.streak = np.where(success, player.streak + 1, 0)
+            if targeted:
+                amount = self._stolen_amount(crime)
+            else:
+                amount = self.rng.integers(params["min_reward"], params["max_reward"] + 1)
+            amount = np.round(amount * streak_bonus(player.streak)).astype(np.int64)
+            for column in range(mask.shape[1]):
+                event, present = events[:, column], mask[:, column]
+                multiplied = present & (event["reward_mult"] != 1.0)
+                added = present & ~multiplied & ((event["credits"] > 0) if targeted else (event["credits"] != 0))
+                amount = np.where(multiplied, np.round(amount * event["reward_mult"]).astype(np.int64), amount)
+                amount = np.where(added, amount + event["credits"], amount)
+            if targeted:
+                # A transfer between players, so nothing is minted
+                if self.target_balance < min_required:
+                    amount[:] = 0
+                player.credit(np.where(success, np.minimum(amount, self.target_balance), 0), minted=False)
+            else:
+                player.credit(np.where(success, amount, 0))
+
+            # Failure: fine, or everything and double jail time
+            failed = ~success
+            jail = np.where(failed, (params["jail_time"] * jail_mult).astype(np.int64), 0)
+            fine = (params["max_reward"] * params["fine_multiplier"]).astype(np.int64)
+            broke = failed & (player.balance < fine)
+            player.credit(np.where(failed, -np.minimum(fine, player.balance), 0))
+            jail = np.where(broke, jail * 2, jail)
+            jail = self._escape(player, jail, failed)
+
+            jailed_minutes = jail[failed] // JAIL_BIN
+            if len(jailed_minutes):
+                counts = np.bincount(jailed_minutes)
+                if len(counts) > len(jail_bins):
+                    jail_bins = np.pad(jail_bins, (0, len(counts) - len(jail_bins)))
+                jail_bins[: len(counts)] += counts
+
+            player.gap = np.maximum(crime["cooldown"], jail).astype(float)
+            player.clock += player.gap
+            player.jailed += jail
+
+        hours = player.clock / 3600
+        per_hour = player.earned / hours
+        minted_per_hour = player.minted.sum() / hours.sum()
+        return {
+            "activity": crime_type,
+            "attempts": self.players * self.attempts,
+            "success_rate": successes / (self.players * self.attempts),
+            "credits_per_hour": float(per_hour.mean()),
+            "credits_per_hour_std": float(per_hour.std()),
+            "jail_share": float(player.jailed.sum() / player.clock.sum()),
+            "jail_p50": percentile_from_bins(jail_bins, 0.50),
+            "jail_p90": percentile_from_bins(jail_bins, 0.90),
+            "jail_p99": percentile_from_bins(jail_bins, 0.99),
+            "minted_per_hour": float(minted_per_hour),
+            "supply_growth_per_day": float(minted_per_hour * 24 / self.start_balance),
+        }
+
+    def run_lootdrop(self) -> Dict[str, Any]:
+        """Simulate every player claiming every drop in one channel."""
+        settings = self.lootdrop
+        player = Player(self.players, self.start_balance)
+        good = 0
+        timeout = settings["streak_timeout"] * 3600
+        credit_range = settings["party_drop_max"] - settings["party_drop_min"]
+        max_party = settings["party_drop_max"]
+
+        for _claim in range(self.attempts):
+            interval = self.rng.integers(settings["min_frequency"], settings["max_frequency"] + 1, self.players)
+            party = self.rng.integers(1, 101, self.players) <= settings["party_drop_chance"]
+
+            # Regular drop: good or bad outcome, streak bonus on good ones
+            player.streak[interval > timeout] = 0
+            amount = self.rng.integers(settings["min_credits"], settings["max_credits"] + 1, self.players)
+            bad = ~party & (self.rng.integers(1, 101, self.players) <= settings["bad_outcome_chance"])
+            streak = np.minimum(player.streak, settings["streak_max"])
+            total = amount + (amount * (streak * settings["streak_bonus"] / 100)).astype(np.int64)
+
+            # Party drop: paid by reaction time, uniform over the timeout
+            percentage = self.rng.uniform(0, 100, self.players)
+            step = ((percentage % 20) / 20 * (credit_range * 0.2)).astype(np.int64)
+            tier = np.minimum(percentage // 20, 4).astype(int)
+            ceiling = np.array([max_party, int(max_party * 0.8), int(max_party * 0.6), int(max_party * 0.4), 0])
+            party_credits = np.where(tier < 4, ceiling[tier] - step, settings["party_drop_min"])
+
+            player.credit(np.where(party, party_credits, np.where(bad, -np.minimum(amount, player.balance), total)))
+            player.streak = np.where(
+                party,
+                np.where(interval < timeout, player.streak + 1, 1),
+                np.where(bad, 0, player.streak + 1),
+            )
+            good += int((~bad).sum())
+            player.clock += interval
+
+        hours = player.clock / 3600
+        per_hour = player.earned / hours
+        minted_per_hour = player.minted.sum() / hours.sum()
+        return {
+            "activity": "lootdrop",
+            "attempts": self.players * self.attempts,
+            "success_rate": good / (self.players * self.attempts),
+            "credits_per_hour": float(per_hour.mean()),
+            "credits_per_hour_std": float(per_hour.std()),
+            "jail_share": 0.0,
+            "jail_p50": 0,
+            "jail_p90": 0,
+            "jail_p99": 0,
+            "minted_per_hour": float(minted_per_hour),
+            "supply_growth_per_day": float(minted_per_hour * 24 / self.start_balance),
+        }
+
+    def run(self, crime_types: Sequence[str]) -> List[Dict[str, Any]]:
+        reports = [self.run_crime(crime_type) for crime_type in crime_types]
+        reports.append(self.run_lootdrop())
+        return reports
+
+
+def print_reports(reports: List[Dict[str, Any]]) -> None:
+    print(
+        f"{'activity':<12} {'attempts':>10} {'success':>8} {'credits/h':>10} {'std':>9}"
+        f" {'in jail':>8} {'jail p50':>9} {'p90':>7} {'p99':>7} {'minted/h':>9} {'supply/day':>11}"
+    )
+    for report in reports:
+        print(
+            f"{report['activity']:<12} {report['attempts']:>10,} {report['success_rate']:>8.1%}"
+            f" {report['credits_per_hour']:>10,.0f} {report['credits_per_hour_std']:>9,.0f}"
+            f" {report['jail_share']:>8.1%} {report['jail_p50'] // 60:>8}m {report['jail_p90'] // 60:>6}m"
+            f" {report['jail_p99'] // 60:>6}m {report['minted_per_hour']:>9,.0f}"
+            f" {report['supply_growth_per_day']:>+11.1%}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, default=10_000, help="simulated players per activity")
+    parser.add_argument("--attempts", type=int, default=100, help="crimes or claims per player")
+    parser.add_argument("--settings", help="JSON file with setting overrides")
+    parser.add_argument("--crime", action="append", choices=list(CRIME_TYPES), help="only simulate these crimes")
+    parser.add_argument("--start-balance", type=int, default=5_000)
+    parser.add_argument("--target-balance", type=int, default=10_000, help="balance of targeted members")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="serve", help="what jailed players do")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args(argv)
+
+    settings: Dict[str, Any] = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings = json.load(f)
+    simulation = Simulation(
+        settings,
+        players=args.players,
+        attempts=args.attempts,
+        start_balance=args.start_balance,
+        target_balance=args.target_balance,
+        strategy=args.strategy,
+        seed=args.seed,
+    )
+    reports = simulation.run(args.crime or list(CRIME_TYPES))
+    if args.json:
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+    else:
+        print_reports(reports)
+
+
+if __name__ == "__main__":
+    main()